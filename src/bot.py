@@ -4,8 +4,10 @@ import logging
 import json
 import os
 import sys
+import time
 from typing import List, Optional, Tuple, Type
 
+import aiohttp
 from discord import Activity, ActivityType, ApplicationCommand, ApplicationContext, Embed, Guild, Intents, Message, SlashCommand, SlashCommandGroup, TextChannel
 from discord import ApplicationCommandInvokeError, CheckFailure
 from discord import __version__ as discord_version
@@ -25,6 +27,7 @@ from . import pss_login as login
 from . import pss_marker as marker
 from . import pss_room as room
 from . import pss_sprites as sprites
+from . import pss_top as top
 from . import pss_user as user
 from . import server_settings
 from .server_settings import GUILD_SETTINGS
@@ -104,6 +107,10 @@ async def on_ready() -> None:
         print('Starting auto-trader loop.')
         autotrader_loop.start()
 
+    if settings.TOP_RANKINGS_CACHE_UPDATE_INTERVAL > 0:
+        print('Starting top rankings loop.')
+        top_rankings_loop.start()
+
 
 @BOT.event
 async def on_command_error(ctx: Context, err: Exception) -> None:
@@ -295,19 +302,7 @@ async def before_autodaily_loop() -> None:
 
 
 async def post_dailies(current_daily_message: str, current_daily_embed: Embed, autodaily_settings: List[server_settings.AutoMessageSettings], utc_now: datetime.datetime) -> int:
-    posted_count = 0
-    for guild_autodaily_settings in autodaily_settings:
-        if guild_autodaily_settings.guild_id is not None and guild_autodaily_settings.channel_id is not None:
-            posted, can_post, latest_message = await __post_automessage(guild_autodaily_settings.channel, guild_autodaily_settings.latest_message_id, guild_autodaily_settings.change_mode, current_daily_message, current_daily_embed, utc_now, True)
-            if posted:
-                posted_count += 1
-            else:
-                guild_name = guild_autodaily_settings.guild.name if guild_autodaily_settings.guild else None
-                guild_id = guild_autodaily_settings.guild_id
-                channel_name = f'#{guild_autodaily_settings.channel.name}' if guild_autodaily_settings.channel else '<not accessible>'
-                channel_id = guild_autodaily_settings.channel_id
-                print(f'[post_dailies] Failed to post to guild \'{guild_name}\' ({guild_id}), channel \'{channel_name}\' ({channel_id})')
-            await guild_autodaily_settings.update(can_post=can_post, latest_message=latest_message, store_now_as_created_at=(not can_post and not latest_message))
+    posted_count, _ = await __post_automessages('post_dailies', autodaily_settings, current_daily_message, current_daily_embed, utc_now, True)
     return posted_count
 
 
@@ -333,21 +328,7 @@ async def autotrader_loop() -> None:
     all_autotrader_settings = server_settings.GUILD_SETTINGS.autotrader_settings
 
     if all_autotrader_settings:
-        posted_count = 0
-        for autotrader_settings in all_autotrader_settings:
-            if autotrader_settings.guild_id is not None and autotrader_settings.channel_id is not None:
-                # post message
-                posted, can_post, latest_message = await __post_automessage(autotrader_settings.channel, autotrader_settings.latest_message_id, autotrader_settings.change_mode, autotrader_message_text, autotrader_message_embed, utc_now, False)
-                if posted:
-                    posted_count += 1
-                else:
-                    guild_name = autotrader_settings.guild.name if autotrader_settings.guild else None
-                    guild_id = autotrader_settings.guild_id
-                    channel_name = f'#{autotrader_settings.channel.name}' if autotrader_settings.channel else '<not accessible>'
-                    channel_id = autotrader_settings.channel_id
-                    print(f'[autotrader_loop] Failed to post to guild \'{guild_name}\' ({guild_id}), channel \'{channel_name}\' ({channel_id})')
-                await autotrader_settings.update(can_post=can_post, latest_message=latest_message, store_now_as_created_at=(not can_post and not latest_message))
-
+        posted_count, _ = await __post_automessages('autotrader_loop', all_autotrader_settings, autotrader_message_text, autotrader_message_embed, utc_now, False, retry_attempts=settings.AUTOMESSAGE_RETRY_ATTEMPTS)
         print(f'[autotrader_loop] posted to {posted_count} of {len(all_autotrader_settings)} guilds')
 
 
@@ -356,10 +337,28 @@ async def before_autotrader_loop() -> None:
     await BOT.wait_until_ready()
 
 
+@tasks.loop(minutes=settings.TOP_RANKINGS_CACHE_UPDATE_INTERVAL)
+async def top_rankings_loop() -> None:
+    """
+    Refreshes the cached top captains and top fleets rankings, so that requests for them don't need to wait for the API.
+    """
+    for top_cache in (top.top_captains_cache, top.top_fleets_cache):
+        try:
+            await top_cache.update_data()
+        except Exception as err:
+            print(f'[top_rankings_loop] Could not update cache \'{top_cache.name}\': {err}')
+
+
+@top_rankings_loop.before_loop
+async def before_top_rankings_loop() -> None:
+    await BOT.wait_until_ready()
 
-async def __post_automessage(text_channel: TextChannel, latest_message_id: int, change_mode: bool, current_daily_message: str, current_daily_embed: Embed, utc_now: datetime.datetime, replace_current_day_message: bool) -> Tuple[bool, bool, Message]:
+
+
+async def __post_automessage(text_channel: TextChannel, latest_message_id: int, change_mode: bool, current_daily_message: str, current_daily_embed: Embed, utc_now: datetime.datetime, replace_current_day_message: bool) -> Tuple[bool, Optional[bool], Message]:
     """
     Returns (posted, can_post, latest_message)
+    can_post is None, if posting failed for a transient reason.
     """
     posted = False
     if text_channel and current_daily_message:
@@ -400,7 +399,7 @@ async def __post_automessage(text_channel: TextChannel, latest_message_id: int,
                         can_post = False
                     except Exception as err:
                         print(f'[post_automessage] {error_msg_delete}: {err}')
-                        can_post = False
+                        can_post = __get_can_post_after_error(err)
                 elif change_mode == server_settings.AutoMessageChangeMode.EDIT:
                     try:
                         if use_embeds:
@@ -416,7 +415,7 @@ async def __post_automessage(text_channel: TextChannel, latest_message_id: int,
                         can_post = False
                     except Exception as err:
                         print(f'[post_automessage] {error_msg_edit}: {err}')
-                        can_post = False
+                        can_post = __get_can_post_after_error(err)
             else:
                 post_new = True
 
@@ -433,19 +432,111 @@ async def __post_automessage(text_channel: TextChannel, latest_message_id: int,
                     can_post = False
                 except Exception as err:
                     print(f'[post_automessage] {error_msg_post}: {err}')
-                    can_post = False
-        else:
-            can_post = False
+                    can_post = __get_can_post_after_error(err)
 
         if latest_message:
             return posted, can_post, latest_message
         else:
             return posted, can_post, None
+    elif not text_channel:
+        return posted, False, None
     else:
         return posted, None, None
 
 
-async def __auto_fetch_latest_message(text_channel: TextChannel, latest_message_id: int) -> Tuple[bool, Message]:
+async def __post_automessages(log_name: str, automessages_settings: List[server_settings.AutoMessageSettings], message_text: str, message_embed: Embed, utc_now: datetime.datetime, replace_current_day_message: bool, retry_attempts: int = 0) -> Tuple[int, List[server_settings.AutoMessageSettings]]:
+    """
+    Posts the message to the channels of all specified guilds concurrently. The number of concurrent posts and the rate at which posts get started are limited, so that the bot stays below Discord's global rate limit. The per-route rate limits are handled by the discord library.
+    Guilds with an accessible channel, that could not be posted to for a transient reason (can_post is None, e.g. a server error or a timeout), get retried up to retry_attempts times after a delay.
+    Deterministic failures like missing permissions or an inaccessible channel (can_post is False) don't get retried. A can_post value of None doesn't get stored.
+    The resulting settings updates get written to the database in a single transaction after all attempts.
+
+    Returns (posted_count, failed_automessages_settings)
+    """
+    started_at = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(settings.AUTOMESSAGE_MAX_CONCURRENT_POSTS, 1))
+    start_interval = 1.0 / settings.AUTOMESSAGE_MAX_POSTS_PER_SECOND if settings.AUTOMESSAGE_MAX_POSTS_PER_SECOND > 0 else 0.0
+    start_lock = asyncio.Lock()
+    next_start_at = started_at
+
+    async def post(automessage_settings: server_settings.AutoMessageSettings) -> Tuple[server_settings.AutoMessageSettings, bool, bool, Message, float]:
+        nonlocal next_start_at
+        async with semaphore:
+            if start_interval:
+                async with start_lock:
+                    delay = next_start_at - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    next_start_at = time.perf_counter() + start_interval
+            post_started_at = time.perf_counter()
+            try:
+                posted, can_post, latest_message = await __post_automessage(automessage_settings.channel, automessage_settings.latest_message_id, automessage_settings.change_mode, message_text, message_embed, utc_now, replace_current_day_message)
+            except Exception as err:
+                print(f'[{log_name}] An unexpected error occurred while posting to guild {automessage_settings.guild_id}: {err}')
+                posted, can_post, latest_message = False, None, None
+            return automessage_settings, posted, can_post, latest_message, time.perf_counter() - post_started_at
+
+    pending_automessages_settings = [automessage_settings for automessage_settings in automessages_settings if automessage_settings.guild_id is not None and automessage_settings.channel_id is not None]
+    results = []
+    latencies = []
+    retried_count = 0
+    attempt = 0
+    while pending_automessages_settings:
+        attempt_results = await asyncio.gather(*[post(automessage_settings) for automessage_settings in pending_automessages_settings])
+        latencies.extend(attempt_result[-1] for attempt_result in attempt_results)
+        retry_results = []
+        for attempt_result in attempt_results:
+            automessage_settings, posted, can_post = attempt_result[:3]
+            if not posted and can_post is not False and automessage_settings.channel is not None and attempt < retry_attempts:
+                retry_results.append(attempt_result)
+            else:
+                results.append(attempt_result)
+        if not retry_results:
+            break
+        attempt += 1
+        retried_count += len(retry_results)
+        print(f'[{log_name}] Retrying to post to {len(retry_results)} guilds in {settings.AUTOMESSAGE_RETRY_DELAY} seconds (attempt {attempt} of {retry_attempts}).')
+        await asyncio.sleep(settings.AUTOMESSAGE_RETRY_DELAY)
+        pending_automessages_settings = [retry_result[0] for retry_result in retry_results]
+
+    posted_count = 0
+    failed_automessages_settings = []
+    updates = []
+    for automessage_settings, posted, can_post, latest_message, _ in results:
+        if posted:
+            posted_count += 1
+        else:
+            failed_automessages_settings.append(automessage_settings)
+            guild_name = automessage_settings.guild.name if automessage_settings.guild else None
+            guild_id = automessage_settings.guild_id
+            channel_name = f'#{automessage_settings.channel.name}' if automessage_settings.channel else '<not accessible>'
+            channel_id = automessage_settings.channel_id
+            print(f'[{log_name}] Failed to post to guild \'{guild_name}\' ({guild_id}), channel \'{channel_name}\' ({channel_id})')
+        updates.append((automessage_settings, automessage_settings.get_update_settings(can_post=can_post, latest_message=latest_message, store_now_as_created_at=(can_post is False and not latest_message))))
+    posting_duration = time.perf_counter() - started_at
+
+    settings_updated = await server_settings.update_auto_messages_settings(updates)
+    if not settings_updated:
+        print(f'[{log_name}] Could not update the server settings of {len(updates)} guilds.')
+
+    throughput = len(results) / posting_duration if posting_duration else 0.0
+    print(
+        f'[{log_name}] Processed {len(results)} guilds in {posting_duration:.1f}s ({throughput:.1f} guilds/s): {posted_count} posted, {len(failed_automessages_settings)} failed, {retried_count} retries. '
+        f'Latency per guild: p50 {__get_percentile(latencies, 50):.2f}s, p95 {__get_percentile(latencies, 95):.2f}s, max {__get_percentile(latencies, 100):.2f}s. '
+        f'Settings updated in {time.perf_counter() - started_at - posting_duration:.2f}s.'
+    )
+    return posted_count, failed_automessages_settings
+
+
+def __get_percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    sorted_values = sorted(values)
+    index = round((len(sorted_values) - 1) * percentile / 100)
+    return sorted_values[index]
+
+
+async def __auto_fetch_latest_message(text_channel: TextChannel, latest_message_id: int) -> Tuple[Optional[bool], Message]:
     """
     Attempts to fetch the message by id, then by content from the specified channel.
     Returns (can_post, latest_message)
@@ -461,11 +552,23 @@ async def __auto_fetch_latest_message(text_channel: TextChannel, latest_message_
             print(f'[auto_fetch_latest_message] could not find latest message by id [{latest_message_id}] in channel [{text_channel.id}] on guild [{text_channel.guild.id}]')
         except Exception as err:
             print(f'[auto_fetch_latest_message] could not fetch message by id [{latest_message_id}] in channel [{text_channel.id}] on guild [{text_channel.guild.id}]: {err}')
-            can_post = False
+            can_post = __get_can_post_after_error(err)
 
     return can_post, result
 
 
+def __get_can_post_after_error(err: Exception) -> Optional[bool]:
+    """
+    Returns None, if the error is transient (a server error, a timeout or a connection error) and posting may succeed on a retry.
+    Returns False otherwise.
+    """
+    if isinstance(err, (asyncio.TimeoutError, aiohttp.ClientError)):
+        return None
+    if isinstance(err, errors.HTTPException) and err.status >= 500:
+        return None
+    return False
+
+
 # ############################################################################ #
 # ----------                Command Helper Functions                ---------- #
 # ############################################################################ #
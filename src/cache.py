@@ -1,30 +1,81 @@
+import asyncio
 import datetime
-import random
-from threading import Lock
-import time
-from typing import Dict, Optional
+import hashlib
+import inspect
+import os
+import pickle
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
 
 from . import pss_core as core
+from . import settings
 from . import utils
 from .typehints import EntitiesData
 
 
+# ---------- Constants ----------
+
+SNAPSHOT_FORMAT_VERSION: int = 1
+
+
+
+
+
 # ---------- Classes ----------
 
 class PssCache:
-    def __init__(self, update_path: str, name: str, key_name: str = None, update_interval: int = 15) -> None:
+    """
+    Caches the response of an API endpoint.
+
+    There's at most one update in flight per cache and concurrent callers wait for the same one. Outdated data is served while it's being updated in the background.
+    The parsed data gets cached per data version, so it only gets parsed once after each change. It's shared between all callers as a read-only view.
+
+    If a version key is specified, an update will first check the respective version in the latest settings and only download the data, if the version has changed.
+    Some values (e.g. item prices) change without a version change, so the data gets downloaded anyway, if the last download is older than settings.CACHE_FULL_UPDATE_INTERVAL minutes.
+    Changes are detected by comparing content hashes. Callbacks registered via add_data_changed_callback() get called after the data has changed.
+
+    If snapshots are enabled, the raw data, the parsed data and the version info get written to disk after each change.
+    After a restart, the snapshot will be served immediately and revalidated in the background.
+
+    If the path changes between requests (e.g. because it contains an access token), specify get_update_path. It will be awaited for each update. The update_path then only identifies the cache.
+    """
+    def __init__(self, update_path: str, name: str, key_name: str = None, update_interval: int = 15, version_key: str = None, use_snapshot: bool = True, get_update_path: Callable[[], Awaitable[str]] = None) -> None:
         self.__update_path: str = update_path
+        self.__get_update_path: Callable[[], Awaitable[str]] = get_update_path
         self.__name: str = name
         self.__obj_key_name: str = key_name
+        self.__version_key: str = version_key
         self.__UPDATE_INTERVAL: datetime.timedelta = datetime.timedelta(minutes=update_interval)
         self.__UPDATE_INTERVAL_ORIG: int = update_interval
 
         self.__data: str = None
+        self.__data_dict3: EntitiesData = None
+        self.__data_view: Mapping[str, Mapping[str, Any]] = None
+        self.__data_version: int = 0
+        self.__data_hash: str = None
+        self.__full_update_date: datetime.datetime = None
+        self.__latest_version: str = None
         self.__modify_date: datetime.datetime = None
-        self.__WRITE_LOCK: Lock = Lock()
-        self.__READ_LOCK: Lock = Lock()
-        self.__write_requested: bool = False
-        self.__reader_count: int = 0
+        self.__update_task: asyncio.Task = None
+        self.__data_changed_callbacks: List[Callable[[], Any]] = []
+
+        self.__use_snapshot: bool = bool(use_snapshot and settings.CACHE_SNAPSHOTS_ENABLED and update_interval)
+        self.__snapshot_file_path: str = None
+        self.__snapshot_read_task: asyncio.Task = None
+        self.__snapshot_write_task: asyncio.Task = None
+
+
+    @property
+    def data_hash(self) -> Optional[str]:
+        return self.__data_hash
+
+
+    @property
+    def data_version(self) -> int:
+        """
+        Gets increased each time the cached data changes.
+        """
+        return self.__data_version
 
 
     @property
@@ -32,36 +83,42 @@ class PssCache:
         return self.__name
 
 
-    async def update_data(self, old_data: str = None) -> bool:
-        data = await core.get_data_from_path(self.__update_path)
-        data_changed = data != old_data
-        if data_changed:
-            self.__request_write()
-            can_write = False
-            while not can_write:
-                can_write = self.__get_reader_count() == 0
-                if not can_write:
-                    time.sleep(random.random())
-            self.__write_data(data)
-            self.__finish_write()
-            return True
-        return False
+    @property
+    def version_key(self) -> Optional[str]:
+        return self.__version_key
 
 
-    async def get_raw_data(self) -> str:
-        if self.__get_is_data_outdated():
-            await self.update_data()
+    def add_data_changed_callback(self, callback: Callable[[], Any]) -> None:
+        """
+        Registers a function or coroutine function without parameters to be called each time the cached data has changed.
 
-        can_read = False
-        while not can_read:
-            can_read = not self.__get_write_requested()
-            if not can_read:
-                time.sleep(random.random())
+        Callbacks get called during the update, so they must not wait for this cache's data. Use them to invalidate derived data instead.
+        """
+        if callback not in self.__data_changed_callbacks:
+            self.__data_changed_callbacks.append(callback)
+
+
+    async def update_data(self) -> bool:
+        """
+        Retrieves the data from the API or waits for an update already in progress.
+
+        Returns True, if the data has changed.
+        """
+        update_task = self.__start_update()
+        return await asyncio.shield(update_task)
 
-        self.__add_reader()
-        result = self.__read_data()
-        self.__remove_reader()
-        return result
+
+    async def get_raw_data(self, allow_outdated: bool = True) -> str:
+        if self.__data is None and self.__use_snapshot:
+            await self.__load_snapshot()
+        if self.__data is None or self.__UPDATE_INTERVAL_ORIG == 0:
+            await self.update_data()
+        elif self.__get_is_data_outdated():
+            if allow_outdated:
+                self.__start_update()
+            else:
+                await self.update_data()
+        return self.__data
 
 
     async def get_raw_data_dict(self) -> Dict:
@@ -70,9 +127,51 @@ class PssCache:
         return result
 
 
-    async def get_data_dict3(self) -> EntitiesData:
-        data = await self.get_raw_data()
-        return utils.convert.xmltree_to_dict3(data)
+    async def get_data_dict3(self, allow_outdated: bool = True) -> Mapping[str, Mapping[str, Any]]:
+        """
+        Returns a read-only view of the parsed data. The entity infos are read-only views, too. Nested values are shared between callers and must not be modified.
+
+        Callers that need to modify an entity info must copy it first, e.g. with dict(entity_info).
+        """
+        data = await self.get_raw_data(allow_outdated=allow_outdated)
+        if self.__data_dict3 is None:
+            self.__data_dict3 = utils.convert.xmltree_to_dict3(data)
+            self.__data_view = None
+        if self.__data_view is None:
+            self.__data_view = _create_view(self.__data_dict3)
+        return self.__data_view
+
+
+    async def __call_data_changed_callbacks(self) -> None:
+        for callback in list(self.__data_changed_callbacks):
+            try:
+                result = callback()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as err:
+                print(f'[PssCache] A data changed callback of cache \'{self.__name}\' raised an error: {err}')
+
+
+    async def __get_latest_version(self) -> Optional[str]:
+        try:
+            latest_settings = await LATEST_SETTINGS_CACHE.get_data_dict3(allow_outdated=False)
+        except Exception as err:
+            print(f'[PssCache] Could not retrieve the latest version for cache \'{self.__name}\': {err}')
+            return None
+        return latest_settings.get(self.__version_key) or None
+
+
+    def __get_is_full_update_due(self) -> bool:
+        if self.__full_update_date is None:
+            return True
+        return utils.get_utc_now() - self.__full_update_date >= datetime.timedelta(minutes=settings.CACHE_FULL_UPDATE_INTERVAL)
+
+
+    def __get_snapshot_file_path(self) -> str:
+        if self.__snapshot_file_path is None:
+            file_name = f'{self.__name or "cache"}_{hashlib.md5(self.__update_path.encode("utf-8")).hexdigest()}.pickle'
+            self.__snapshot_file_path = os.path.join(os.getcwd(), settings.CACHE_SNAPSHOTS_SUB_PATH, file_name)
+        return self.__snapshot_file_path
 
 
     def __get_is_data_outdated(self) -> bool:
@@ -80,60 +179,147 @@ class PssCache:
             return True
 
         utc_now = utils.get_utc_now()
-        self.__WRITE_LOCK.acquire()
-        modify_date = self.__modify_date
-        self.__WRITE_LOCK.release()
-        result = modify_date is None or utc_now - modify_date > self.__UPDATE_INTERVAL
+        result = self.__modify_date is None or utc_now - self.__modify_date > self.__UPDATE_INTERVAL
         return result
 
 
-    def __get_reader_count(self) -> int:
-        self.__READ_LOCK.acquire()
-        result = self.__reader_count
-        self.__READ_LOCK.release()
-        return result
+    async def __load_snapshot(self) -> None:
+        if self.__snapshot_read_task is None:
+            self.__snapshot_read_task = asyncio.create_task(self.__read_snapshot())
+        await asyncio.shield(self.__snapshot_read_task)
 
 
-    def __get_write_requested(self) -> bool:
-        self.__WRITE_LOCK.acquire()
-        result = self.__write_requested
-        self.__WRITE_LOCK.release()
-        return result
+    def __on_snapshot_write_done(self, write_task: asyncio.Task) -> None:
+        if not write_task.cancelled() and write_task.exception():
+            print(f'[PssCache] Could not write the snapshot of cache \'{self.__name}\': {write_task.exception()}')
+
+
+    def __on_update_done(self, update_task: asyncio.Task) -> None:
+        if not update_task.cancelled() and update_task.exception():
+            print(f'[PssCache] Could not update cache \'{self.__name}\': {update_task.exception()}')
 
 
-    def __request_write(self) -> None:
-        self.__WRITE_LOCK.acquire()
-        self.__write_requested = True
-        self.__WRITE_LOCK.release()
+    async def __read_snapshot(self) -> None:
+        try:
+            snapshot = await asyncio.to_thread(_read_snapshot_file, self.__get_snapshot_file_path())
+        except Exception as err:
+            print(f'[PssCache] Could not read the snapshot of cache \'{self.__name}\': {err}')
+            return
 
+        if not snapshot or snapshot.get('format') != SNAPSHOT_FORMAT_VERSION or snapshot.get('update_path') != self.__update_path:
+            return
+        if self.__data is None:
+            self.__data = snapshot['data']
+            self.__data_dict3 = snapshot['data_dict3']
+            self.__data_view = None
+            self.__data_hash = snapshot['data_hash']
+            self.__latest_version = snapshot['latest_version']
+            self.__data_version += 1
 
-    def __finish_write(self) -> None:
-        self.__WRITE_LOCK.acquire()
-        self.__write_requested = False
-        self.__WRITE_LOCK.release()
 
+    def __start_snapshot_write(self) -> None:
+        previous_write_task = self.__snapshot_write_task
+        self.__snapshot_write_task = asyncio.create_task(self.__write_snapshot(previous_write_task))
+        self.__snapshot_write_task.add_done_callback(self.__on_snapshot_write_done)
 
-    def __write_data(self, data: str) -> None:
-        self.__WRITE_LOCK.acquire()
-        self.__data = data
+
+    def __start_update(self) -> asyncio.Task:
+        if self.__update_task is None or self.__update_task.done():
+            self.__update_task = asyncio.create_task(self.__update())
+            self.__update_task.add_done_callback(self.__on_update_done)
+        return self.__update_task
+
+
+    async def __update(self) -> bool:
+        latest_version = None
+        if self.__version_key:
+            latest_version = await self.__get_latest_version()
+            if self.__data is not None and latest_version is not None and latest_version == self.__latest_version and not self.__get_is_full_update_due():
+                self.__modify_date = utils.get_utc_now()
+                return False
+
+        if self.__get_update_path:
+            update_path = await self.__get_update_path()
+        else:
+            update_path = self.__update_path
+        data = await core.get_data_from_path(update_path)
+        data_hash = _get_data_hash(data)
+        data_changed = data_hash != self.__data_hash
+        if data_changed:
+            self.__data = data
+            self.__data_dict3 = None
+            self.__data_view = None
+            self.__data_hash = data_hash
+            self.__data_version += 1
+        self.__latest_version = latest_version
         self.__modify_date = utils.get_utc_now()
-        self.__WRITE_LOCK.release()
+        self.__full_update_date = self.__modify_date
+
+        if data_changed:
+            if self.__use_snapshot:
+                self.__start_snapshot_write()
+            await self.__call_data_changed_callbacks()
+        return data_changed
+
+
+    async def __write_snapshot(self, previous_write_task: Optional[asyncio.Task]) -> None:
+        if previous_write_task is not None and not previous_write_task.done():
+            await asyncio.wait([previous_write_task])
+
+        data = self.__data
+        data_hash = self.__data_hash
+        data_dict3 = self.__data_dict3
+        if data_dict3 is None:
+            # Parse in a worker thread, so the data doesn't need to be parsed on the event loop later
+            data_dict3 = await asyncio.to_thread(utils.convert.xmltree_to_dict3, data)
+            if self.__data_dict3 is None and self.__data_hash == data_hash:
+                self.__data_dict3 = data_dict3
+
+        snapshot = {
+            'format': SNAPSHOT_FORMAT_VERSION,
+            'update_path': self.__update_path,
+            'data': data,
+            'data_dict3': data_dict3,
+            'data_hash': data_hash,
+            'latest_version': self.__latest_version,
+        }
+        await asyncio.to_thread(_write_snapshot_file, self.__get_snapshot_file_path(), snapshot)
+
+
+
+
+
+# ---------- Helper functions ----------
+
+def _create_view(data: EntitiesData) -> Mapping[str, Mapping[str, Any]]:
+    return MappingProxyType({key: MappingProxyType(value) if isinstance(value, dict) else value for key, value in data.items()})
+
+
+def _get_data_hash(data: str) -> Optional[str]:
+    if data is None:
+        return None
+    return hashlib.md5(data.encode('utf-8')).hexdigest()
+
+
+def _read_snapshot_file(file_path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.isfile(file_path):
+        return None
+    with open(file_path, 'rb') as fp:
+        return pickle.load(fp)
+
+
+def _write_snapshot_file(file_path: str, snapshot: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    temp_file_path = f'{file_path}.tmp'
+    with open(temp_file_path, 'wb') as fp:
+        pickle.dump(snapshot, fp, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file_path, file_path)
+
 
 
-    def __add_reader(self) -> None:
-        self.__READ_LOCK.acquire()
-        self.__reader_count = self.__reader_count + 1
-        self.__READ_LOCK.release()
 
 
-    def __remove_reader(self) -> None:
-        self.__READ_LOCK.acquire()
-        self.__reader_count = self.__reader_count - 1
-        self.__READ_LOCK.release()
+# ---------- Initialization ----------
 
+LATEST_SETTINGS_CACHE: PssCache = PssCache(f'{settings.LATEST_SETTINGS_BASE_PATH}en', 'LatestSettings', update_interval=1, use_snapshot=False)
 
-    def __read_data(self) -> str:
-        self.__WRITE_LOCK.acquire()
-        result = self.__data
-        self.__WRITE_LOCK.release()
-        return result
\ No newline at end of file
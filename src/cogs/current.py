@@ -315,7 +315,7 @@ class CurrentDataCog(_CurrentCogBase, name='Current PSS Data'):
                 if is_tourney_running:
                     max_tourney_battle_attempts = await _tourney.get_max_tourney_battle_attempts()
                     if _settings.FEATURE_TOURNEYDATA_ENABLED:
-                        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+                        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
                 output, file_paths = await _fleet.get_full_fleet_info_as_text(ctx, fleet_info, max_tourney_battle_attempts=max_tourney_battle_attempts, yesterday_tourney_data=yesterday_tourney_data, as_embed=as_embed)
                 await _utils.discord.reply_with_output_and_files(ctx, output, file_paths, output_is_embeds=as_embed)
                 for file_path in file_paths:
@@ -528,9 +528,9 @@ class CurrentDataCog(_CurrentCogBase, name='Current PSS Data'):
 
             if user_info:
                 if _tourney.is_tourney_running() and _settings.FEATURE_TOURNEYDATA_ENABLED:
-                    yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+                    yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
                     if yesterday_tourney_data:
-                        yesterday_user_info = yesterday_tourney_data.users.get(user_info[_user.USER_KEY_NAME], {})
+                        yesterday_user_info = yesterday_tourney_data.users_view.get(user_info[_user.USER_KEY_NAME], {})
                         user_info['YesterdayAllianceScore'] = yesterday_user_info.get('AllianceScore', '0')
                 max_tourney_battle_attempts = await _tourney.get_max_tourney_battle_attempts()
                 output = await _user.get_user_details_by_info(ctx, user_info, max_tourney_battle_attempts=max_tourney_battle_attempts, as_embed=(await _server_settings.get_use_embeds(ctx)))
@@ -718,19 +718,19 @@ class CurrentDataCog(_CurrentCogBase, name='Current PSS Data'):
             if object_name:
                 entities_infos = []
                 characters_designs_infos = await _crew.characters_designs_retriever.get_entities_infos_by_name(object_name)
-                for entity_info in characters_designs_infos:
+                for entity_info in map(dict, characters_designs_infos):
                     entity_info['entity_type'] = 'Character'
                     entity_info['entity_id'] = entity_info[_crew.CHARACTER_DESIGN_KEY_NAME]
                     entity_info['entity_name'] = entity_info[_crew.CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME]
                     entities_infos.append(entity_info)
                 items_designs_infos = await _item.items_designs_retriever.get_entities_infos_by_name(object_name)
-                for entity_info in items_designs_infos:
+                for entity_info in map(dict, items_designs_infos):
                     entity_info['entity_type'] = 'Item'
                     entity_info['entity_id'] = entity_info[_item.ITEM_DESIGN_KEY_NAME]
                     entity_info['entity_name'] = entity_info[_item.ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME]
                     entities_infos.append(entity_info)
                 rooms_designs_infos = await _room.rooms_designs_retriever.get_entities_infos_by_name(object_name)
-                for entity_info in rooms_designs_infos:
+                for entity_info in map(dict, rooms_designs_infos):
                     entity_info['entity_type'] = 'Room'
                     entity_info['entity_id'] = entity_info[_room.ROOM_DESIGN_KEY_NAME]
                     entity_info['entity_name'] = entity_info[_room.ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME]
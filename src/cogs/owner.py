@@ -249,6 +249,21 @@ class OwnerCog(_CogBase, name="Owner commands"):
             await ctx.send(f"Retrieved {len(result)} auto-daily settings.", file=_File(file_name))
             _os.remove(file_name)
 
+    @debug.command(name="tourneydata", aliases=["tdcache"], brief="print tourney data cache statistics", hidden=True)
+    @_is_owner()
+    async def debug_tourneydata(self, ctx: _Context):
+        """
+        Prints statistics on the tourney data cache. Sizes are estimated and given in MB.
+        """
+        self._log_command_use(ctx)
+        output = []
+        for key, value in self.bot.tournament_data_client.cache_statistics.items():
+            if key in ("size", "max_size"):
+                output.append(f"{key}: {value / 1024 / 1024:.1f}")
+            else:
+                output.append(f"{key}: {value}")
+        await ctx.send("\n".join(output))
+
     @_command_group(name="device", brief="list available devices", hidden=True)
     @_is_owner()
     async def device(self, ctx: _Context):
@@ -336,6 +351,16 @@ class OwnerCog(_CogBase, name="Owner commands"):
         device = _login.DEVICES.select_device_by_key(device_key)
         await ctx.send(f"Selected device '{device.key}'.")
 
+    @device.command(name="stats", brief="print access token statistics", hidden=True)
+    @_is_owner()
+    async def device_stats(self, ctx: _Context):
+        """
+        Prints statistics on the access token pool.
+        """
+        self._log_command_use(ctx)
+        output = [f"{key}: {value:.0f}" if isinstance(value, float) else f"{key}: {value}" for key, value in _login.DEVICES.token_statistics.items()]
+        await ctx.send("\n".join(output))
+
     @_command(name="embed", brief="Embeds your message.", hidden=True)
     @_is_owner()
     async def embed(self, ctx: _Context, *, message: str = None):
@@ -418,19 +443,19 @@ class OwnerCog(_CogBase, name="Owner commands"):
 
         entities_infos = []
         characters_designs_infos = await _crew.characters_designs_retriever.get_entities_infos_by_name(entity_name)
-        for entity_info in characters_designs_infos:
+        for entity_info in map(dict, characters_designs_infos):
             entity_info["entity_type"] = "Character"
             entity_info["entity_id"] = entity_info[_crew.CHARACTER_DESIGN_KEY_NAME]
             entity_info["entity_name"] = entity_info[_crew.CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         items_designs_infos = await _item.items_designs_retriever.get_entities_infos_by_name(entity_name)
-        for entity_info in items_designs_infos:
+        for entity_info in map(dict, items_designs_infos):
             entity_info["entity_type"] = "Item"
             entity_info["entity_id"] = entity_info[_item.ITEM_DESIGN_KEY_NAME]
             entity_info["entity_name"] = entity_info[_item.ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         rooms_designs_infos = await _room.rooms_designs_retriever.get_entities_infos_by_name(entity_name)
-        for entity_info in rooms_designs_infos:
+        for entity_info in map(dict, rooms_designs_infos):
             entity_info["entity_type"] = "Room"
             entity_info["entity_id"] = entity_info[_room.ROOM_DESIGN_KEY_NAME]
             entity_info["entity_name"] = entity_info[_room.ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME]
@@ -580,19 +605,19 @@ class OwnerCog(_CogBase, name="Owner commands"):
 
         entities_infos = []
         characters_designs_infos = await _crew.characters_designs_retriever.get_entities_infos_by_name(entity_name)
-        for entity_info in characters_designs_infos:
+        for entity_info in map(dict, characters_designs_infos):
             entity_info["entity_type"] = "Character"
             entity_info["entity_id"] = entity_info[_crew.CHARACTER_DESIGN_KEY_NAME]
             entity_info["entity_name"] = entity_info[_crew.CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         items_designs_infos = await _item.items_designs_retriever.get_entities_infos_by_name(entity_name)
-        for entity_info in items_designs_infos:
+        for entity_info in map(dict, items_designs_infos):
             entity_info["entity_type"] = "Item"
             entity_info["entity_id"] = entity_info[_item.ITEM_DESIGN_KEY_NAME]
             entity_info["entity_name"] = entity_info[_item.ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         rooms_designs_infos = await _room.rooms_designs_retriever.get_entities_infos_by_name(entity_name)
-        for entity_info in rooms_designs_infos:
+        for entity_info in map(dict, rooms_designs_infos):
             entity_info["entity_type"] = "Room"
             entity_info["entity_id"] = entity_info[_room.ROOM_DESIGN_KEY_NAME]
             entity_info["entity_name"] = entity_info[_room.ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME]
@@ -3,8 +3,12 @@ import holidays as _holidays
 import os as _os
 import pytz as _pytz
 import re as _re
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
 
 from discord import ApplicationContext as _ApplicationContext
+from discord import AutocompleteContext as _AutocompleteContext
 from discord import Option as _Option
 from discord import OptionChoice as _OptionChoice
 from discord import slash_command as _slash_command
@@ -19,6 +23,7 @@ from .. import pagination as _pagination
 from .. import pss_crew as _crew
 from .. import pss_daily as _daily
 from .. import pss_dropship as _dropship
+from .. import pss_entity as _entity
 from ..pss_exception import Error as _Error
 from ..pss_exception import InvalidParameterValueError as _InvalidParameterValueError
 from ..pss_exception import NotFound as _NotFound
@@ -40,6 +45,57 @@ from ..yadc_bot import YadcBot as _YadcBot
 
 
 
+async def _autocomplete_collection_name(ctx: _AutocompleteContext) -> _List[str]:
+    return await _get_name_suggestions(ctx.value, (_crew.collections_designs_retriever, None))
+
+
+async def _autocomplete_crew_name(ctx: _AutocompleteContext) -> _List[str]:
+    return await _get_name_suggestions(ctx.value, (_crew.characters_designs_retriever, None))
+
+
+async def _autocomplete_crew_or_item_name(ctx: _AutocompleteContext) -> _List[str]:
+    return await _get_name_suggestions(ctx.value, (_crew.characters_designs_retriever, None), (_item.items_designs_retriever, None))
+
+
+async def _autocomplete_crew_item_or_room_name(ctx: _AutocompleteContext) -> _List[str]:
+    return await _get_name_suggestions(ctx.value, (_crew.characters_designs_retriever, None), (_item.items_designs_retriever, None), (_room.rooms_designs_retriever, None))
+
+
+async def _autocomplete_item_name(ctx: _AutocompleteContext) -> _List[str]:
+    return await _get_name_suggestions(ctx.value, (_item.items_designs_retriever, None))
+
+
+async def _autocomplete_research_name(ctx: _AutocompleteContext) -> _List[str]:
+    return await _get_name_suggestions(ctx.value, (_research.researches_designs_retriever, None))
+
+
+async def _autocomplete_room_name(ctx: _AutocompleteContext) -> _List[str]:
+    return await _get_name_suggestions(ctx.value, (_room.rooms_designs_retriever, None), (_room.rooms_designs_retriever, _room.ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME_2))
+
+
+async def _autocomplete_training_name(ctx: _AutocompleteContext) -> _List[str]:
+    return await _get_name_suggestions(ctx.value, (_training.trainings_designs_retriever, None))
+
+
+async def _get_name_suggestions(value: str, *retrievers_and_property_names: _Tuple[_entity.EntityRetriever, _Optional[str]]) -> _List[str]:
+    """
+    Autocomplete gets called on every keystroke, so the suggestions are looked up in the name indices of the retrievers only. While the name indices haven't been built, there are no suggestions.
+    """
+    result = []
+    for retriever, property_name in retrievers_and_property_names:
+        limit = _settings.AUTOCOMPLETE_MAX_RESULTS - len(result)
+        if limit <= 0:
+            break
+        try:
+            suggestions = await retriever.get_name_suggestions(value, property_name=property_name, limit=limit)
+        except Exception as err:
+            print(f'[_get_name_suggestions] Could not retrieve suggestions for \'{value}\': {err}')
+            continue
+        result.extend(suggestion for suggestion in suggestions if suggestion not in result)
+    return result
+
+
+
 class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     _BEST_SLOT_CHOICES = [
         _OptionChoice(name='Any', value=''),
@@ -106,7 +162,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def char_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter crew name.'),
+        name: _Option(str, 'Enter crew name.', autocomplete=_autocomplete_crew_name),
         level: _Option(int, 'Enter crew level.', min_value=1, max_value=40, required=False) = None
     ):
         """
@@ -119,7 +175,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def collection_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter collection name.', required=False) = None
+        name: _Option(str, 'Enter collection name.', required=False, autocomplete=_autocomplete_collection_name) = None
     ):
         """
         Get the details on a collection. If no collection is specified, will display all collections.
@@ -135,7 +191,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def craft_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter item name.')
+        name: _Option(str, 'Enter item name.', autocomplete=_autocomplete_item_name)
     ):
         """
         Get the items a specified item can be crafted into.
@@ -147,7 +203,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def crew_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter crew name.'),
+        name: _Option(str, 'Enter crew name.', autocomplete=_autocomplete_crew_name),
         level: _Option(int, 'Enter crew level.', min_value=1, max_value=40, required=False) = None
     ):
         """
@@ -226,7 +282,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
         if is_tourney_running:
             max_tourney_battle_attempts = await _tourney.get_max_tourney_battle_attempts()
             if _settings.FEATURE_TOURNEYDATA_ENABLED:
-                yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+                yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
         output, file_paths = await _fleet.get_full_fleet_info_as_text(ctx, fleet_info, max_tourney_battle_attempts=max_tourney_battle_attempts, yesterday_tourney_data=yesterday_tourney_data, as_embed=(await _server_settings.get_use_embeds(ctx)))
 
         await _utils.discord.edit_original_response(ctx, response, output=output, file_paths=file_paths)
@@ -238,7 +294,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def ingredients_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter item name.')
+        name: _Option(str, 'Enter item name.', autocomplete=_autocomplete_item_name)
     ):
         """
         Get the ingredients for an item to be crafted with their estimated crafting costs.
@@ -254,7 +310,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def item_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter item name.')
+        name: _Option(str, 'Enter item name.', autocomplete=_autocomplete_item_name)
     ):
         """
         Get the stats of any item matching the given item name.
@@ -345,9 +401,9 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
 
         await _utils.discord.edit_original_response(ctx, response, content='Player found. Compiling player info...', embeds=[], view=None)
         if _tourney.is_tourney_running() and _settings.FEATURE_TOURNEYDATA_ENABLED:
-            yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+            yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
             if yesterday_tourney_data:
-                yesterday_user_info = yesterday_tourney_data.users.get(user_info[_user.USER_KEY_NAME], {})
+                yesterday_user_info = yesterday_tourney_data.users_view.get(user_info[_user.USER_KEY_NAME], {})
                 user_info['YesterdayAllianceScore'] = yesterday_user_info.get('AllianceScore', '0')
         max_tourney_battle_attempts = await _tourney.get_max_tourney_battle_attempts()
         output = await _user.get_user_details_by_info(ctx, user_info, max_tourney_battle_attempts=max_tourney_battle_attempts, as_embed=(await _server_settings.get_use_embeds(ctx)))
@@ -358,7 +414,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def prestige_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter crew name.')
+        name: _Option(str, 'Enter crew name.', autocomplete=_autocomplete_crew_name)
     ):
         """
         Get the prestige combinations of the crew specified.
@@ -374,7 +430,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def price_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter item name.')
+        name: _Option(str, 'Enter item name.', autocomplete=_autocomplete_item_name)
     ):
         """
         Get the average price (market price) and the Savy Fair Price in bux of the item(s) specified.
@@ -390,7 +446,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def recipe_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter crew or item name.')
+        name: _Option(str, 'Enter crew or item name.', autocomplete=_autocomplete_crew_or_item_name)
     ):
         """
         Get the prestige recipes of the crew or the ingredients of the item specified.
@@ -432,7 +488,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def research_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter research name.')
+        name: _Option(str, 'Enter research name.', autocomplete=_autocomplete_research_name)
     ):
         """
         Get the details on one or more specific research(es).
@@ -448,7 +504,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def room_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter room name or abbreviation/short name.'),
+        name: _Option(str, 'Enter room name or abbreviation/short name.', autocomplete=_autocomplete_room_name),
         level: _Option(int, 'Enter room level.', min_value=1, required=False) = None
     ):
         """
@@ -485,7 +541,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def sales_of_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter crew, item or room name.')
+        name: _Option(str, 'Enter crew, item or room name.', autocomplete=_autocomplete_crew_item_or_room_name)
     ):
         """
         Get information on things that have been sold in shop in the past.
@@ -496,19 +552,19 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
 
         entities_infos = []
         characters_designs_infos = await _crew.characters_designs_retriever.get_entities_infos_by_name(name)
-        for entity_info in characters_designs_infos:
+        for entity_info in map(dict, characters_designs_infos):
             entity_info['entity_type'] = 'Character'
             entity_info['entity_id'] = entity_info[_crew.CHARACTER_DESIGN_KEY_NAME]
             entity_info['entity_name'] = entity_info[_crew.CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         items_designs_infos = await _item.items_designs_retriever.get_entities_infos_by_name(name)
-        for entity_info in items_designs_infos:
+        for entity_info in map(dict, items_designs_infos):
             entity_info['entity_type'] = 'Item'
             entity_info['entity_id'] = entity_info[_item.ITEM_DESIGN_KEY_NAME]
             entity_info['entity_name'] = entity_info[_item.ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         rooms_designs_infos = await _room.rooms_designs_retriever.get_entities_infos_by_name(name)
-        for entity_info in rooms_designs_infos:
+        for entity_info in map(dict, rooms_designs_infos):
             entity_info['entity_type'] = 'Room'
             entity_info['entity_id'] = entity_info[_room.ROOM_DESIGN_KEY_NAME]
             entity_info['entity_name'] = entity_info[_room.ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME]
@@ -645,7 +701,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def stats_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter crew or item name.'),
+        name: _Option(str, 'Enter crew or item name.', autocomplete=_autocomplete_crew_or_item_name),
         level: _Option(int, 'Enter crew level', min_value=1, max_value=40, default=None, required=False),
     ):
         """
@@ -803,7 +859,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def training_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter training name.')
+        name: _Option(str, 'Enter training name.', autocomplete=_autocomplete_training_name)
     ):
         """
         Get detailed information on one or more training(s).
@@ -819,7 +875,7 @@ class CurrentDataSlashCog(_CurrentCogBase, name='Current PSS Data Slash'):
     @_cooldown(rate=_CurrentCogBase.RATE, per=_CurrentCogBase.COOLDOWN, type=_BucketType.user)
     async def upgrade_slash(self,
         ctx: _ApplicationContext,
-        name: _Option(str, 'Enter item name.')
+        name: _Option(str, 'Enter item name.', autocomplete=_autocomplete_item_name)
     ):
         """
         Get the items a specified item can be crafted into.
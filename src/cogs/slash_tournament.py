@@ -71,7 +71,7 @@ class TournamentSlashCog(_TournamentCogBase, name='Tournament Slash'):
             response = await _utils.discord.respond_with_output(ctx, output)
         
         data_date = self.bot.tournament_data_client.make_data_date(year, month, day, hour)
-        tourney_data = self.bot.tournament_data_client.get_data(data_date)
+        tourney_data = await self.bot.tournament_data_client.get_data(data_date)
 
         if tourney_data and tourney_data.fleets and tourney_data.users:
             await _utils.discord.edit_original_response(ctx, response, ['Found data:'])
@@ -151,7 +151,7 @@ class TournamentSlashCog(_TournamentCogBase, name='Tournament Slash'):
         self._log_command_use(ctx)
 
         tourney_data = await self._get_tourney_data(ctx, month, year)
-        output = await _top.get_division_stars(ctx, division=division, fleet_data=tourney_data.fleets, retrieved_date=tourney_data.retrieved_at, as_embed=(await _server_settings.get_use_embeds(ctx)))
+        output = await _top.get_division_stars(ctx, division=division, tourney_data=tourney_data, as_embed=(await _server_settings.get_use_embeds(ctx)))
         await _utils.discord.edit_original_response(ctx, ctx.interaction, output)
 
 
@@ -223,12 +223,12 @@ class TournamentSlashCog(_TournamentCogBase, name='Tournament Slash'):
 
         criteria_lines = _top.get_criteria_lines(min_star_value, max_star_value, min_trophies, max_trophies, max_highest_trophies)
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
-        last_month_user_data = self.bot.tournament_data_client.get_latest_monthly_data().users
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
+        last_month_user_data = (await self.bot.tournament_data_client.get_latest_monthly_data()).users_view
         current_fleet_data = await _top.get_alliances_with_division()
 
         if yesterday_tourney_data:
-            yesterday_user_infos = _top.filter_targets(yesterday_tourney_data.users.values(), division_design_id, last_month_user_data, current_fleet_data, min_star_value, max_star_value, min_trophies, max_trophies, max_highest_trophies)
+            yesterday_user_infos = _top.get_targets(yesterday_tourney_data, division_design_id, last_month_user_data, current_fleet_data, min_star_value, max_star_value, min_trophies, max_trophies, max_highest_trophies)
             if not yesterday_user_infos:
                 error_lines = [f'No ships in division {division.upper()} match the criteria.'] + criteria_lines
                 raise _Error('\n'.join(error_lines))
@@ -315,12 +315,12 @@ class TournamentSlashCog(_TournamentCogBase, name='Tournament Slash'):
         else:
             count = max_count
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
-        last_month_user_data = self.bot.tournament_data_client.get_latest_monthly_data().users
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
+        last_month_user_data = (await self.bot.tournament_data_client.get_latest_monthly_data()).users_view
         current_fleet_data = await _top.get_alliances_with_division()
 
         if yesterday_tourney_data:
-            yesterday_user_infos = _top.filter_targets(yesterday_tourney_data.users.values(), division_design_id, last_month_user_data, current_fleet_data, min_star_value, max_star_value, min_trophies, max_trophies, max_highest_trophies)
+            yesterday_user_infos = _top.get_targets(yesterday_tourney_data, division_design_id, last_month_user_data, current_fleet_data, min_star_value, max_star_value, min_trophies, max_trophies, max_highest_trophies)
             if not yesterday_user_infos:
                 error_text = [f'No ships in division {division.upper()} match the criteria.'] + criteria_lines
                 raise _Error('\n'.join(error_text))
@@ -402,9 +402,9 @@ class TournamentSlashCog(_TournamentCogBase, name='Tournament Slash'):
         await _utils.discord.edit_original_response(ctx, response, content='Fleet found. Compiling fleet info...', embeds=[], view=None)
 
         fleet_id = fleet_info[_fleet.FLEET_KEY_NAME]
-        day_before_tourney_data = self.bot.tournament_data_client.get_second_latest_daily_data()
-        yesterday_users_data = {user_id: user_info for user_id, user_info in yesterday_tourney_data.users.items() if user_info[_fleet.FLEET_KEY_NAME] == fleet_id}
-        day_before_users_data = {user_id: user_info for user_id, user_info in day_before_tourney_data.users.items() if user_info[_fleet.FLEET_KEY_NAME] == fleet_id}
+        day_before_tourney_data = await self.bot.tournament_data_client.get_second_latest_daily_data()
+        yesterday_users_data = yesterday_tourney_data.get_users_data_by_fleet_id(fleet_id)
+        day_before_users_data = day_before_tourney_data.get_users_data_by_fleet_id(fleet_id)
 
         for yesterday_user_info in yesterday_users_data.values():
             day_before_user_info = day_before_users_data.get(yesterday_user_info[_user.USER_KEY_NAME], {})
@@ -433,8 +433,8 @@ class TournamentSlashCog(_TournamentCogBase, name='Tournament Slash'):
         yesterday_tourney_data = await self._get_yesterday_tourney_data(ctx)
         user_info, response = await _user.find_tournament_user(ctx, name_or_id, yesterday_tourney_data)
 
-        day_before_yesterday_tourney_data = self.bot.tournament_data_client.get_second_latest_daily_data()
-        day_before_user_info = day_before_yesterday_tourney_data.users.get(user_info[_user.USER_KEY_NAME])
+        day_before_yesterday_tourney_data = await self.bot.tournament_data_client.get_second_latest_daily_data()
+        day_before_user_info = day_before_yesterday_tourney_data.users_view.get(user_info[_user.USER_KEY_NAME])
         if day_before_user_info:
             user_info['YesterdayAllianceScore'] = day_before_user_info['AllianceScore']
 
@@ -456,7 +456,7 @@ class TournamentSlashCog(_TournamentCogBase, name='Tournament Slash'):
         self._assure_yesterday_command_valid()
 
         yesterday_tourney_data = await self._get_yesterday_tourney_data(ctx)
-        output = await _top.get_division_stars(ctx, division=division, fleet_data=yesterday_tourney_data.fleets, retrieved_date=yesterday_tourney_data.retrieved_at, as_embed=(await _server_settings.get_use_embeds(ctx)))
+        output = await _top.get_division_stars(ctx, division=division, tourney_data=yesterday_tourney_data, as_embed=(await _server_settings.get_use_embeds(ctx)))
         await _utils.discord.respond_with_output(ctx, output)
 
 
@@ -500,7 +500,7 @@ class TournamentSlashCog(_TournamentCogBase, name='Tournament Slash'):
                 if month >= utc_now.month:
                     year -= 1
             data_date = self.bot.tournament_data_client.make_data_date(year, month)
-        tourney_data = self.bot.tournament_data_client.get_data(data_date)
+        tourney_data = await self.bot.tournament_data_client.get_data(data_date)
         return tourney_data
 
 
@@ -508,7 +508,7 @@ class TournamentSlashCog(_TournamentCogBase, name='Tournament Slash'):
         if not ctx.interaction.response.is_done():
             await ctx.interaction.response.defer()
 
-        return self.bot.tournament_data_client.get_latest_daily_data()
+        return await self.bot.tournament_data_client.get_latest_daily_data()
 
 
 
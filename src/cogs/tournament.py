@@ -43,7 +43,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
 
         utc_now = _utils.get_utc_now()
         
-        tourney_data = self.bot.tournament_data_client.get_data(utc_now)
+        tourney_data = await self.bot.tournament_data_client.get_data(utc_now)
 
         if tourney_data and tourney_data.fleets and tourney_data.users:
             file_name = f'fleets_data_{_utils.format.timestamp_for_filename(tourney_data.retrieved_at)}.csv'
@@ -96,9 +96,9 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
             await ctx.invoke(subcommand, month=month, year=year, fleet_name=division)
             return
         else:
-            tourney_data = self._get_tourney_data(month, year)
+            tourney_data = await self._get_tourney_data(month, year)
             if tourney_data:
-                output = await _top.get_division_stars(ctx, division=division, fleet_data=tourney_data.fleets, retrieved_date=tourney_data.retrieved_at, as_embed=(await _server_settings.get_use_embeds(ctx)))
+                output = await _top.get_division_stars(ctx, division=division, tourney_data=tourney_data, as_embed=(await _server_settings.get_use_embeds(ctx)))
         await _utils.discord.reply_with_output(ctx, output)
 
 
@@ -121,7 +121,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
         if not fleet_name:
             raise _MissingParameterError('The parameter `fleet_name` is mandatory.')
 
-        tourney_data = self._get_tourney_data(month, year)
+        tourney_data = await self._get_tourney_data(month, year)
         fleet_infos = []
 
         if tourney_data:
@@ -153,7 +153,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
         """
         self._log_command_use(ctx)
         
-        tourney_data = self._get_tourney_data(month, year)
+        tourney_data = await self._get_tourney_data(month, year)
 
         output = await _top.get_top_captains(ctx, 100, as_embed=(await _server_settings.get_use_embeds(ctx)), tourney_data=tourney_data)
         await _utils.discord.reply_with_output(ctx, output)
@@ -178,7 +178,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
         if not fleet_name:
             raise _MissingParameterError('The parameter `fleet_name` is mandatory.')
 
-        tourney_data = self._get_tourney_data(month, year)
+        tourney_data = await self._get_tourney_data(month, year)
         fleet_infos = []
 
         if tourney_data:
@@ -220,7 +220,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
         self._log_command_use(ctx)
 
         (month, year, _) = self.bot.tournament_data_client.retrieve_past_parameters(ctx, month, year)
-        tourney_data = self._get_tourney_data(month, year)
+        tourney_data = await self._get_tourney_data(month, year)
 
         if tourney_data and tourney_data.fleets and tourney_data.users:
             file_name = f'tournament_results_{tourney_data.retrieved_year}-{tourney_data.retrieved_month:02d}.csv'
@@ -252,7 +252,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
         if not player_name_or_id:
             raise _MissingParameterError('The parameter `player_name_or_id` is mandatory.')
 
-        tourney_data = self._get_tourney_data(month, year)
+        tourney_data = await self._get_tourney_data(month, year)
         user_infos = []
 
         if tourney_data:
@@ -310,12 +310,12 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
 
             criteria_lines, min_star_value, max_star_value, min_trophies_value, max_trophies_value, max_highest_trophies = _top.get_targets_parameters(star_value, trophies, max_highest_trophies)
 
-            yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
-            last_month_user_data = self.bot.tournament_data_client.get_latest_monthly_data().users
+            yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
+            last_month_user_data = (await self.bot.tournament_data_client.get_latest_monthly_data()).users_view
             current_fleet_data = await _top.get_alliances_with_division()
 
             if yesterday_tourney_data:
-                yesterday_user_infos = _top.filter_targets(yesterday_tourney_data.users.values(), division_design_id, last_month_user_data, current_fleet_data, min_star_value, max_star_value, min_trophies_value, max_trophies_value, max_highest_trophies)
+                yesterday_user_infos = _top.get_targets(yesterday_tourney_data, division_design_id, last_month_user_data, current_fleet_data, min_star_value, max_star_value, min_trophies_value, max_trophies_value, max_highest_trophies)
                 if not yesterday_user_infos:
                     error_lines = [f'No ships in division {division.upper()} match the criteria.'] + criteria_lines
                     raise _Error('\n'.join(error_lines))
@@ -415,12 +415,12 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
 
         criteria_lines, min_star_value, max_star_value, min_trophies_value, max_trophies_value, max_highest_trophies = _top.get_targets_parameters(star_value, trophies, max_highest_trophies)
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
-        last_month_user_data = self.bot.tournament_data_client.get_latest_monthly_data().users
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
+        last_month_user_data = (await self.bot.tournament_data_client.get_latest_monthly_data()).users_view
         current_fleet_data = await _top.get_alliances_with_division()
 
         if yesterday_tourney_data:
-            yesterday_user_infos = _top.filter_targets(yesterday_tourney_data.users.values(), division_design_id, last_month_user_data, current_fleet_data, min_star_value, max_star_value, min_trophies_value, max_trophies_value, max_highest_trophies)
+            yesterday_user_infos = _top.get_targets(yesterday_tourney_data, division_design_id, last_month_user_data, current_fleet_data, min_star_value, max_star_value, min_trophies_value, max_trophies_value, max_highest_trophies)
             if not yesterday_user_infos:
                 error_text = [f'No ships in division {division.upper()} match the criteria.'] + criteria_lines
                 raise _Error('\n'.join(error_text))
@@ -512,7 +512,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
             raise _Error('It\'s day 1 of the current tournament, there is no data from yesterday.')
         output = []
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
         yesterday_fleet_infos = []
         if yesterday_tourney_data:
             yesterday_fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, yesterday_tourney_data.fleets)
@@ -527,9 +527,9 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
 
             if fleet_info:
                 fleet_id = fleet_info[_fleet.FLEET_KEY_NAME]
-                day_before_tourney_data = self.bot.tournament_data_client.get_second_latest_daily_data()
-                yesterday_users_data = {user_id: user_info for user_id, user_info in yesterday_tourney_data.users.items() if user_info[_fleet.FLEET_KEY_NAME] == fleet_id}
-                day_before_users_data = {user_id: user_info for user_id, user_info in day_before_tourney_data.users.items() if user_info[_fleet.FLEET_KEY_NAME] == fleet_id}
+                day_before_tourney_data = await self.bot.tournament_data_client.get_second_latest_daily_data()
+                yesterday_users_data = yesterday_tourney_data.get_users_data_by_fleet_id(fleet_id)
+                day_before_users_data = day_before_tourney_data.get_users_data_by_fleet_id(fleet_id)
                 for yesterday_user_info in yesterday_users_data.values():
                     day_before_user_info = day_before_users_data.get(yesterday_user_info[_user.USER_KEY_NAME], {})
                     day_before_star_count = day_before_user_info.get('AllianceScore', 0)
@@ -568,7 +568,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
             raise _Error('It\'s day 1 of the current tournament, there is no data from yesterday.')
         output = []
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
         user_infos = []
 
         if yesterday_tourney_data:
@@ -583,8 +583,8 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
                 _, user_info = await paginator.wait_for_option_selection()
 
             if user_info:
-                day_before_yesterday_tourney_data = self.bot.tournament_data_client.get_second_latest_daily_data()
-                day_before_user_info = day_before_yesterday_tourney_data.users.get(user_info[_user.USER_KEY_NAME])
+                day_before_yesterday_tourney_data = await self.bot.tournament_data_client.get_second_latest_daily_data()
+                day_before_user_info = day_before_yesterday_tourney_data.users_view.get(user_info[_user.USER_KEY_NAME])
                 if day_before_user_info:
                     user_info['YesterdayAllianceScore'] = day_before_user_info['AllianceScore']
                 output = await _user.get_user_details_by_info(ctx, user_info, retrieved_at=yesterday_tourney_data.retrieved_at, past_fleet_infos=yesterday_tourney_data.fleets, as_embed=(await _server_settings.get_use_embeds(ctx)))
@@ -616,9 +616,9 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
             await ctx.invoke(subcommand, fleet_name=division)
             return
         else:
-            yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+            yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
             if yesterday_tourney_data:
-                output = await _top.get_division_stars(ctx, division=division, fleet_data=yesterday_tourney_data.fleets, retrieved_date=yesterday_tourney_data.retrieved_at, as_embed=(await _server_settings.get_use_embeds(ctx)))
+                output = await _top.get_division_stars(ctx, division=division, tourney_data=yesterday_tourney_data, as_embed=(await _server_settings.get_use_embeds(ctx)))
         await _utils.discord.reply_with_output(ctx, output)
 
 
@@ -640,7 +640,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
             raise _Error('It\'s day 1 of the current tournament, there is no data from yesterday.')
         output = []
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
         fleet_infos = []
         if yesterday_tourney_data:
             fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, yesterday_tourney_data.fleets)
@@ -663,7 +663,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
         await _utils.discord.reply_with_output(ctx, output)
 
 
-    def _get_tourney_data(self, month: _Optional[_Union[int, str]] = None, year: _Optional[_Union[int, str]] = None) -> _TourneyData:
+    async def _get_tourney_data(self, month: _Optional[_Union[int, str]] = None, year: _Optional[_Union[int, str]] = None) -> _TourneyData:
         if year is not None and month is None:
             raise _MissingParameterError('If the parameter `year` is specified, the parameter `month` must be specified, too.')
 
@@ -680,7 +680,7 @@ class TournamentCog(_TournamentCogBase, name='Tournament'):
                     year -= 1
             year = int(year)
             data_date = self.bot.tournament_data_client.make_data_date(year, month)
-        tourney_data = self.bot.tournament_data_client.get_data(data_date)
+        tourney_data = await self.bot.tournament_data_client.get_data(data_date)
         return tourney_data
 
 
@@ -592,6 +592,18 @@ async def execute(query: str, args: list = None) -> bool:
                 await connection.execute(query)
 
 
+async def execute_many(queries_and_args: List[Tuple[str, List[list]]]) -> None:
+    """
+    Executes each query for each of its lists of args in a single transaction.
+    """
+    __log_db_function_enter('execute_many', queries_and_args=queries_and_args)
+
+    async with CONNECTION_POOL.acquire() as connection:
+        async with connection.transaction():
+            for query, args_list in queries_and_args:
+                await connection.executemany(query, args_list)
+
+
 async def fetchall(query: str, args: list = None) -> List[asyncpg.Record]:
     __log_db_function_enter('fetchall', query=f'\'{query}\'', args=args)
 
@@ -708,6 +720,34 @@ async def try_execute(query: str, args: list = None, raise_db_error: bool = Fals
     return success
 
 
+async def try_execute_many(queries_and_args: List[Tuple[str, List[list]]], raise_db_error: bool = False) -> bool:
+    __log_db_function_enter('try_execute_many', queries_and_args=queries_and_args, raise_db_error=raise_db_error)
+
+    queries_and_args = [(query, args_list) for query, args_list in queries_and_args if query and args_list]
+    if not queries_and_args:
+        return True
+
+    success = False
+    if await connect():
+        try:
+            await execute_many(queries_and_args)
+            success = True
+        except (asyncpg.exceptions.PostgresError, asyncpg.PostgresError) as pg_error:
+            if raise_db_error:
+                raise pg_error
+            else:
+                for query, args_list in queries_and_args:
+                    print_db_query_error('try_execute_many', query, args_list, pg_error)
+                success = False
+        except Exception as error:
+            for query, args_list in queries_and_args:
+                print_db_query_error('try_execute_many', query, args_list, error)
+            success = False
+    else:
+        print('[try_execute_many] could not connect to db')
+    return success
+
+
 async def get_setting(setting_name: str) -> Tuple[object, datetime]:
     __log_db_function_enter('get_setting', setting_name=f'\'{setting_name}\'')
 
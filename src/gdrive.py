@@ -1,15 +1,21 @@
+from abc import ABC, abstractmethod
+import asyncio
 import calendar
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta, timezone
+import gzip
 import json
 import os
-import random
 from threading import Lock
-import time
-from typing import Dict, List, Optional, Tuple, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 import urllib.parse
 import yaml
 
 from discord.ext.commands import Context
+import httplib2
+import numpy as np
+import oauth2client.client
 import pydrive.auth
 import pydrive.drive
 import pydrive.files
@@ -20,6 +26,16 @@ from . import utils
 from .typehints import EntitiesData, EntityInfo
 
 
+# ---------- Constants ----------
+
+COMPRESSED_FILE_EXTENSION: str = '.gz'
+
+# A parsed TourneyData object takes up about 10 to 15 times the memory of the json file it's been loaded from (measured with synthetic data of schema versions 3 to 9).
+TOURNEY_DATA_SIZE_FACTOR: int = 15
+
+
+
+
 
 # ---------- Classes ----------
 
@@ -58,15 +74,21 @@ class TourneyData(object):
         self.__data_date: datetime = utils.datetime.convert_to_data_date(self.retrieved_at)
         self.__data_date_key: str = TourneyData.create_data_date_key(self.data_date)
 
-        self.__top_100_users: EntitiesData = {}
-        top_users_infos = sorted(list(self.__users.values()), key=lambda user_info: -int(user_info.get('Trophy', 0)))[:100]
-        top_users_ids = [user_info['Id'] for user_info in top_users_infos]
-        for key, value in self.__users.items():
-            if key in top_users_ids:
-                self.__top_100_users[key] = value
-                top_users_ids.remove(key)
-                if not top_users_ids:
-                    break
+        # Indexes and columns get built once, since the data never changes after it's been loaded
+        self.__fleets_ids_by_name: Dict[str, List[str]] = TourneyData.__create_ids_by_name_index(self.__fleets, 'AllianceName')
+        self.__users_ids_by_name: Dict[str, List[str]] = TourneyData.__create_ids_by_name_index(self.__users, 'Name')
+        self.__users_ids_by_fleet_id: Dict[str, List[str]] = {}
+        for user_id, user_info in self.__users.items():
+            self.__users_ids_by_fleet_id.setdefault(str(user_info.get('AllianceId')), []).append(user_id)
+
+        self.__fleets_view: Mapping[str, Mapping[str, Any]] = None
+        self.__users_view: Mapping[str, Mapping[str, Any]] = None
+        self.__users_columns: Dict[str, np.ndarray] = None
+        self.__fleets_by_division: Dict[str, List[Mapping[str, Any]]] = None
+        self.__users_positions: Dict[str, int] = None
+
+        top_users_indices = set(np.argsort(-self.get_users_column('Trophy'), kind='stable')[:100].tolist())
+        self.__top_100_users: EntitiesData = {user_id: user_info for i, (user_id, user_info) in enumerate(self.__users.items()) if i in top_users_indices}
 
 
     @property
@@ -129,6 +151,15 @@ class TourneyData(object):
         """
         return dict({key: dict(value) for key, value in self.__fleets.items()})
 
+    @property
+    def fleets_view(self) -> Mapping[str, Mapping[str, Any]]:
+        """
+        Read-only view of the fleet data. Use instead of `fleets`, if the data doesn't need to be modified.
+        """
+        if self.__fleets_view is None:
+            self.__fleets_view = TourneyData.__create_view(self.__fleets)
+        return self.__fleets_view
+
     @property
     def max_tournament_battle_attempts(self) -> Optional[int]:
         """
@@ -185,6 +216,13 @@ class TourneyData(object):
     def user_ids(self) -> List[str]:
         return list(self.__users.keys())
 
+    @property
+    def users_fleet_ids(self) -> List[str]:
+        """
+        Ids of the fleets the users belong to, including '0' for users without a fleet.
+        """
+        return list(self.__users_ids_by_fleet_id.keys())
+
     @property
     def users(self) -> EntitiesData:
         """
@@ -192,12 +230,37 @@ class TourneyData(object):
         """
         return dict({key: dict(value) for key, value in self.__users.items()})
 
+    @property
+    def users_view(self) -> Mapping[str, Mapping[str, Any]]:
+        """
+        Read-only view of the user data. Use instead of `users`, if the data doesn't need to be modified.
+        """
+        if self.__users_view is None:
+            self.__users_view = TourneyData.__create_view(self.__users)
+        return self.__users_view
+
 
-    def get_fleet_data_by_id(self, fleet_id: str) -> EntityInfo:
+    def get_division_fleets(self, division_design_id: str) -> List[Mapping[str, Any]]:
+        """
+        Returns read-only views of the fleets in the specified division, sorted by stars (descending).
+        """
+        if self.__fleets_by_division is None:
+            fleets_by_division = {}
+            for fleet_info in self.fleets_view.values():
+                fleets_by_division.setdefault(fleet_info.get('DivisionDesignId'), []).append(fleet_info)
+            self.__fleets_by_division = {
+                key: sorted(fleet_infos, key=lambda fleet_info: int(fleet_info.get('Score') or 0), reverse=True)
+                for key, fleet_infos in fleets_by_division.items()
+            }
+        return list(self.__fleets_by_division.get(division_design_id, []))
+
+
+    def get_fleet_data_by_id(self, fleet_id: str) -> Optional[EntityInfo]:
         """
         Look up fleet by id
         """
-        return dict(self.__fleets.get(fleet_id, None))
+        fleet_info = self.__fleets.get(fleet_id)
+        return dict(fleet_info) if fleet_info is not None else None
 
 
     def get_fleet_data_by_name(self, fleet_name: str) -> EntitiesData:
@@ -205,19 +268,17 @@ class TourneyData(object):
         Looks up fleets having the specified fleet_name in their name.
         Case-insensitive.
         """
-        result = {}
-        for current_fleet_id, current_fleet_data in self.__fleets.items():
-            current_fleet_name = current_fleet_data.get('Name', None)
-            if current_fleet_name and fleet_name.lower() in current_fleet_name.lower():
-                result[current_fleet_id] = dict(current_fleet_data)
+        fleets_ids = TourneyData.__get_ids_by_name(self.__fleets_ids_by_name, fleet_name)
+        result = {fleet_id: dict(self.__fleets[fleet_id]) for fleet_id in fleets_ids}
         return result
 
 
-    def get_user_data_by_id(self, user_id: str) -> EntityInfo:
+    def get_user_data_by_id(self, user_id: str) -> Optional[EntityInfo]:
         """
         Look up user by id
         """
-        return dict(self.__users.get(user_id, None))
+        user_info = self.__users.get(user_id)
+        return dict(user_info) if user_info is not None else None
 
 
     def get_user_data_by_name(self, user_name: str) -> EntitiesData:
@@ -225,13 +286,46 @@ class TourneyData(object):
         Looks up users having the specified user_name in their name.
         Case-insensitive.
         """
-        result = {}
-        for current_user_id, current_user_data in self.__users.items():
-            current_user_name = str(current_user_data.get('Name', '')) or None
-            if current_user_name and user_name.lower() in current_user_name.lower():
-                result[current_user_id] = dict(current_user_data)
+        users_ids = TourneyData.__get_ids_by_name(self.__users_ids_by_name, user_name)
+        result = {user_id: dict(self.__users[user_id]) for user_id in users_ids}
         return result
-    
+
+
+    def get_users_column(self, property_name: str) -> np.ndarray:
+        """
+        Returns the values of a numeric user property as an array in the order of `user_ids`. Missing values are 0.
+
+        Supported properties: 'AllianceScore' (stars), 'DivisionDesignId' (of the user's fleet), 'Trophy'
+        """
+        if self.__users_columns is None:
+            self.__users_columns = {
+                'AllianceScore': TourneyData.__create_users_column(self.__users.values(), lambda user_info: user_info.get('AllianceScore')),
+                'DivisionDesignId': TourneyData.__create_users_column(self.__users.values(), lambda user_info: (user_info.get('Alliance') or {}).get('DivisionDesignId')),
+                'Trophy': TourneyData.__create_users_column(self.__users.values(), lambda user_info: user_info.get('Trophy')),
+            }
+        return self.__users_columns[property_name]
+
+
+    def get_users_data_by_fleet_id(self, fleet_id: str) -> EntitiesData:
+        """
+        Returns copies of the members of the specified fleet.
+        """
+        users_ids = self.__users_ids_by_fleet_id.get(str(fleet_id), [])
+        result = {user_id: dict(self.__users[user_id]) for user_id in users_ids}
+        return result
+
+
+    def get_users_data_by_fleet_ids(self, fleets_ids: Iterable[str]) -> EntitiesData:
+        """
+        Returns copies of the members of the specified fleets in the order of `user_ids`.
+        """
+        if self.__users_positions is None:
+            self.__users_positions = {user_id: i for i, user_id in enumerate(self.__users.keys())}
+        users_ids = [user_id for fleet_id in fleets_ids for user_id in self.__users_ids_by_fleet_id.get(str(fleet_id), [])]
+        users_ids.sort(key=self.__users_positions.__getitem__)
+        result = {user_id: dict(self.__users[user_id]) for user_id in users_ids}
+        return result
+
 
     @staticmethod
     def create_data_date_key(dt: datetime) -> str:
@@ -239,12 +333,57 @@ class TourneyData(object):
         return result
 
 
+    @staticmethod
+    def __create_ids_by_name_index(entities_data: EntitiesData, name_property_name: str) -> Dict[str, List[str]]:
+        result = {}
+        for entity_id, entity_info in entities_data.items():
+            name = str(entity_info.get(name_property_name) or '').lower()
+            if name:
+                result.setdefault(name, []).append(entity_id)
+        return result
+
+
+    @staticmethod
+    def __create_users_column(users_infos: Iterable[EntityInfo], get_value: Callable[[EntityInfo], Any]) -> np.ndarray:
+        values = []
+        for user_info in users_infos:
+            try:
+                values.append(int(get_value(user_info) or 0))
+            except (TypeError, ValueError):
+                values.append(0)
+        result = np.array(values, dtype=np.int64)
+        result.setflags(write=False)
+        return result
+
+
+    @staticmethod
+    def __create_view(entities_data: EntitiesData) -> Mapping[str, Mapping[str, Any]]:
+        return MappingProxyType({entity_id: MappingProxyType(entity_info) for entity_id, entity_info in entities_data.items()})
+
+
+    @staticmethod
+    def __get_ids_by_name(ids_by_name: Dict[str, List[str]], name: str) -> List[str]:
+        name = name.lower()
+        result = [entity_id for entity_name, entities_ids in ids_by_name.items() if name in entity_name for entity_id in entities_ids]
+        return result
+
+
+    @staticmethod
+    def __count_members_by_fleet_id(users_data: List[List[Union[int, str]]], fleet_id_index: int) -> Dict[Union[int, str], int]:
+        """
+        Counts the members of all fleets in a single pass over the users.
+        """
+        result = Counter(user_info[fleet_id_index] for user_info in users_data)
+        return result
+
+
     @staticmethod
     def __create_fleet_data_from_data_v3(fleets_data: List[List[Union[int, str]]], users_data: List[List[Union[int, str]]], data: List[List[Union[int, str]]]) -> EntitiesData:
         result = {}
+        members_counts = TourneyData.__count_members_by_fleet_id(data, 1)
         for i, entry in enumerate(fleets_data, 1):
             alliance_id = entry[0]
-            users = [user_info for user_info in data if user_info[1] == alliance_id]
+            members_count = members_counts.get(alliance_id, 0)
             if len(entry) == 4:
                 division_design_id = entry[3]
             else:
@@ -261,7 +400,7 @@ class TourneyData(object):
                 'AllianceName': entry[1],
                 'Score': entry[2],
                 'DivisionDesignId': division_design_id,
-                'NumberOfMembers': len(users),
+                'NumberOfMembers': members_count,
             }
         ranked_fleets_infos = sorted(sorted(result.values(), key=lambda fleet_info: int(fleet_info['Score']), reverse=True), key=lambda fleet_info: fleet_info['DivisionDesignId'])
         for i, ranked_fleet_info in enumerate(ranked_fleets_infos, 1):
@@ -272,16 +411,17 @@ class TourneyData(object):
     @staticmethod
     def __create_fleet_data_from_data_v4(fleets_data: List[List[Union[int, str]]], users_data: List[List[Union[int, str]]]) -> EntitiesData:
         result = {}
+        members_counts = TourneyData.__count_members_by_fleet_id(users_data, 2)
         for i, entry in enumerate(fleets_data, 1):
             alliance_id = str(entry[0])
-            users = [user_info for user_info in users_data if user_info[2] == entry[0]]
+            members_count = members_counts.get(entry[0], 0)
             result[alliance_id] = {
                 'AllianceId': alliance_id,
                 'AllianceName': entry[1],
                 'Score': str(entry[2]),
                 'DivisionDesignId': str(entry[3]),
                 'Trophy': str(entry[4]),
-                'NumberOfMembers': len(users),
+                'NumberOfMembers': members_count,
             }
         ranked_fleets_infos = sorted(result.values(), key=lambda fleet_info: (fleet_info['DivisionDesignId'], -int(fleet_info['Score']), -int(fleet_info['Trophy'])))
         for i, ranked_fleet_info in enumerate(ranked_fleets_infos, 1):
@@ -292,16 +432,17 @@ class TourneyData(object):
     @staticmethod
     def __create_fleet_data_from_data_v6(fleets_data: List[List[Union[int, str]]], users_data: List[List[Union[int, str]]]) -> EntitiesData:
         result = {}
+        members_counts = TourneyData.__count_members_by_fleet_id(users_data, 2)
         for i, entry in enumerate(fleets_data, 1):
             alliance_id = str(entry[0])
-            users = [user_info for user_info in users_data if user_info[2] == entry[0]]
+            members_count = members_counts.get(entry[0], 0)
             result[alliance_id] = {
                 'AllianceId': alliance_id,
                 'AllianceName': entry[1],
                 'Score': str(entry[2]),
                 'DivisionDesignId': str(entry[3]),
                 'Trophy': str(entry[4]),
-                'NumberOfMembers': len(users),
+                'NumberOfMembers': members_count,
                 'ChampionshipScore': str(entry[5]),
             }
         ranked_fleets_infos = sorted(result.values(), key=lambda fleet_info: (fleet_info['DivisionDesignId'], -int(fleet_info['Score']), -int(fleet_info['Trophy'])))
@@ -313,16 +454,17 @@ class TourneyData(object):
     @staticmethod
     def __create_fleet_data_from_data_v7(fleets_data: List[List[Union[int, str]]], users_data: List[List[Union[int, str]]]) -> EntitiesData:
         result = {}
+        members_counts = TourneyData.__count_members_by_fleet_id(users_data, 2)
         for i, entry in enumerate(fleets_data, 1):
             alliance_id = str(entry[0])
-            users = [user_info for user_info in users_data if user_info[2] == entry[0]]
+            members_count = members_counts.get(entry[0], 0)
             result[alliance_id] = {
                 'AllianceId': alliance_id,
                 'AllianceName': entry[1],
                 'Score': str(entry[2]),
                 'DivisionDesignId': str(entry[3]),
                 'Trophy': str(entry[4]),
-                'NumberOfMembers': len(users) if users else str(entry[6]),
+                'NumberOfMembers': members_count if members_count else str(entry[6]),
                 'ChampionshipScore': str(entry[5]),
                 'NumberOfApprovedMembers': str(entry[7])
             }
@@ -546,83 +688,159 @@ class TourneyData(object):
 
 
 
-class TourneyDataClient():
-    def __init__(self, project_id: str, private_key_id: str, private_key: str, client_email: str, client_id: str, scopes: List[str], folder_id: str, service_account_file_path: str, settings_file_path: str, earliest_date: datetime) -> None:
-        print('Create TourneyDataClient')
-        self._client_email: str = client_email
-        self._client_id: str = client_id
-        self._folder_id: str = folder_id
-        self._private_key: str = private_key
-        self._private_key_id: str = private_key_id
-        self._project_id: str = project_id
-        self._scopes: List[str] = list(scopes)
-        self._service_account_file_path: str = service_account_file_path
-        self._settings_file_path: str = settings_file_path
-        self.__earliest_date: datetime = earliest_date
-        self.__earliest_data_date: datetime = TourneyDataClient.make_data_date(self.__earliest_date.year, self.__earliest_date.month, self.__earliest_date.day, self.__earliest_date.hour)
+class TourneyDataCache():
+    """
+    Holds TourneyData objects by their data date keys. The least recently used entries get evicted, if the maximum number of entries or the maximum size is exceeded.
+    The size of an entry is the estimated memory footprint of the parsed data (see TOURNEY_DATA_SIZE_FACTOR).
 
-        self.__READ_LOCK: Lock = Lock()
-        self.__WRITE_LOCK: Lock = Lock()
-        self.__write_requested: bool = False
-        self.__reader_count: int = 0
+    Pinned entries never get evicted, but they count towards the limits.
+    """
+    def __init__(self, max_entries: int, max_size: int) -> None:
+        self.__max_entries: int = max_entries
+        self.__max_size: int = max_size
+        self.__entries: OrderedDict[str, Tuple[TourneyData, int]] = OrderedDict()
+        self.__pinned_keys: frozenset = frozenset()
+        self.__size: int = 0
 
-        self.__cache: Dict[int, Dict[int, Dict[int, TourneyData]]] = {}
+        self.__evictions: int = 0
+        self.__hits: int = 0
+        self.__misses: int = 0
 
-        self.__initialized = False
-        self.__initialize()
+    @property
+    def count(self) -> int:
+        return len(self.__entries)
 
+    @property
+    def evictions(self) -> int:
+        return self.__evictions
 
     @property
-    def earliest_data_date(self) -> datetime:
-        return self.__earliest_data_date
+    def hits(self) -> int:
+        return self.__hits
 
     @property
-    def most_recent_data_date(self) -> datetime:
-        utc_now = utils.get_utc_now()
-        return TourneyDataClient.make_data_date(utc_now.year, utc_now.month, utc_now.day, utc_now.hour)
+    def max_entries(self) -> int:
+        return self.__max_entries
 
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
 
-    def get_data(self, data_date: datetime, initializing: bool = False) -> TourneyData:
-        if data_date < self.earliest_data_date:
-            raise ValueError(f'There\'s no data from {data_date}. Earliest data available is from {self.earliest_data_date}.')
-        
-        most_recent_data_from = self.most_recent_data_date
-        if data_date > most_recent_data_from:
-            raise ValueError(f'There\'s no data from {data_date}. Most recent data available is from {most_recent_data_from}.')
+    @property
+    def misses(self) -> int:
+        return self.__misses
 
-        result = self.__read_data(data_date)
+    @property
+    def size(self) -> int:
+        """
+        Estimated size of all entries in bytes.
+        """
+        return self.__size
 
-        if result is None:
-            result = self.__retrieve_data(data_date, initializing=initializing)
-            self.__cache_data(result)
+    @property
+    def statistics(self) -> Dict[str, int]:
+        return {
+            'count': self.count,
+            'max_entries': self.__max_entries,
+            'size': self.__size,
+            'max_size': self.__max_size,
+            'pinned': len(self.__pinned_keys.intersection(self.__entries.keys())),
+            'hits': self.__hits,
+            'misses': self.__misses,
+            'evictions': self.__evictions,
+        }
 
-        return result
+    def add(self, tourney_data: TourneyData, size: int) -> None:
+        data_date_key = tourney_data.data_date_key
+        if data_date_key in self.__entries:
+            self.__size -= self.__entries[data_date_key][1]
+        self.__entries[data_date_key] = (tourney_data, size)
+        self.__entries.move_to_end(data_date_key)
+        self.__size += size
+        self.__evict()
+
+    def get(self, data_date_key: str) -> Optional[TourneyData]:
+        entry = self.__entries.get(data_date_key)
+        if entry is None:
+            self.__misses += 1
+            return None
+        self.__hits += 1
+        self.__entries.move_to_end(data_date_key)
+        return entry[0]
+
+    def set_pinned_keys(self, data_date_keys: Iterable[str]) -> None:
+        self.__pinned_keys = frozenset(data_date_keys)
+        self.__evict()
+
+    def __evict(self) -> None:
+        evictable_keys = [data_date_key for data_date_key in self.__entries.keys() if data_date_key not in self.__pinned_keys]
+        for data_date_key in evictable_keys:
+            if len(self.__entries) <= self.__max_entries and self.__size <= self.__max_size:
+                break
+            _, size = self.__entries.pop(data_date_key)
+            self.__size -= size
+            self.__evictions += 1
+
+
+
+
+
+class TourneyDataBackend(ABC):
+    """
+    Provides the tourney data files to a TourneyDataClient.
+
+    The methods are blocking. They get called from worker threads, but never concurrently.
+    """
+    @abstractmethod
+    def get_file_contents(self, file_name: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def get_file_names(self, file_name_prefix: str) -> List[str]:
+        """
+        Returns the names of the files starting with the specified prefix.
+        """
+        pass
 
 
-    def get_latest_daily_data(self, initializing: bool = False) -> TourneyData:
-        utc_now = utils.get_utc_now()
-        data_date = utils.datetime.strip_time(utc_now)
-        result = self.get_data(data_date, initializing=initializing)
-        return result
 
 
-    def get_latest_monthly_data(self, initializing: bool = False) -> TourneyData:
-        utc_now = utils.get_utc_now()
-        data_date = datetime(utc_now.year, utc_now.month, 1, tzinfo=timezone.utc)
-        result = self.get_data(data_date, initializing=initializing)
-        return result
 
+class GoogleDriveTourneyDataBackend(TourneyDataBackend):
+    """
+    Retrieves the tourney data files from a Google Drive folder via a service account.
+    """
+    def __init__(self, project_id: str, private_key_id: str, private_key: str, client_email: str, client_id: str, scopes: List[str], folder_id: str, service_account_file_path: str, settings_file_path: str) -> None:
+        self._client_email: str = client_email
+        self._client_id: str = client_id
+        self._folder_id: str = folder_id
+        self._private_key: str = private_key
+        self._private_key_id: str = private_key_id
+        self._project_id: str = project_id
+        self._scopes: List[str] = list(scopes)
+        self._service_account_file_path: str = service_account_file_path
+        self._settings_file_path: str = settings_file_path
 
-    def get_second_latest_daily_data(self, initializing: bool = False) -> TourneyData:
-        utc_now = utils.get_utc_now()
-        data_date = utils.datetime.strip_time(utc_now - timedelta(days=1))
-        result = self.get_data(data_date, initializing=initializing)
-        return result
+        self.__ACCESS_TOKEN_REFRESH_MARGIN: timedelta = timedelta(seconds=settings.GDRIVE_ACCESS_TOKEN_REFRESH_MARGIN)
+        self.__listed_files: Dict[str, pydrive.files.GoogleDriveFile] = {}
+
+        self.__initialized = False
+        self.__initialize()
+
+
+    def get_file_contents(self, file_name: str) -> Optional[str]:
+        g_file = self.__listed_files.get(file_name) or self.__get_first_file(file_name)
+        if g_file:
+            self.__ensure_initialized()
+            return g_file.GetContentString()
+        return None
 
 
-    def __add_reader(self) -> None:
-        with self.__READ_LOCK:
-            self.__reader_count = self.__reader_count + 1
+    def get_file_names(self, file_name_prefix: str) -> List[str]:
+        file_list = self.__list_files(f'\'{self._folder_id}\' in parents and title contains \'{file_name_prefix}\'')
+        # Keep the file objects of the latest listing, so the contents of a listed file can be downloaded without another query
+        self.__listed_files = {g_file['title']: g_file for g_file in file_list}
+        return list(self.__listed_files.keys())
 
 
     def __assert_initialized(self) -> None:
@@ -630,113 +848,50 @@ class TourneyDataClient():
             raise Exception('The __drive object has not been initialized, yet!')
 
 
-    def __cache_data(self, tourney_data: TourneyData) -> bool:
-        if tourney_data:
-            self.__request_write()
-            can_write = False
-            while not can_write:
-                can_write = self.__get_reader_count() == 0
-                if not can_write:
-                    time.sleep(random.random())
-                with self.__WRITE_LOCK:
-                    self.__cache[tourney_data.data_date_key] = tourney_data
-                    self.__write_requested = False
-                return True
-            return False
-        return False
-
-
     def __ensure_initialized(self) -> None:
-        try:
-            self.__drive.ListFile({'q': f'\'{self._folder_id}\' in parents and title contains \'random string\''}).GetList()
-        except pydrive.auth.InvalidConfigError:
+        """
+        Checks the cached authorization state instead of querying Drive. The service account's access token gets refreshed shortly before it expires.
+        """
+        credentials = self.__gauth.credentials if self.__initialized else None
+        if credentials is None or credentials.invalid:
             self.__initialize()
+            return
+
+        # oauth2client stores the expiry as a naive UTC datetime. It's None until the first request has retrieved a token.
+        token_expiry = credentials.token_expiry
+        if token_expiry is not None and token_expiry - datetime.now(timezone.utc).replace(tzinfo=None) < self.__ACCESS_TOKEN_REFRESH_MARGIN:
+            # Service account credentials don't have a refresh token, so GoogleAuth.Refresh() can't be used
+            try:
+                credentials.refresh(httplib2.Http())
+            except oauth2client.client.Error:
+                self.__initialize()
 
 
     def __get_first_file(self, file_name: str) -> pydrive.files.GoogleDriveFile:
-        file_list = self.__drive.ListFile({'q': f"'{self._folder_id}' in parents and title = '{file_name}'"}).GetList()
+        file_list = self.__list_files(f"'{self._folder_id}' in parents and title = '{file_name}'")
         for file_def in file_list:
             return file_def
         return None
 
 
-    def __get_latest_file(self, data_date: datetime, initializing: bool = False) -> pydrive.files.GoogleDriveFile:
-        if not initializing:
-            self.__ensure_initialized()
-        
-        file_name_prefix = TourneyDataClient.__get_gdrive_file_name_prefix(data_date, include_day=True, include_hour=True)
-        file_list = self.__drive.ListFile({'q': f'\'{self._folder_id}\' in parents and title contains \'{file_name_prefix}\''}).GetList()
-        if not file_list:
-            file_name_prefix = TourneyDataClient.__get_gdrive_file_name_prefix(data_date, include_day=True, include_hour=False)
-            file_list = self.__drive.ListFile({'q': f'\'{self._folder_id}\' in parents and title contains \'{file_name_prefix}\''}).GetList()
-        if not file_list:
-            file_name_prefix = TourneyDataClient.__get_gdrive_file_name_prefix(data_date, include_day=False, include_hour=False)
-            file_list = self.__drive.ListFile({'q': f'\'{self._folder_id}\' in parents and title contains \'{file_name_prefix}\''}).GetList()
-        if file_list:
-            file_list = sorted(file_list, key=lambda f: f['title'], reverse=True)
-            return file_list[0]
-        return None
-
-
-    def __get_reader_count(self) -> int:
-        with self.__READ_LOCK:
-            result = self.__reader_count
-        return result
-
-
-    def __get_write_requested(self) -> bool:
-        with self.__WRITE_LOCK:
-            result = self.__write_requested
-        return result
-
-
     def __initialize(self) -> None:
-        TourneyDataClient.create_service_account_credential_json(self._project_id, self._private_key_id, self._private_key, self._client_email, self._client_id, self._service_account_file_path)
-        TourneyDataClient.create_service_account_settings_yaml(self._settings_file_path, self._service_account_file_path, self._scopes)
+        GoogleDriveTourneyDataBackend.create_service_account_credential_json(self._project_id, self._private_key_id, self._private_key, self._client_email, self._client_id, self._service_account_file_path)
+        GoogleDriveTourneyDataBackend.create_service_account_settings_yaml(self._settings_file_path, self._service_account_file_path, self._scopes)
         self.__gauth: pydrive.auth.GoogleAuth = pydrive.auth.GoogleAuth(settings_file=self._settings_file_path)
         credentials = pydrive.auth.ServiceAccountCredentials.from_json_keyfile_name(self._service_account_file_path, self._scopes)
         self.__gauth.credentials = credentials
         self.__drive: pydrive.drive.GoogleDrive = pydrive.drive.GoogleDrive(self.__gauth)
-        self.get_latest_monthly_data(initializing=True)
-        self.get_latest_daily_data(initializing=True)
-        self.get_second_latest_daily_data(initializing=True)
         self.__initialized = True
 
 
-    def __read_data(self, data_date: datetime) -> Optional[TourneyData]:        
-        can_read = False
-        while not can_read:
-            can_read = not self.__get_write_requested()
-            if not can_read:
-                time.sleep(random.random())
-
-        self.__add_reader()
-        result = self.__cache.get(TourneyData.create_data_date_key(data_date))
-        self.__remove_reader()
-        return result
-
-
-    def __remove_reader(self) -> None:
-        with self.__READ_LOCK:
-            self.__reader_count = self.__reader_count - 1
-
-
-    def __request_write(self) -> None:
-        with self.__WRITE_LOCK:
-            self.__write_requested = True
-
-
-    def __retrieve_data(self, data_date: datetime, initializing: bool = False) -> TourneyData:
-        if not initializing:
-            self.__ensure_initialized()
-        g_file = self.__get_latest_file(data_date, initializing=initializing)
-        result = None
-        if g_file:
-            raw_data = g_file.GetContentString()
-            data = json.loads(raw_data)
-            if data:
-                result = TourneyData(data)
-        return result
+    def __list_files(self, query: str) -> List[pydrive.files.GoogleDriveFile]:
+        self.__ensure_initialized()
+        try:
+            return self.__drive.ListFile({'q': query}).GetList()
+        except pydrive.auth.InvalidConfigError:
+            # The cached authorization state was outdated
+            self.__initialize()
+            return self.__drive.ListFile({'q': query}).GetList()
 
 
     @staticmethod
@@ -776,7 +931,207 @@ class TourneyDataClient():
             with open(settings_file_path, 'w+') as settings_file:
                 yaml.dump(contents, settings_file)
             print(f'Created settings yaml file at: {settings_file_path}')
-    
+
+
+
+
+
+class LocalDirectoryTourneyDataBackend(TourneyDataBackend):
+    """
+    Reads the tourney data files from a local directory. Files may be stored gzip-compressed with an additional '.gz' extension.
+
+    Since tourney data files never change once they've been written, it can also serve as a local mirror of another backend.
+    """
+    def __init__(self, directory: str, compress: bool = False) -> None:
+        self.__directory: str = directory
+        self.__compress: bool = compress
+
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+
+    def add_file(self, file_name: str, contents: str) -> None:
+        file_path = os.path.join(self.__directory, os.path.basename(file_name))
+        data = contents.encode('utf-8')
+        if self.__compress:
+            file_path += COMPRESSED_FILE_EXTENSION
+            data = gzip.compress(data)
+
+        os.makedirs(self.__directory, exist_ok=True)
+        temp_file_path = f'{file_path}.tmp'
+        with open(temp_file_path, 'wb') as fp:
+            fp.write(data)
+        os.replace(temp_file_path, file_path)
+
+
+    def get_file_contents(self, file_name: str) -> Optional[str]:
+        file_path = os.path.join(self.__directory, os.path.basename(file_name))
+        if os.path.isfile(file_path):
+            with open(file_path, 'r', encoding='utf-8') as fp:
+                return fp.read()
+
+        file_path += COMPRESSED_FILE_EXTENSION
+        if os.path.isfile(file_path):
+            with gzip.open(file_path, 'rt', encoding='utf-8') as fp:
+                return fp.read()
+
+        return None
+
+
+    def get_file_names(self, file_name_prefix: str) -> List[str]:
+        if not os.path.isdir(self.__directory):
+            return []
+
+        result = set()
+        for file_name in os.listdir(self.__directory):
+            if file_name.endswith(COMPRESSED_FILE_EXTENSION):
+                file_name = file_name[:-len(COMPRESSED_FILE_EXTENSION)]
+            if file_name.startswith(file_name_prefix) and file_name.endswith('.json'):
+                result.add(file_name)
+        return sorted(result)
+
+
+
+
+
+class TourneyDataClient():
+    def __init__(self, backend: TourneyDataBackend, earliest_date: datetime, mirror: LocalDirectoryTourneyDataBackend = None) -> None:
+        """
+        If a mirror is specified, downloaded files get stored there and it will be checked before the backend.
+        """
+        print('Create TourneyDataClient')
+        self.__backend: TourneyDataBackend = backend
+        self.__mirror: LocalDirectoryTourneyDataBackend = mirror
+        self.__earliest_date: datetime = earliest_date
+        self.__earliest_data_date: datetime = TourneyDataClient.make_data_date(self.__earliest_date.year, self.__earliest_date.month, self.__earliest_date.day, self.__earliest_date.hour)
+
+        self.__BACKEND_LOCK: Lock = Lock()
+        self.__cache: TourneyDataCache = TourneyDataCache(settings.TOURNEY_DATA_CACHE_MAX_ENTRIES, settings.TOURNEY_DATA_CACHE_MAX_SIZE_MB * 1024 * 1024)
+        self.__retrieve_tasks: Dict[str, asyncio.Task] = {}
+
+        for data_date in TourneyDataClient.__get_latest_data_dates():
+            self.__cache_data(*self.__retrieve_data(data_date))
+
+
+    @property
+    def cache_statistics(self) -> Dict[str, int]:
+        return self.__cache.statistics
+
+    @property
+    def earliest_data_date(self) -> datetime:
+        return self.__earliest_data_date
+
+    @property
+    def most_recent_data_date(self) -> datetime:
+        utc_now = utils.get_utc_now()
+        return TourneyDataClient.make_data_date(utc_now.year, utc_now.month, utc_now.day, utc_now.hour)
+
+
+    async def get_data(self, data_date: datetime) -> TourneyData:
+        """
+        Returns the cached data for the specified data date. Otherwise the data gets retrieved and parsed in a worker thread.
+        Concurrent calls for the same data date wait for the same retrieval.
+        """
+        if data_date < self.earliest_data_date:
+            raise ValueError(f'There\'s no data from {data_date}. Earliest data available is from {self.earliest_data_date}.')
+
+        most_recent_data_from = self.most_recent_data_date
+        if data_date > most_recent_data_from:
+            raise ValueError(f'There\'s no data from {data_date}. Most recent data available is from {most_recent_data_from}.')
+
+        data_date_key = TourneyData.create_data_date_key(data_date)
+        result = self.__cache.get(data_date_key)
+
+        if result is None:
+            retrieve_task = self.__retrieve_tasks.get(data_date_key)
+            if retrieve_task is None:
+                retrieve_task = asyncio.create_task(self.__retrieve_and_cache_data(data_date, data_date_key))
+                self.__retrieve_tasks[data_date_key] = retrieve_task
+            result = await asyncio.shield(retrieve_task)
+
+        return result
+
+
+    async def get_latest_daily_data(self) -> TourneyData:
+        result = await self.get_data(TourneyDataClient.__get_latest_daily_data_date())
+        return result
+
+
+    async def get_latest_monthly_data(self) -> TourneyData:
+        result = await self.get_data(TourneyDataClient.__get_latest_monthly_data_date())
+        return result
+
+
+    async def get_second_latest_daily_data(self) -> TourneyData:
+        result = await self.get_data(TourneyDataClient.__get_second_latest_daily_data_date())
+        return result
+
+
+    def __cache_data(self, tourney_data: TourneyData, size: int) -> bool:
+        if tourney_data:
+            # The most recent monthly and daily data get requested most often, so keep them
+            self.__cache.set_pinned_keys(TourneyData.create_data_date_key(data_date) for data_date in TourneyDataClient.__get_latest_data_dates())
+            self.__cache.add(tourney_data, size)
+            return True
+        return False
+
+
+    def __get_raw_data(self, data_date: datetime) -> Optional[str]:
+        file_name_prefixes = [
+            TourneyDataClient.__get_gdrive_file_name_prefix(data_date, include_day=True, include_hour=True),
+            TourneyDataClient.__get_gdrive_file_name_prefix(data_date, include_day=True, include_hour=False),
+            TourneyDataClient.__get_gdrive_file_name_prefix(data_date, include_day=False, include_hour=False),
+        ]
+
+        if self.__mirror:
+            # Only the file for the exact hour can be taken from the mirror, because the backend may have received a more recent file for the day or month
+            file_names = self.__mirror.get_file_names(file_name_prefixes[0])
+            if file_names:
+                return self.__mirror.get_file_contents(max(file_names))
+
+        # The backend isn't necessarily thread-safe, so only one worker thread may access it at a time
+        with self.__BACKEND_LOCK:
+            file_name = None
+            for file_name_prefix in file_name_prefixes:
+                file_names = self.__backend.get_file_names(file_name_prefix)
+                if file_names:
+                    file_name = max(file_names)
+                    break
+            raw_data = self.__backend.get_file_contents(file_name) if file_name else None
+
+        if raw_data and self.__mirror:
+            try:
+                self.__mirror.add_file(file_name, raw_data)
+            except Exception as err:
+                print(f'[TourneyDataClient] Could not add file \'{file_name}\' to the mirror: {err}')
+        return raw_data
+
+
+    async def __retrieve_and_cache_data(self, data_date: datetime, data_date_key: str) -> Optional[TourneyData]:
+        try:
+            result, size = await asyncio.to_thread(self.__retrieve_data, data_date)
+            self.__cache_data(result, size)
+        finally:
+            self.__retrieve_tasks.pop(data_date_key, None)
+        return result
+
+
+    def __retrieve_data(self, data_date: datetime) -> Tuple[Optional[TourneyData], int]:
+        """
+        Blocking. Must not be called from the event loop after initialization.
+
+        Returns the data and the size of the retrieved file.
+        """
+        raw_data = self.__get_raw_data(data_date)
+        result = None
+        if raw_data:
+            data = json.loads(raw_data)
+            if data:
+                result = TourneyData(data)
+        return result, len(raw_data or '') * TOURNEY_DATA_SIZE_FACTOR
+
 
     @staticmethod
     def __get_gdrive_file_name_prefix(data_date: datetime, include_day: bool = True, include_hour: bool = True) -> str:
@@ -810,6 +1165,29 @@ class TourneyDataClient():
         return dt.year, dt.month
 
 
+    @staticmethod
+    def __get_latest_daily_data_date() -> datetime:
+        utc_now = utils.get_utc_now()
+        return utils.datetime.strip_time(utc_now)
+
+
+    @staticmethod
+    def __get_latest_data_dates() -> List[datetime]:
+        return [TourneyDataClient.__get_latest_monthly_data_date(), TourneyDataClient.__get_latest_daily_data_date(), TourneyDataClient.__get_second_latest_daily_data_date()]
+
+
+    @staticmethod
+    def __get_latest_monthly_data_date() -> datetime:
+        utc_now = utils.get_utc_now()
+        return datetime(utc_now.year, utc_now.month, 1, tzinfo=timezone.utc)
+
+
+    @staticmethod
+    def __get_second_latest_daily_data_date() -> datetime:
+        utc_now = utils.get_utc_now()
+        return utils.datetime.strip_time(utc_now - timedelta(days=1))
+
+
     @staticmethod
     def retrieve_past_parameters(ctx: Context, month: str, year: str) -> Tuple[str, str, str]:
         param = None
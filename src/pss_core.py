@@ -1,9 +1,9 @@
-from datetime import datetime
+import asyncio
+from bisect import bisect_left
+from datetime import datetime, timedelta
 import json
 import re
-from typing import Any, Callable, Dict, List, Optional
-
-import aiohttp
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from . import pss_entity as entity
 from .pss_exception import MaintenanceError
@@ -16,6 +16,10 @@ from . import utils
 
 LIVEOPS_BASE_PATH: str = 'LiveOpsService/GetTodayLiveOps?deviceType=DeviceTypeAndroid&languageKey='
 
+NAME_INDEX_NGRAM_LENGTH: int = 3
+
+PRODUCTION_SERVER_RETRY_DELAY: timedelta = timedelta(seconds=30)
+
 __RX_PROPERTY_FIX_REPLACE: re.Pattern = re.compile(r'[^a-z0-9]', re.IGNORECASE)
 __RX_ALLOWED_CANDIDATE_FIX_REPLACE: re.Pattern = re.compile(r'(\(.*?\)|[^a-z0-9 ])', re.IGNORECASE)
 
@@ -23,6 +27,195 @@ __RX_ALLOWED_CANDIDATE_FIX_REPLACE: re.Pattern = re.compile(r'(\(.*?\)|[^a-z0-9
 
 
 
+# ---------- Classes ----------
+
+class EntityNameIndex:
+    """
+    Holds the fixed values of one property of entities data, so that they don't need to be fixed again for every lookup.
+
+    Lookups return the same results as get_ids_from_property_value() would for the same data. Only entries containing the fixed value get scored for similarity.
+    Candidates are shortlisted via the postings of the n-grams of the fixed value. Prefix lookups use a sorted list of the fixed values.
+    """
+    def __init__(self, data: EntitiesData, property_name: str, fix_data_delegate: Callable[[str], str]) -> None:
+        self.__property_name: str = property_name
+        self.__fix_data_delegate: Callable[[str], str] = fix_data_delegate
+        self.__ids: Set[str] = set((data or {}).keys())
+        self.__entries: List[Tuple[str, str, str]] = []
+        if property_name:
+            for entry_id, entry_data in (data or {}).items():
+                entry_property = entry_data.get(property_name)
+                if entry_property:
+                    self.__entries.append((entry_id, fix_data_delegate(entry_property), entry_property))
+
+        self.__ids_by_fixed_value: Dict[str, List[str]] = {}
+        self.__ngram_postings: Dict[str, Set[int]] = {}
+        for i, (entry_id, fixed_property, _) in enumerate(self.__entries):
+            self.__ids_by_fixed_value.setdefault(fixed_property, []).append(entry_id)
+            for ngram in _get_ngrams(fixed_property):
+                self.__ngram_postings.setdefault(ngram, set()).add(i)
+        self.__sorted_entries: List[Tuple[str, int]] = sorted((fixed_property, i) for i, (_, fixed_property, _) in enumerate(self.__entries))
+
+
+    @property
+    def property_name(self) -> str:
+        return self.__property_name
+
+
+    def get_ids(self, property_value: str, match_exact: bool = False) -> List[str]:
+        if not self.__entries or not property_value:
+            return []
+
+        fixed_value = self.__fix_data_delegate(property_value)
+        if match_exact:
+            return list(self.__ids_by_fixed_value.get(fixed_value, []))
+
+        candidates = [self.__entries[i][:2] for i in self.__get_candidate_indices(fixed_value)]
+        return _get_ids_sorted_by_similarity(candidates, fixed_value)
+
+
+    def get_suggestions(self, property_value: str, limit: int) -> List[str]:
+        """
+        Returns up to limit distinct original property values. Values starting with the fixed property_value come first, followed by values containing it.
+        """
+        fixed_value = self.__fix_data_delegate(property_value or '')
+        result = []
+        for _, entry_property in self.__iter_entries_starting_with(fixed_value):
+            if len(result) >= limit:
+                return result
+            if entry_property not in result:
+                result.append(entry_property)
+
+        if fixed_value:
+            containing = []
+            for i in self.__get_candidate_indices(fixed_value):
+                _, fixed_property, entry_property = self.__entries[i]
+                if fixed_value in fixed_property and not fixed_property.startswith(fixed_value):
+                    containing.append((fixed_property, entry_property))
+            for _, entry_property in sorted(containing):
+                if len(result) >= limit:
+                    break
+                if entry_property not in result:
+                    result.append(entry_property)
+        return result
+
+
+    def get_values_starting_with(self, property_value: str, limit: int = None) -> List[Tuple[str, str]]:
+        """
+        Returns tuples of (entity id, original property value) for all entries whose fixed property value starts with the fixed property_value, ordered by the fixed property value.
+        """
+        fixed_value = self.__fix_data_delegate(property_value or '')
+        result = []
+        for entry in self.__iter_entries_starting_with(fixed_value):
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(entry)
+        return result
+
+
+    def has_same_ids(self, data: EntitiesData) -> bool:
+        """
+        Checks, whether data contains the same entity ids as the data this index has been created from.
+        """
+        return data is not None and len(data) == len(self.__ids) and data.keys() == self.__ids
+
+
+    def __get_candidate_indices(self, fixed_value: str) -> Iterable[int]:
+        ngrams = _get_ngrams(fixed_value)
+        if len(fixed_value) < NAME_INDEX_NGRAM_LENGTH or not ngrams:
+            return range(len(self.__entries))
+
+        postings = []
+        for ngram in ngrams:
+            posting = self.__ngram_postings.get(ngram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        result = set(postings[0]).intersection(*postings[1:])
+        return sorted(result)
+
+
+    def __iter_entries_starting_with(self, fixed_value: str) -> Iterable[Tuple[str, str]]:
+        position = bisect_left(self.__sorted_entries, (fixed_value, -1))
+        while position < len(self.__sorted_entries):
+            fixed_property, i = self.__sorted_entries[position]
+            if not fixed_property.startswith(fixed_value):
+                break
+            entry_id, _, entry_property = self.__entries[i]
+            yield (entry_id, entry_property)
+            position += 1
+
+
+
+
+
+class ProductionServerResolver:
+    """
+    Retrieves the production server from the latest settings and caches it for a configurable duration.
+
+    When the cached value expires, it will still be served while being revalidated in the background. Concurrent refreshes share a single request to the API.
+    If a refresh fails (e.g. due to maintenance), the last known good production server will be kept and the refresh will be retried shortly after.
+    """
+    def __init__(self, cache_duration: int) -> None:
+        self.__cache_duration: timedelta = timedelta(seconds=cache_duration)
+        self.__production_server: str = None
+        self.__next_refresh_at: datetime = None
+        self.__refresh_task: asyncio.Task = None
+
+
+    @property
+    def production_server(self) -> Optional[str]:
+        return self.__production_server
+
+
+    async def get_production_server(self, language_key: str = 'en') -> str:
+        if self.__production_server is None:
+            return await self.refresh(language_key=language_key)
+        if self.__get_is_outdated():
+            self.__start_refresh(language_key)
+        return self.__production_server
+
+
+    async def refresh(self, language_key: str = 'en') -> str:
+        """
+        Retrieves the production server from the API. If a refresh is already in progress, waits for that one to finish.
+
+        Raises, if there's no production server known, yet, and it couldn't be retrieved.
+        """
+        refresh_task = self.__start_refresh(language_key)
+        await asyncio.shield(refresh_task)
+        return self.__production_server
+
+
+    def __get_is_outdated(self) -> bool:
+        return self.__next_refresh_at is None or utils.get_utc_now() >= self.__next_refresh_at
+
+
+    def __start_refresh(self, language_key: str) -> asyncio.Task:
+        if self.__refresh_task is None or self.__refresh_task.done():
+            self.__refresh_task = asyncio.create_task(self.__update_production_server(language_key))
+        return self.__refresh_task
+
+
+    async def __update_production_server(self, language_key: str) -> None:
+        try:
+            latest_settings = await get_latest_settings(language_key=language_key, base_url=settings.BASE_API_URL)
+            production_server = latest_settings.get('ProductionServer')
+            if not production_server:
+                raise ValueError('The latest settings do not contain a production server.')
+        except Exception as err:
+            if self.__production_server is None:
+                raise
+            print(f'[ProductionServerResolver] Could not retrieve the production server, keeping \'{self.__production_server}\': {err}')
+            self.__next_refresh_at = utils.get_utc_now() + PRODUCTION_SERVER_RETRY_DELAY
+        else:
+            self.__production_server = production_server
+            self.__next_refresh_at = utils.get_utc_now() + self.__cache_duration
+
+
+
+
+
 # ---------- Functions ----------
 
 def filter_entities_data(data: EntitiesData, by: Dict[str, str], ignore_case: bool = False) -> Optional[EntitiesData]:
@@ -77,6 +270,10 @@ async def get_liveops_info(language_key: str = 'en') -> EntityInfo:
     return result
 
 
+def create_entity_name_index(data: EntitiesData, property_name: str, fix_data_delegate: Callable[[str], str] = None) -> EntityNameIndex:
+    return EntityNameIndex(data, property_name, fix_data_delegate or __fix_property_value)
+
+
 def get_ids_from_property_value(data: EntitiesData, property_name: str, property_value: str, fix_data_delegate: Callable[[str], str] = None, match_exact: bool = False) -> List[str]:
     # data structure: {id: content}
     # fixed_data structure: {description: id}
@@ -93,22 +290,7 @@ def get_ids_from_property_value(data: EntitiesData, property_name: str, property
     if match_exact:
         results = [key for key, value in fixed_data.items() if value == fixed_value]
     else:
-        similarity_map = {}
-        for entry_id, entry_property in fixed_data.items():
-            if entry_property.startswith(fixed_value) or fixed_value in entry_property:
-                similarity_value = utils.get_similarity(entry_property, fixed_value)
-                if similarity_value in similarity_map.keys():
-                    similarity_map[similarity_value].append((entry_id, entry_property))
-                else:
-                    similarity_map[similarity_value] = [(entry_id, entry_property)]
-        for similarity_value, entries in similarity_map.items():
-            similarity_map[similarity_value] = sorted(entries, key=lambda entry: entry[1])
-        similarity_values = sorted(list(similarity_map.keys()), reverse=True)
-        results = []
-        for similarity_value in similarity_values:
-            if not match_exact or (match_exact is True and similarity_value.is_integer()):
-                entry_ids = [entry_id for (entry_id, _) in similarity_map[similarity_value]]
-                results.extend(entry_ids)
+        results = _get_ids_sorted_by_similarity(fixed_data.items(), fixed_value)
 
     return results
 
@@ -175,6 +357,31 @@ def transform_sanitize_text(*args, **kwargs) -> Optional[str]:
         return None
 
 
+def _get_ids_sorted_by_similarity(entries: Iterable[Tuple[str, str]], fixed_value: str) -> List[str]:
+    """Parameter 'entries':
+       - Tuples of (entity id, fixed property value). """
+    similarity_map = {}
+    for entry_id, entry_property in entries:
+        if entry_property.startswith(fixed_value) or fixed_value in entry_property:
+            similarity_value = utils.get_similarity(entry_property, fixed_value)
+            if similarity_value in similarity_map.keys():
+                similarity_map[similarity_value].append((entry_id, entry_property))
+            else:
+                similarity_map[similarity_value] = [(entry_id, entry_property)]
+    for similarity_value, similar_entries in similarity_map.items():
+        similarity_map[similarity_value] = sorted(similar_entries, key=lambda entry: entry[1])
+    similarity_values = sorted(list(similarity_map.keys()), reverse=True)
+    results = []
+    for similarity_value in similarity_values:
+        entry_ids = [entry_id for (entry_id, _) in similarity_map[similarity_value]]
+        results.extend(entry_ids)
+    return results
+
+
+def _get_ngrams(value: str) -> Set[str]:
+    return {value[i:i + NAME_INDEX_NGRAM_LENGTH] for i in range(len(value) - NAME_INDEX_NGRAM_LENGTH + 1)}
+
+
 def __filter_data_dict(data: EntitiesData, by_key: Any, by_value: Any, ignore_case: bool) -> Optional[EntitiesData]:
     """Parameter 'data':
        - A dict with entity ids as keys and entity info as values. """
@@ -206,22 +413,19 @@ def __fix_property_value(property_value: str) -> str:
 async def __get_data_from_url(url: str) -> str:
     if settings.PRINT_DEBUG_WEB_REQUESTS:
         print(f'[WebRequest] Attempting to get data from url: {url}')
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            data = await response.text(encoding='utf-8')
-            if settings.PRINT_DEBUG_WEB_REQUESTS:
-                log_data = data or ''
-                if log_data and len(log_data) > 100:
-                    log_data = log_data[:100]
-                print(f'[WebRequest] Returned data: {log_data}')
+    data = await utils.web.get_text(url, encoding='utf-8')
+    if settings.PRINT_DEBUG_WEB_REQUESTS:
+        log_data = data or ''
+        if log_data and len(log_data) > 100:
+            log_data = log_data[:100]
+        print(f'[WebRequest] Returned data: {log_data}')
     return data
 
 
 async def __get_production_server(language_key: str = 'en') -> str:
     if settings.PRODUCTION_SERVER:
         return settings.PRODUCTION_SERVER
-    latest_settings = await get_latest_settings(language_key=language_key, base_url=settings.BASE_API_URL)
-    return latest_settings['ProductionServer']
+    return await PRODUCTION_SERVER_RESOLVER.get_production_server(language_key=language_key)
 
 
 def __parse_entity_datetime(*args, **kwargs) -> Optional[datetime]:
@@ -229,4 +433,12 @@ def __parse_entity_datetime(*args, **kwargs) -> Optional[datetime]:
     entity_property = kwargs.get('entity_property')
     if entity_property:
         result = utils.parse.pss_datetime(entity_property)
-    return result
\ No newline at end of file
+    return result
+
+
+
+
+
+# ---------- Initialization ----------
+
+PRODUCTION_SERVER_RESOLVER: ProductionServerResolver = ProductionServerResolver(settings.PRODUCTION_SERVER_CACHE_DURATION)
@@ -6,6 +6,7 @@ from . import pss_entity as entity
 CRAFT_DESIGN_BASE_PATH: str = 'RoomService/ListCraftDesigns?languageKey=en'
 CRAFT_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'CraftName'
 CRAFT_DESIGN_KEY_NAME: str = 'CraftDesignId'
+CRAFT_DESIGN_VERSION_KEY: str = 'CraftDesignVersion'
 
 
 
@@ -17,5 +18,6 @@ crafts_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     CRAFT_DESIGN_BASE_PATH,
     CRAFT_DESIGN_KEY_NAME,
     CRAFT_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    'CraftDesigns'
+    'CraftDesigns',
+    cache_version_key=CRAFT_DESIGN_VERSION_KEY
 )
\ No newline at end of file
@@ -20,10 +20,12 @@ from .typehints import EntitiesData, EntityInfo
 CHARACTER_DESIGN_BASE_PATH: str = "CharacterService/ListAllCharacterDesigns2?languageKey=en"
 CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME: str = "CharacterDesignName"
 CHARACTER_DESIGN_KEY_NAME: str = "CharacterDesignId"
+CHARACTER_DESIGN_VERSION_KEY: str = "CharacterDesignVersion"
 
 COLLECTION_DESIGN_BASE_PATH: str = "CollectionService/ListAllCollectionDesigns?languageKey=en"
 COLLECTION_DESIGN_DESCRIPTION_PROPERTY_NAME: str = "CollectionName"
 COLLECTION_DESIGN_KEY_NAME: str = "CollectionDesignId"
+COLLECTION_DESIGN_VERSION_KEY: str = "CollectionDesignVersion"
 
 __PRESTIGE_FROM_BASE_PATH: str = "CharacterService/PrestigeCharacterFrom?languagekey=en&characterDesignId="
 __PRESTIGE_TO_BASE_PATH: str = "CharacterService/PrestigeCharacterTo?languagekey=en&characterDesignId="
@@ -463,6 +465,7 @@ def __create_character_details_from_info(character_info: EntityInfo, characters_
         __properties["character_embed_settings"],
         characters_data,
         collections_data,
+        render_cache_key=("Character", character_info.get(CHARACTER_DESIGN_KEY_NAME), level, characters_designs_retriever.data_version, collections_designs_retriever.data_version),
         level=level,
     )
 
@@ -484,6 +487,7 @@ def __create_collection_details_from_info(collection_info: EntityInfo, collectio
         __properties["collection_embed_settings"],
         collections_data,
         characters_data,
+        render_cache_key=("Collection", collection_info.get(COLLECTION_DESIGN_KEY_NAME), collections_designs_retriever.data_version, characters_designs_retriever.data_version),
     )
 
 
@@ -551,10 +555,10 @@ def __prepare_prestige_infos(characters_data: EntitiesData, prestige_ids: Dict[s
 
 # ---------- Initilization ----------
 
-characters_designs_retriever = entity.EntityRetriever(CHARACTER_DESIGN_BASE_PATH, CHARACTER_DESIGN_KEY_NAME, CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME, cache_name="CharacterDesigns")
+characters_designs_retriever = entity.EntityRetriever(CHARACTER_DESIGN_BASE_PATH, CHARACTER_DESIGN_KEY_NAME, CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME, cache_name="CharacterDesigns", cache_version_key=CHARACTER_DESIGN_VERSION_KEY)
 
 
-collections_designs_retriever = entity.EntityRetriever(COLLECTION_DESIGN_BASE_PATH, COLLECTION_DESIGN_KEY_NAME, COLLECTION_DESIGN_DESCRIPTION_PROPERTY_NAME, cache_name="CollectionDesigns")
+collections_designs_retriever = entity.EntityRetriever(COLLECTION_DESIGN_BASE_PATH, COLLECTION_DESIGN_KEY_NAME, COLLECTION_DESIGN_DESCRIPTION_PROPERTY_NAME, cache_name="CollectionDesigns", cache_version_key=COLLECTION_DESIGN_VERSION_KEY)
 
 
 __properties: entity.EntityDetailsCreationPropertiesCollection = {
@@ -1,7 +1,7 @@
 from datetime import date, datetime
 import json
 import random
-from typing import Any, Callable, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from discord import Embed
 from discord.ext.commands import Context
@@ -100,9 +100,10 @@ async def clear_sales() -> None:
 
 
 async def get_oldest_expired_sale_entity_details(utc_now: datetime, for_embed: bool = False) -> List[str]:
-    db_sales_infos = await __db_get_sales_infos(utc_now=utc_now)
-    sales_infos = await __process_db_sales_infos(db_sales_infos, utc_now)
-    sales_infos = reversed(sales_infos)
+    db_sales_info = await get_oldest_expired_sale_info(utc_now)
+    if not db_sales_info:
+        return None
+    sales_infos = await __process_db_sales_infos([db_sales_info], utc_now)
     for sales_info in sales_infos:
         expiring_entity_details = '\n'.join((await sales_info['entity_details'].get_details_as_text(entity.EntityDetailsType.MEDIUM, for_embed=for_embed)))
         price = sales_info['price']
@@ -112,6 +113,18 @@ async def get_oldest_expired_sale_entity_details(utc_now: datetime, for_embed: b
     return None
 
 
+async def get_oldest_expired_sale_info(utc_now: datetime) -> Optional[Dict[str, Any]]:
+    """
+    Returns the db sales info of the oldest sale that can still be purchased on the Late Sales Portal.
+    """
+    db_sales_infos = await __db_get_sales_infos(utc_now=utc_now)
+    for db_sales_info in reversed(db_sales_infos):
+        expires_in = __get_expired_sale_expires_in(db_sales_info, utc_now)
+        if expires_in is not None and expires_in >= 1:
+            return db_sales_info
+    return None
+
+
 async def get_sales_infos(category_type: str = None, currency_type: str = None) -> SalesCache:
     result = list(__sales_info_cache)
     if category_type:
@@ -257,10 +270,8 @@ async def __process_db_sales_infos(db_sales_infos: List[Dict[str, Any]], utc_now
 
     for db_sales_info in db_sales_infos:
         expiry_date: datetime = db_sales_info['limitedcatalogexpirydate']
-        if expiry_date.date() > utc_now.date():
-            continue
-        expires_in = 30 - (utc_now - expiry_date).days
-        if filter_old and expires_in < 1:
+        expires_in = __get_expired_sale_expires_in(db_sales_info, utc_now)
+        if expires_in is None or filter_old and expires_in < 1:
             continue
         entity_id = db_sales_info['limitedcatalogargument']
         entity_type = db_sales_info['limitedcatalogtype']
@@ -465,6 +476,16 @@ def __get_daily_info_setting_name(field_name: str) -> str:
     return f'daily{field_name}'
 
 
+def __get_expired_sale_expires_in(db_sales_info: Dict[str, Any], utc_now: datetime) -> Optional[int]:
+    """
+    Returns the number of days left to purchase an expired sale or None, if the sale hasn't expired, yet.
+    """
+    expiry_date: datetime = db_sales_info['limitedcatalogexpirydate']
+    if expiry_date.date() > utc_now.date():
+        return None
+    return 30 - (utc_now - expiry_date).days
+
+
 
 
 
@@ -1,6 +1,7 @@
 from datetime import datetime
+import json
 import pprint
-from typing import List, Optional, Tuple, Union
+from typing import Hashable, List, Optional, Tuple, Union
 
 from discord import Embed, Guild, Message
 from discord.ext.commands import Bot, Context
@@ -14,6 +15,7 @@ from .pss_exception import Error
 from . import pss_item as item
 from . import pss_lookups as lookups
 from . import pss_mission as mission
+from . import pss_research as research
 from . import pss_room as room
 from . import pss_situation as situation
 from . import pss_sprites as sprites
@@ -56,10 +58,31 @@ def compare_dropship_messages(message: Message, dropship_text: str, dropship_emb
 
 
 async def get_dropship_text(bot: Bot = None, guild: Guild = None, daily_info: dict = None, utc_now: datetime = None, language_key: str = 'en') -> Tuple[List[str], List[Embed], bool]:
+    """
+    The output gets cached until the daily info, the current events, the oldest expired sale, the star date or the underlying game data change.
+    """
+    global __dropship_output_cache
     utc_now = utc_now or utils.get_utc_now()
     if not daily_info:
         daily_info = await daily.get_daily_info(language_key)
 
+    cache_key = await __get_dropship_output_cache_key(daily_info, utc_now)
+    if __dropship_output_cache is not None and __dropship_output_cache[0] == cache_key:
+        lines, embed = __dropship_output_cache[1]
+    else:
+        output = await __create_dropship_output(daily_info, utc_now)
+        if not output:
+            return [], [], False
+        __dropship_output_cache = (cache_key, output)
+        lines, embed = output
+
+    # The cached embed is shared, so the guild-specific colour gets applied to a copy
+    embed = embed.copy()
+    embed.colour = utils.discord.get_bot_member_colour(bot, guild)
+    return list(lines), [embed], True
+
+
+async def __create_dropship_output(daily_info: EntityInfo, utc_now: datetime) -> Optional[Tuple[List[str], Embed]]:
     chars_designs_data = await crew.characters_designs_retriever.get_data_dict3()
     collections_designs_data = await crew.collections_designs_retriever.get_data_dict3()
     items_designs_data = await item.items_designs_retriever.get_data_dict3()
@@ -78,7 +101,7 @@ async def get_dropship_text(bot: Bot = None, guild: Guild = None, daily_info: di
         pp = pprint.PrettyPrinter(indent=4)
         pp.pprint(daily_info)
         print(e)
-        return [], [], False
+        return None
 
     parts_text = [dropship_msg, merchantship_msg, shop_msg, daily_reward_msg]
 
@@ -119,10 +142,9 @@ async def get_dropship_text(bot: Bot = None, guild: Guild = None, daily_info: di
     icon_url = await sprites.get_download_sprite_link(event_sprite_id) if event_sprite_id else None
     if thumbnail_url == image_url:
         thumbnail_url = None
-    colour = utils.discord.get_bot_member_colour(bot, guild)
-    embed = utils.discord.create_embed(title, description=description, fields=fields, thumbnail_url=thumbnail_url, image_url=image_url, icon_url=icon_url, colour=colour, footer=footer)
+    embed = utils.discord.create_embed(title, description=description, fields=fields, thumbnail_url=thumbnail_url, image_url=image_url, icon_url=icon_url, footer=footer)
 
-    return lines, [embed], True
+    return lines, embed
 
 
 async def __get_current_events_details_as_text(situations_designs_data: EntitiesData, chars_designs_data: EntitiesData, collections_designs_data: EntitiesData, items_designs_data: EntitiesData, missions_designs_data: EntitiesData, rooms_designs_data: EntitiesData, utc_now: datetime) -> Optional[Tuple[List[str], str]]:
@@ -171,6 +193,27 @@ async def __get_dropship_msg_from_info_as_text(daily_info: EntityInfo, chars_dat
     return result
 
 
+async def __get_dropship_output_cache_key(daily_info: EntityInfo, utc_now: datetime) -> Hashable:
+    # Read the data versions before retrieving any data, so that an update during the retrieval causes a cache miss on the next call
+    data_versions = tuple(retriever.data_version for retriever in (
+        crew.characters_designs_retriever,
+        crew.collections_designs_retriever,
+        item.items_designs_retriever,
+        mission.missions_designs_retriever,
+        research.researches_designs_retriever,
+        room.rooms_designs_retriever,
+        room.rooms_designs_sprites_retriever,
+        situation.situations_designs_retriever,
+        training.trainings_designs_retriever,
+    ))
+    situations_designs_data = await situation.situations_designs_retriever.get_data_dict3()
+    current_situations_ids = tuple(situation.get_current_situations_ids(situations_designs_data, utc_now))
+    oldest_expired_sale_info = await daily.get_oldest_expired_sale_info(utc_now)
+    oldest_expired_sale_key = tuple(oldest_expired_sale_info.items()) if oldest_expired_sale_info else None
+    result = (json.dumps(daily_info, sort_keys=True, default=str), utc_now.date(), data_versions, current_situations_ids, oldest_expired_sale_key)
+    return result
+
+
 async def __get_merchantship_msg_from_info_as_text(daily_info: EntityInfo, items_data: EntitiesData, trainings_data: EntitiesData) -> List[str]:
     result = [f'{emojis.pss_merchantship} **Merchant ship**']
     if daily_info:
@@ -357,4 +400,7 @@ __properties: entity.EntityDetailsCreationPropertiesCollection = {
         'footer': entity.EntityDetailProperty('footer', False, transform_function=__get_news_footer),
         'timestamp': entity.EntityDetailProperty('timestamp', False, entity_property_name='UpdateDate', transform_function=__get_pss_datetime)
     }
-}
\ No newline at end of file
+}
+
+
+__dropship_output_cache: Tuple[Hashable, Tuple[List[str], Embed]] = None
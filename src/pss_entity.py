@@ -1,7 +1,9 @@
+import asyncio
+from collections import OrderedDict
 import inspect
 import json
 from enum import IntEnum
-from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 from xml.etree import ElementTree
 
 from discord import Embed
@@ -361,9 +363,12 @@ class EntityDetails(object):
         embed_settings: Dict[str, EntityDetailProperty],
         *entities_data: Optional[EntitiesData],
         prefix: str = None,
+        render_cache_key: Hashable = None,
         **kwargs,
     ):
-        """ """
+        """
+        render_cache_key: if specified, the calculated title, description, details and embed settings will be shared with all EntityDetails created with the same key via ENTITY_DETAILS_RENDER_CACHE. The key must change, if any of the data used changes (e.g. include the entity type, the entity id, any kwargs and the data versions).
+        """
         self.__entities_data: EntitiesData = entities_data or {}
         self.__entity_info: EntityInfo = entity_info or {}
         self.__title_property_collection: EntityDetailPropertyCollection = title or NO_PROPERTY
@@ -391,15 +396,19 @@ class EntityDetails(object):
                 True: {EntityDetailsType.LONG: [], EntityDetailsType.MEDIUM: [], EntityDetailsType.SHORT: [], EntityDetailsType.MINI: []},
             }
         self.__embed_settings: Dict[str, EntityDetailProperty] = embed_settings or {}
-        self.__calculated_embed_settings: Dict[str, str] = None
-        self.__titles: Dict[EntityDetailsType, str] = {}
-        self.__descriptions: Dict[EntityDetailsType, str] = {}
-        self.__details: Dict[bool, Dict[EntityDetailsType, List[CalculatedEntityDetailProperty]]] = {
-            False: {EntityDetailsType.LONG: None, EntityDetailsType.MEDIUM: None, EntityDetailsType.SHORT: None, EntityDetailsType.MINI: None},
-            True: {EntityDetailsType.LONG: None, EntityDetailsType.MEDIUM: None, EntityDetailsType.SHORT: None, EntityDetailsType.MINI: None},
-        }
         self.__prefix: str = prefix or ""
         self.__kwargs: Dict[str, object] = kwargs
+        self.__render_cache_key: Hashable = render_cache_key
+        self.__rendered: Dict[str, Any] = None
+        if render_cache_key is not None:
+            self.__rendered = ENTITY_DETAILS_RENDER_CACHE.get(render_cache_key, self.__entity_info)
+        if self.__rendered is None:
+            self.__rendered = _create_rendered_entity_details(self.__entity_info)
+            if render_cache_key is not None:
+                ENTITY_DETAILS_RENDER_CACHE.add(render_cache_key, self.__rendered)
+        self.__titles: Dict[EntityDetailsType, str] = self.__rendered["titles"]
+        self.__descriptions: Dict[EntityDetailsType, str] = self.__rendered["descriptions"]
+        self.__details: Dict[bool, Dict[EntityDetailsType, List[CalculatedEntityDetailProperty]]] = self.__rendered["details"]
 
     @property
     def entities_data(self) -> Tuple[EntitiesData]:
@@ -427,6 +436,7 @@ class EntityDetails(object):
             self.__entities_data,
             self.__prefix,
             self.__kwargs,
+            render_cache_key=self.__render_cache_key,
         )
 
     async def get_details(self, as_embed: bool, details_type: EntityDetailsType) -> List[CalculatedEntityDetailProperty]:
@@ -464,14 +474,14 @@ class EntityDetails(object):
         return result
 
     async def get_embed_settings(self) -> Dict[str, str]:
-        if self.__calculated_embed_settings is None and self.__embed_settings:
+        if self.__rendered["embed_settings"] is None and self.__embed_settings:
+            values = await asyncio.gather(*[self.__get_calculated_property(setting_value) for setting_value in self.__embed_settings.values()])
             result = {}
-            for setting_name, setting_value in self.__embed_settings.items():
-                value = await self.__get_calculated_property(setting_value)
+            for setting_name, value in zip(self.__embed_settings.keys(), values):
                 if value and value.value:
                     result[setting_name] = value.value
-            self.__calculated_embed_settings = result
-        return self.__calculated_embed_settings
+            self.__rendered["embed_settings"] = result
+        return self.__rendered["embed_settings"]
 
     async def get_full_details(self, as_embed: bool, details_type: EntityDetailsType) -> Tuple[str, str, List[CalculatedEntityDetailProperty]]:
         details_type = details_type or (EntityDetailsType.EMBED if as_embed else None)
@@ -489,6 +499,12 @@ class EntityDetails(object):
         """
         if self.__entity_info:
             self.__entity_info = new_entity_info
+            # The calculated values of the previous entity info must neither be used, nor be shared anymore
+            self.__render_cache_key = None
+            self.__rendered = _create_rendered_entity_details(self.__entity_info)
+            self.__titles = self.__rendered["titles"]
+            self.__descriptions = self.__rendered["descriptions"]
+            self.__details = self.__rendered["details"]
 
     async def _get_description(self, details_type: EntityDetailsType = EntityDetailsType.LONG) -> str:
         return await self.__get_property_from_collection(self.__description_property_collection, self.__descriptions, details_type)
@@ -499,10 +515,9 @@ class EntityDetails(object):
             as_embed = True
             details_type = EntityDetailsType.LONG
         if self.__details[as_embed][details_type] is None and self.__properties[as_embed][details_type] is not None:
-            self.__details[as_embed][details_type] = []
-            for entity_detail_property in self.__properties[as_embed][details_type]:
-                self.__details[as_embed][details_type].append(await self.__get_calculated_property(entity_detail_property))
-            # self.__details[as_embed][details_type] = [await self.__get_calculated_property(entity_detail_property) for entity_detail_property in self.__properties[as_embed][details_type]]
+            # The properties don't depend on each other, so the async transform functions can run concurrently
+            details = await asyncio.gather(*[self.__get_calculated_property(entity_detail_property) for entity_detail_property in self.__properties[as_embed][details_type]])
+            self.__details[as_embed][details_type] = list(details)
         return self.__details[as_embed][details_type]
 
     async def _get_title(self, details_type: EntityDetailsType = EntityDetailsType.LONG) -> str:
@@ -746,6 +761,47 @@ class EntityDetailsCollection:
         return result
 
 
+class EntityDetailsRenderCache:
+    """
+    Holds the calculated values of EntityDetails by their render cache keys. The least recently used entries get evicted, if the maximum size is exceeded.
+
+    An entry will only be returned, if it has been calculated from an equal entity info.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.__max_size: int = max_size
+        self.__entries: OrderedDict[Hashable, Dict[str, Any]] = OrderedDict()
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        return len(self.__entries)
+
+    def add(self, render_cache_key: Hashable, rendered: Dict[str, Any]) -> None:
+        if self.__max_size <= 0:
+            return
+        self.__entries[render_cache_key] = rendered
+        self.__entries.move_to_end(render_cache_key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def get(self, render_cache_key: Hashable, entity_info: EntityInfo) -> Optional[Dict[str, Any]]:
+        rendered = self.__entries.get(render_cache_key)
+        if rendered is None:
+            return None
+        if rendered["entity_info"] != entity_info:
+            del self.__entries[render_cache_key]
+            return None
+        self.__entries.move_to_end(render_cache_key)
+        return rendered
+
+
 class EntityRetriever:
     def __init__(
         self,
@@ -756,6 +812,7 @@ class EntityRetriever:
         sorted_key_function: Callable[[dict, dict], str] = None,
         fix_data_delegate: Callable[[str], str] = None,
         cache_update_interval: int = 10,
+        cache_version_key: str = None,
     ) -> None:
         self.__cache_name: str = cache_name or ""
         self.__base_path: str = entity_base_path
@@ -764,12 +821,21 @@ class EntityRetriever:
         self.__sorted_key_function: Callable[[dict, dict], str] = sorted_key_function
         self.__fix_data_delegate: Callable[[str], str] = fix_data_delegate
 
-        self._cache = PssCache(self.__base_path, self.__cache_name, key_name=self.__key_name, update_interval=cache_update_interval)
+        self._cache = PssCache(self.__base_path, self.__cache_name, key_name=self.__key_name, update_interval=cache_update_interval, version_key=cache_version_key)
+        self.__name_indices: Dict[str, core.EntityNameIndex] = {}
+        self.__name_indices_data_version: int = None
+        self.__name_index_tasks: Dict[str, asyncio.Task] = {}
+        self.__raw_entity_infos_by_id: Dict[str, str] = None
+        self.__raw_entity_infos_data_version: int = None
 
     @property
     def base_path(self) -> str:
         return self.__base_path
 
+    @property
+    def data_version(self) -> int:
+        return self._cache.data_version
+
     @property
     def description_property_name(self) -> str:
         return self.__description_property_name
@@ -778,7 +844,13 @@ class EntityRetriever:
     def key_name(self) -> str:
         return self.__key_name
 
-    async def get_data_dict3(self) -> Dict[str, Dict[str, object]]:
+    def add_data_changed_callback(self, callback: Callable[[], Any]) -> None:
+        self._cache.add_data_changed_callback(callback)
+
+    async def get_data_dict3(self) -> Mapping[str, Mapping[str, Any]]:
+        """
+        Returns a read-only view of the cached data. Entity infos must be copied before modifying them.
+        """
         return await self._cache.get_data_dict3()
 
     async def get_entity_info_by_name(self, entity_name: str, entities_data: EntitiesData = None) -> Dict[str, object]:
@@ -807,22 +879,62 @@ class EntityRetriever:
             return None
 
     async def get_entities_ids_by_name(self, entity_name: str, entities_data: EntitiesData = None) -> List[str]:
-        entities_data = entities_data or await self.get_data_dict3()
-        results = core.get_ids_from_property_value(entities_data, self.__description_property_name, entity_name, fix_data_delegate=self.__fix_data_delegate)
+        results = await self.get_entities_ids_by_property_value(self.__description_property_name, entity_name, entities_data=entities_data)
         return results
 
+    async def get_entities_ids_by_property_value(self, property_name: str, property_value: str, entities_data: EntitiesData = None, match_exact: bool = False) -> List[str]:
+        """
+        Looks up the entity ids via the name index of the specified property. If entities_data is provided and contains other entities than the cached data, the lookup will be performed on entities_data instead.
+        """
+        name_index = await self.get_name_index(property_name)
+        if not entities_data or name_index.has_same_ids(entities_data):
+            results = name_index.get_ids(property_value, match_exact=match_exact)
+        else:
+            results = core.get_ids_from_property_value(entities_data, property_name, property_value, fix_data_delegate=self.__fix_data_delegate, match_exact=match_exact)
+        return results
+
+    async def get_name_index(self, property_name: str = None) -> 'core.EntityNameIndex':
+        """
+        Returns the name index for the specified property (defaults to the description property). The indices get rebuilt after the cached data has changed.
+        """
+        property_name = property_name or self.__description_property_name
+        await self._cache.get_raw_data()
+        if self.__name_indices_data_version != self._cache.data_version or property_name not in self.__name_indices:
+            entities_data = await self._cache.get_data_dict3()
+            data_version = self._cache.data_version
+            if self.__name_indices_data_version != data_version:
+                self.__name_indices = {}
+                self.__name_indices_data_version = data_version
+            self.__name_indices[property_name] = core.create_entity_name_index(entities_data, property_name, fix_data_delegate=self.__fix_data_delegate)
+        return self.__name_indices[property_name]
+
+    async def get_name_suggestions(self, property_value: str, property_name: str = None, limit: int = settings.AUTOCOMPLETE_MAX_RESULTS) -> List[str]:
+        """
+        Returns up to limit distinct values of the specified property (defaults to the description property) starting with or containing property_value. Meant for autocompletion.
+
+        Doesn't wait for the data to be downloaded and parsed. If the name index hasn't been built yet, it gets built in the background and no suggestions are returned. If it's outdated, it gets rebuilt in the background and the outdated index is used meanwhile.
+        """
+        property_name = property_name or self.__description_property_name
+        name_index = self.__name_indices.get(property_name)
+        if name_index is None or self.__name_indices_data_version != self._cache.data_version:
+            self.__start_name_index_build(property_name)
+        if name_index is None:
+            return []
+        return name_index.get_suggestions(property_value, limit)
+
     async def get_raw_data(self) -> str:
         return await self._cache.get_raw_data()
 
     async def get_raw_entity_info_by_id_as_xml(self, entity_id: str) -> str:
-        result = None
+        """
+        Looks up the serialized XML of the entity with the specified id. The XML fragments of all entities get serialized once per data version.
+        """
         raw_data = await self._cache.get_raw_data()
-        for element in ElementTree.fromstring(raw_data).iter():
-            element_id = element.attrib.get(self.__key_name)
-            if element_id == entity_id:
-                result = ElementTree.tostring(element).decode("utf-8")
-                break
-        return result
+        data_version = self._cache.data_version
+        if self.__raw_entity_infos_by_id is None or self.__raw_entity_infos_data_version != data_version:
+            self.__raw_entity_infos_by_id = await asyncio.to_thread(_get_raw_entity_infos_by_id, raw_data, self.__key_name)
+            self.__raw_entity_infos_data_version = data_version
+        return self.__raw_entity_infos_by_id.get(entity_id)
 
     async def get_raw_entity_info_by_id_as_json(self, entity_id: str, fix_xml_attributes: bool = False) -> str:
         result = None
@@ -836,6 +948,18 @@ class EntityRetriever:
     async def update_cache(self) -> None:
         await self._cache.update_data()
 
+    def __on_name_index_build_done(self, property_name: str, build_task: asyncio.Task) -> None:
+        if self.__name_index_tasks.get(property_name) is build_task:
+            self.__name_index_tasks.pop(property_name)
+        if not build_task.cancelled() and build_task.exception():
+            print(f"[EntityRetriever] Could not build the name index of property '{property_name}' for cache '{self.__cache_name}': {build_task.exception()}")
+
+    def __start_name_index_build(self, property_name: str) -> None:
+        if property_name not in self.__name_index_tasks:
+            build_task = asyncio.create_task(self.get_name_index(property_name))
+            build_task.add_done_callback(lambda task: self.__on_name_index_build_done(property_name, task))
+            self.__name_index_tasks[property_name] = build_task
+
 
 # ---------- Helper ----------
 
@@ -890,6 +1014,29 @@ def sort_entities_by(entity_infos: List[EntityInfo], order_info: List[Tuple[str,
         return sorted(result)
 
 
+def _create_rendered_entity_details(entity_info: EntityInfo) -> Dict[str, Any]:
+    return {
+        "entity_info": dict(entity_info),
+        "descriptions": {},
+        "details": {
+            False: {EntityDetailsType.LONG: None, EntityDetailsType.MEDIUM: None, EntityDetailsType.SHORT: None, EntityDetailsType.MINI: None},
+            True: {EntityDetailsType.LONG: None, EntityDetailsType.MEDIUM: None, EntityDetailsType.SHORT: None, EntityDetailsType.MINI: None},
+        },
+        "embed_settings": None,
+        "titles": {},
+    }
+
+
+def _get_raw_entity_infos_by_id(raw_data: str, key_name: str) -> Dict[str, str]:
+    result = {}
+    if raw_data and key_name:
+        for element in ElementTree.fromstring(raw_data).iter():
+            element_id = element.attrib.get(key_name)
+            if element_id is not None and element_id not in result:
+                result[element_id] = ElementTree.tostring(element).decode("utf-8")
+    return result
+
+
 # ---------- Legacy ----------
 
 
@@ -980,3 +1127,4 @@ class LegacyEntityDetails(object):
 # ---------- Initialization ----------
 
 NO_PROPERTY = EntityDetailProperty(None, False)
+ENTITY_DETAILS_RENDER_CACHE: EntityDetailsRenderCache = EntityDetailsRenderCache(settings.ENTITY_DETAILS_RENDER_CACHE_SIZE)
@@ -193,7 +193,7 @@ async def __get_fleet_users_data_by_fleet_id(alliance_id: str, yesterday_tourney
     result = utils.convert.xmltree_to_dict3(fleet_users_data_raw)
     if yesterday_tourney_data:
         for user_id, user_info in result.items():
-            user_info['YesterdayAllianceScore'] = int(yesterday_tourney_data.users.get(user_id, {}).get('AllianceScore', 0))
+            user_info['YesterdayAllianceScore'] = int(yesterday_tourney_data.users_view.get(user_id, {}).get('AllianceScore', 0))
     return result
 
 
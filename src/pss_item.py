@@ -34,6 +34,7 @@ ANY_SLOT_MARKERS = ['all', 'any']
 ITEM_DESIGN_BASE_PATH: str = 'ItemService/ListItemDesigns2?languageKey=en'
 ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'ItemDesignName'
 ITEM_DESIGN_KEY_NAME: str = 'ItemDesignId'
+ITEM_DESIGN_VERSION_KEY: str = 'ItemDesignVersion'
 
 NOT_ALLOWED_ITEM_NAMES: List[str] = [
     'AI',
@@ -61,7 +62,7 @@ async def get_item_details_by_name(ctx: Context, item_name: str, as_embed: bool
     pss_assert.valid_entity_name(item_name, allowed_values=ALLOWED_ITEM_NAMES)
 
     items_data = await items_designs_retriever.get_data_dict3()
-    item_infos = __get_item_infos_by_name(item_name, items_data)
+    item_infos = await __get_item_infos_by_name(item_name, items_data)
 
     if not item_infos:
         raise NotFound(f'Could not find an item named `{item_name}`.')
@@ -232,7 +233,7 @@ async def get_item_price(ctx: Context, item_name: str, as_embed: bool = settings
     pss_assert.valid_entity_name(item_name, allowed_values=ALLOWED_ITEM_NAMES)
 
     items_data = await items_designs_retriever.get_data_dict3()
-    item_infos = __get_item_infos_by_name(item_name, items_data)
+    item_infos = await __get_item_infos_by_name(item_name, items_data)
 
     if not item_infos:
         raise NotFound(f'Could not find an item named `{item_name}`.')
@@ -261,7 +262,7 @@ async def get_ingredients_for_item(ctx: Context, item_name: str, as_embed: bool
     pss_assert.valid_entity_name(item_name, allowed_values=ALLOWED_ITEM_NAMES)
 
     items_data = await items_designs_retriever.get_data_dict3()
-    item_infos = __get_item_infos_by_name(item_name, items_data, return_best_match=True)
+    item_infos = await __get_item_infos_by_name(item_name, items_data, return_best_match=True)
 
     if not item_infos:
         raise NotFound(f'Could not find an item named `{item_name}`.')
@@ -331,7 +332,7 @@ async def get_item_upgrades_from_name(ctx: Context, item_name: str, as_embed: bo
     pss_assert.valid_entity_name(item_name, allowed_values=ALLOWED_ITEM_NAMES)
 
     items_data = await items_designs_retriever.get_data_dict3()
-    items_ids = __get_item_design_ids_from_name(item_name, items_data)
+    items_ids = await __get_item_design_ids_from_name(item_name, items_data)
     items_infos = __filter_destroyed_modules_from_item_infos([items_data[item_id] for item_id in items_ids])
 
     if not items_ids or not items_infos:
@@ -340,8 +341,9 @@ async def get_item_upgrades_from_name(ctx: Context, item_name: str, as_embed: bo
         upgrades_infos = []
         found_upgrades_for_data = {}
         no_upgrades_for_data = {}
+        upgrades_item_ids = await __get_upgrades_item_ids_by_ingredient_id()
         for item_id in items_ids:
-            upgrades_for = __get_upgrades_for(item_id, items_data)
+            upgrades_for = __get_upgrades_for(item_id, items_data, upgrades_item_ids)
             upgrades_infos.extend(upgrades_for)
             if all(upgrades_for):
                 found_upgrades_for_data[item_id] = items_data[item_id]
@@ -379,18 +381,31 @@ def __get_title_upgrades(upgrades_infos_count: int, items_data: EntitiesData) ->
     return result
 
 
-def __get_upgrades_for(item_id: str, items_data: EntitiesData) -> List[Optional[EntityInfo]]:
-    # iterate through item_design_data and return every item_design containing the item id in question in property 'Ingredients'
-    result = []
-    for item_info in items_data.values():
-        ingredient_item_ids = list(get_ingredients_dict(item_info['Ingredients']).keys())
-        if item_id in ingredient_item_ids:
-            result.append(item_info)
+def __get_upgrades_for(item_id: str, items_data: EntitiesData, upgrades_item_ids: Dict[str, List[str]]) -> List[Optional[EntityInfo]]:
+    # look up every item_design containing the item id in question in property 'Ingredients'
+    result = [items_data[upgrade_item_id] for upgrade_item_id in upgrades_item_ids.get(item_id, []) if upgrade_item_id in items_data]
     if not result:
         result = [None]
     return result
 
 
+async def __get_upgrades_item_ids_by_ingredient_id() -> Dict[str, List[str]]:
+    """
+    Returns the ids of all items requiring a specific item id as an ingredient. The index gets rebuilt after the items designs have changed.
+    """
+    global __upgrades_item_ids_by_ingredient_id
+    global __upgrades_item_ids_data_version
+    if __upgrades_item_ids_by_ingredient_id is None or __upgrades_item_ids_data_version != items_designs_retriever.data_version:
+        items_data = await items_designs_retriever.get_data_dict3()
+        upgrades_item_ids = {}
+        for item_id, item_info in items_data.items():
+            for ingredient_item_id in get_ingredients_dict(item_info.get('Ingredients')):
+                upgrades_item_ids.setdefault(ingredient_item_id, []).append(item_id)
+        __upgrades_item_ids_by_ingredient_id = upgrades_item_ids
+        __upgrades_item_ids_data_version = items_designs_retriever.data_version
+    return __upgrades_item_ids_by_ingredient_id
+
+
 
 
 
@@ -649,7 +664,7 @@ async def get_item_search_details(item_details: entity.EntityDetails) -> List[st
 async def get_items_details_by_name(item_name: str, sorted: bool = True) -> List[entity.EntityDetails]:
     items_data = await items_designs_retriever.get_data_dict3()
     trainings_data = await training.trainings_designs_retriever.get_data_dict3()
-    item_infos = __get_item_infos_by_name(item_name, items_data)
+    item_infos = await __get_item_infos_by_name(item_name, items_data)
     if sorted:
         item_infos = entity.sort_entities_by(item_infos, [(ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME, None, False)])
     result = __create_base_details_list_from_infos(item_infos, items_data, trainings_data)
@@ -725,7 +740,11 @@ def __get_allowed_item_names(items_data: EntitiesData, not_allowed_item_names: L
 def get_ingredients_dict(ingredients: str) -> Dict[str, str]:
     result = {}
     if entity.entity_property_has_value(ingredients):
-        result = dict([ingredient.split('x') for ingredient in ingredients.split('|')])
+        ingredients_dict = __ingredients_dicts_cache.get(ingredients)
+        if ingredients_dict is None:
+            ingredients_dict = dict([ingredient.split('x') for ingredient in ingredients.split('|')])
+            __ingredients_dicts_cache[ingredients] = ingredients_dict
+        result = dict(ingredients_dict)
     return result
 
 
@@ -741,13 +760,13 @@ def __get_parents(item_info: EntityInfo, items_data: EntitiesData) -> List[Entit
     return result
 
 
-def __get_item_design_ids_from_name(item_name: str, items_data: EntitiesData) -> List[str]:
-    results = core.get_ids_from_property_value(items_data, ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME, item_name, fix_data_delegate=__fix_item_name)
+async def __get_item_design_ids_from_name(item_name: str, items_data: EntitiesData) -> List[str]:
+    results = await items_designs_retriever.get_entities_ids_by_name(item_name, entities_data=items_data)
     return results
 
 
-def __get_item_infos_by_name(item_name: str, items_data: EntitiesData, return_best_match: bool = False) -> List[EntityInfo]:
-    item_design_ids = __get_item_design_ids_from_name(item_name, items_data)
+async def __get_item_infos_by_name(item_name: str, items_data: EntitiesData, return_best_match: bool = False) -> List[EntityInfo]:
+    item_design_ids = await __get_item_design_ids_from_name(item_name, items_data)
     result = [items_data[item_design_id] for item_design_id in item_design_ids if item_design_id in items_data.keys()]
 
     if result:
@@ -786,7 +805,10 @@ def __get_stat_filter(stat: str) -> str:
 # ---------- Create entity.EntityDetails ----------
 
 def __create_base_details_from_info(item_info: EntityInfo, items_data: EntitiesData, trainings_data: EntitiesData) -> entity.EntityDetails:
-    return entity.EntityDetails(item_info, __properties['title'], __properties['description'], __properties['base'], __properties['embed_settings'], items_data, trainings_data)
+    render_cache_key = None
+    if trainings_data:
+        render_cache_key = ('ItemBase', item_info.get(ITEM_DESIGN_KEY_NAME), items_designs_retriever.data_version, training.trainings_designs_retriever.data_version)
+    return entity.EntityDetails(item_info, __properties['title'], __properties['description'], __properties['base'], __properties['embed_settings'], items_data, trainings_data, render_cache_key=render_cache_key)
 
 
 def __create_base_details_collection_from_infos(items_infos: List[EntityInfo], items_data: EntitiesData, trainings_data: EntitiesData) -> entity.EntityDetailsCollection:
@@ -853,9 +875,16 @@ items_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     ITEM_DESIGN_KEY_NAME,
     ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME,
     'ItemsDesigns',
-    fix_data_delegate=__fix_item_name
+    fix_data_delegate=__fix_item_name,
+    cache_version_key=ITEM_DESIGN_VERSION_KEY
 )
 
+# The parsed ingredients by 'Ingredients' property value and the ids of the items requiring a specific ingredient
+__ingredients_dicts_cache: Dict[str, Dict[str, str]] = {}
+__upgrades_item_ids_by_ingredient_id: Dict[str, List[str]] = None
+__upgrades_item_ids_data_version: int = None
+items_designs_retriever.add_data_changed_callback(__ingredients_dicts_cache.clear)
+
 __properties: entity.EntityDetailsCreationPropertiesCollection = {
     'title': entity.EntityDetailPropertyCollection(
         entity.EntityDetailProperty('Title', False, omit_if_none=False, entity_property_name=ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME)
@@ -1,10 +1,12 @@
+import asyncio
 import hashlib
 import json
 import random
+import time
 import uuid
 from asyncio import Lock
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 import aiohttp
 import pssapi
@@ -16,6 +18,7 @@ from . import settings, utils
 
 # ---------- Constants & Internals ----------
 
+ACCESS_TOKEN_REFRESH_MARGIN: timedelta = timedelta(seconds=settings.DEVICE_TOKEN_REFRESH_MARGIN)
 ACCESS_TOKEN_TIMEOUT: timedelta = timedelta(minutes=3)
 
 DEVICES: "DeviceCollection" = None
@@ -61,12 +64,32 @@ class Device:
         self.__token_lock: Lock = Lock()
         self.__update_lock: Lock = Lock()
         self.__can_login_until_changed: bool = False
+        self.__login_count: int = 0
+        self.__login_duration_total: float = 0.0
+        self.__login_failure_count: int = 0
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """
+        The current access token, if it hasn't expired. Doesn't attempt to log in.
+        """
+        if self.access_token_expired:
+            return None
+        return self.__access_token
+
+    @property
+    def access_token_age(self) -> Optional[timedelta]:
+        if self.__access_token and self.__last_login:
+            return utils.get_utc_now() - self.__last_login
+        return None
 
     @property
     def access_token_expired(self) -> bool:
-        if self.__access_token and self.__access_token_expires_at:
-            return self.__access_token_expires_at < utils.get_utc_now()
-        return True
+        return self.access_token_expires_within(timedelta())
+
+    @property
+    def access_token_expires_at(self) -> Optional[datetime]:
+        return self.__access_token_expires_at
 
     @property
     def can_login(self) -> bool:
@@ -89,6 +112,26 @@ class Device:
     def key(self) -> str:
         return self.__key
 
+    @property
+    def login_count(self) -> int:
+        return self.__login_count
+
+    @property
+    def login_duration_total(self) -> float:
+        """
+        Total time spent logging in, in seconds.
+        """
+        return self.__login_duration_total
+
+    @property
+    def login_failure_count(self) -> int:
+        return self.__login_failure_count
+
+    def access_token_expires_within(self, margin: timedelta) -> bool:
+        if self.__access_token and self.__access_token_expires_at:
+            return self.__access_token_expires_at - margin < utils.get_utc_now()
+        return True
+
     async def get_access_token(self) -> str:
         """
         Returns a valid access token. If there's no valid access token related to this Device, this method will attempt to log in and retrieve an access token via the PSS API.
@@ -101,6 +144,18 @@ class Device:
                     raise LoginError("Cannot login currently. Please try again later.")
             return self.__access_token
 
+    async def refresh_access_token(self, margin: timedelta = ACCESS_TOKEN_REFRESH_MARGIN) -> str:
+        """
+        Logs in, if the access token expires within the specified margin. The current access token stays valid until the new one has been retrieved.
+        """
+        async with self.__token_lock:
+            if self.access_token_expires_within(margin):
+                if self.can_login:
+                    await self.__login()
+                else:
+                    raise LoginError("Cannot login currently. Please try again later.")
+            return self.__access_token
+
     async def update_device(self) -> bool:
         async with self.__update_lock:
             if self.__can_login_until_changed:
@@ -109,7 +164,7 @@ class Device:
                 return result
             return True
 
-    async def __login(self) -> None:
+    async def __device_login(self) -> bool:
         user_login = await PSSAPI_CLIENT.device_login(self.key, settings.DEVICE_LOGIN_CHECKSUM_KEY)
 
         if not user_login or not user_login.user:
@@ -117,17 +172,31 @@ class Device:
             if error_message:
                 raise LoginError(error_message)
             self.__access_token = None
-            return
+            return False
 
         if user_login.user.name:
             self.__user = None
             self.__access_token = None
             raise DeviceInUseError("Cannot login. The device is already in use.")
 
+        utc_now = utils.get_utc_now()
         self.__user = dict(user_login.user)
         self.__access_token = user_login.access_token
-        self.__set_can_login_until(utils.get_utc_now())
+        self.__last_login = utc_now
+        self.__set_can_login_until(utc_now)
         self.__set_access_token_expiry()
+        return bool(self.__access_token)
+
+    async def __login(self) -> None:
+        started_at = time.perf_counter()
+        succeeded = False
+        try:
+            succeeded = await self.__device_login()
+        finally:
+            self.__login_count += 1
+            self.__login_duration_total += time.perf_counter() - started_at
+            if not succeeded:
+                self.__login_failure_count += 1
 
     def __set_access_token_expiry(self) -> None:
         if self.__last_login and self.__access_token:
@@ -144,11 +213,22 @@ class Device:
 
 
 class DeviceCollection:
+    """
+    Hands out access tokens of up to DEVICE_TOKEN_POOL_SIZE devices in turn. Callers only wait for a login, if no device has a valid access token.
+
+    Access tokens get refreshed in the background, when they're about to expire. If the pool isn't full, the next devices get logged in in the background, too.
+    Each login of a device may start its daily login window (can_login_until), so only increase DEVICE_TOKEN_POOL_SIZE (default 1), if a single device can't keep up with the request rate.
+    """
+
     def __init__(self, devices: List[Device] = None) -> None:
         self.__devices: List[Device] = devices or []
         self.__position: int = None
         self.__fix_position()
         self.__token_lock: Lock = Lock()
+        self.__pool_position: int = 0
+        self.__refresh_tasks: Dict[str, asyncio.Task] = {}
+        self.__refresh_failed_at: Dict[str, datetime] = {}
+        self.__background_refresh_count: int = 0
         if not self.__devices:
             self.__devices.append(Device(_create_device_key()))
 
@@ -167,6 +247,24 @@ class DeviceCollection:
     def devices(self) -> List[Device]:
         return list(self.__devices)
 
+    @property
+    def token_statistics(self) -> Dict[str, Union[int, float]]:
+        """
+        Token ages are in seconds, login durations in milliseconds.
+        """
+        tokens_ages = [device.access_token_age.total_seconds() for device in self.__devices if device.access_token]
+        login_count = sum(device.login_count for device in self.__devices)
+        login_duration_total = sum(device.login_duration_total for device in self.__devices)
+        return {
+            "devices": self.count,
+            "valid_tokens": len(tokens_ages),
+            "max_token_age": max(tokens_ages, default=0.0),
+            "logins": login_count,
+            "login_failures": sum(device.login_failure_count for device in self.__devices),
+            "average_login_duration": (login_duration_total / login_count * 1000) if login_count else 0.0,
+            "background_refreshes": self.__background_refresh_count,
+        }
+
     async def add_device(self, device: Device) -> None:
         for existing_device in self.__devices:
             if existing_device.key == device.key:
@@ -220,6 +318,17 @@ class DeviceCollection:
     async def get_access_token(self) -> str:
         if settings.ACCESS_TOKEN and settings.USE_ACCESS_TOKEN:
             return settings.ACCESS_TOKEN
+        result = self.__get_pooled_access_token()
+        if result is None:
+            result = await self.__get_access_token_serially()
+            self.__refresh_pool()
+        return result
+
+    def __fix_position(self) -> None:
+        if self.__position is None or self.__position >= self.count:
+            self.__position = 0
+
+    async def __get_access_token_serially(self) -> str:
         async with self.__token_lock:
             if self.count == 0:
                 raise Exception("Cannot get access token. There're no devices!")
@@ -245,9 +354,60 @@ class DeviceCollection:
                 await _db_try_update_device(current_device)
             return result
 
-    def __fix_position(self) -> None:
-        if self.__position is None or self.__position >= self.count:
-            self.__position = 0
+    def __get_pooled_access_token(self) -> Optional[str]:
+        valid_devices = [device for device in self.__devices if device.access_token]
+        self.__refresh_pool()
+        if not valid_devices:
+            return None
+        self.__pool_position = (self.__pool_position + 1) % len(valid_devices)
+        return valid_devices[self.__pool_position].access_token
+
+    def __get_refresh_failed_recently(self, device: Device) -> bool:
+        failed_at = self.__refresh_failed_at.get(device.key)
+        return failed_at is not None and utils.get_utc_now() - failed_at < ACCESS_TOKEN_TIMEOUT
+
+    def __on_refresh_done(self, device_key: str, refresh_task: asyncio.Task) -> None:
+        if self.__refresh_tasks.get(device_key) is refresh_task:
+            self.__refresh_tasks.pop(device_key)
+
+    async def __refresh_device(self, device: Device) -> None:
+        can_login_until = device.can_login_until
+        login_count = device.login_count
+        try:
+            await device.refresh_access_token()
+            if device.login_count != login_count:
+                self.__background_refresh_count += 1
+        except DeviceInUseError:
+            if device in self.__devices:
+                await self.remove_device(device)
+            return
+        except Exception as err:
+            self.__refresh_failed_at[device.key] = utils.get_utc_now()
+            print(f"[DeviceCollection.__refresh_device] Could not log in:\n{err}")
+            return
+        self.__refresh_failed_at.pop(device.key, None)
+        if can_login_until != device.can_login_until:
+            await _db_try_update_device(device)
+
+    def __refresh_pool(self) -> None:
+        """
+        Starts background logins for devices whose access tokens are about to expire and for further devices, if the pool isn't full.
+        """
+        pool_devices = [device for device in self.__devices if device.access_token or device.key in self.__refresh_tasks]
+        for device in pool_devices:
+            if device.access_token_expires_within(ACCESS_TOKEN_REFRESH_MARGIN) and not self.__get_refresh_failed_recently(device):
+                self.__start_refresh(device)
+
+        missing_count = settings.DEVICE_TOKEN_POOL_SIZE - len(pool_devices)
+        if missing_count > 0 and self.count:
+            start = self.__position or 0
+            for i in range(self.count):
+                device = self.__devices[(start + i) % self.count]
+                if missing_count <= 0:
+                    break
+                if device not in pool_devices and device.can_login and not self.__get_refresh_failed_recently(device):
+                    self.__start_refresh(device)
+                    missing_count -= 1
 
     def __select_next(self) -> None:
         count = self.count
@@ -259,6 +419,13 @@ class DeviceCollection:
             else:
                 self.__position = (self.__position + 1) % count
 
+    def __start_refresh(self, device: Device) -> None:
+        refresh_task = self.__refresh_tasks.get(device.key)
+        if refresh_task is None or refresh_task.done():
+            refresh_task = asyncio.create_task(self.__refresh_device(device))
+            refresh_task.add_done_callback(lambda task: self.__on_refresh_done(device.key, task))
+            self.__refresh_tasks[device.key] = refresh_task
+
 
 # ---------- Helper functions ----------
 
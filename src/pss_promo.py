@@ -22,6 +22,7 @@ from . import utils
 PROMOTION_DESIGN_BASE_PATH: str = 'PromotionService/ListAllPromotionDesigns2?languageKey=en'
 PROMOTION_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'Name'
 PROMOTION_DESIGN_KEY_NAME: str = 'PromotionDesignId'
+PROMOTION_DESIGN_VERSION_KEY: str = 'PromotionDesignVersion'
 
 REWARD_TYPE_GET_ENTITY_FUNCTIONS: Dict[str, Callable] = {
     'item': item.get_item_details_by_id,
@@ -344,5 +345,6 @@ promotion_designs_retriever = entity.EntityRetriever(
     PROMOTION_DESIGN_BASE_PATH,
     PROMOTION_DESIGN_KEY_NAME,
     PROMOTION_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    cache_name='PromotionDesigns'
+    cache_name='PromotionDesigns',
+    cache_version_key=PROMOTION_DESIGN_VERSION_KEY
 )
\ No newline at end of file
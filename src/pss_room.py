@@ -7,7 +7,6 @@ from discord.ext.commands import Context
 from PIL import Image, ImageDraw
 
 from . import pss_assert
-from . import pss_core as core
 from . import pss_entity as entity
 from . import pss_item as item
 from . import pss_lookups as lookups
@@ -34,19 +33,23 @@ CAPACITY_PER_TICK_UNITS: Dict[str, str] = {
 MISSILE_DESIGN_BASE_PATH: str = "RoomService/ListMissileDesigns"
 MISSILE_DESIGN_KEY_NAME: str = "MissileDesignId"
 MISSILE_DESIGN_DESCRIPTION_PROPERTY_NAME: str = "MissileDesignName"
+MISSILE_DESIGN_VERSION_KEY: str = "MissileDesignVersion"
 
 ROOM_DESIGN_BASE_PATH: str = "RoomService/ListRoomDesigns2?languageKey=en"
 ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME: str = "RoomName"
 ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME_2: str = "RoomShortName"
 ROOM_DESIGN_KEY_NAME: str = "RoomDesignId"
 ROOM_DESIGN_TYPE_PROPERTY_NAME: str = "RoomType"
+ROOM_DESIGN_VERSION_KEY: str = "RoomDesignVersion"
 
 ROOM_DESIGN_PURCHASE_BASE_PATH: str = "RoomService/ListRoomDesignPurchase?languageKey=en"
 ROOM_DESIGN_PURCHASE_DESCRIPTION_PROPERTY_NAME: str = "RoomName"
 ROOM_DESIGN_PURCHASE_KEY_NAME: str = "RoomDesignPurchaseId"
+ROOM_DESIGN_PURCHASE_VERSION_KEY: str = "RoomDesignPurchaseVersion"
 
 ROOM_DESIGN_SPRITES_BASE_PATH: str = "RoomDesignSpriteService/ListRoomDesignSprites"
 ROOM_DESIGN_SPRITES_KEY_NAME: str = "RoomDesignSpriteId"
+ROOM_DESIGN_SPRITES_VERSION_KEY: str = "RoomDesignSpriteVersion"
 
 RX_FIX_ROOM_NAME: re.Pattern = re.compile(r" [lL][vV][lL]?")
 RX_NUMBER: re.Pattern = re.compile(r"\d+")
@@ -123,7 +126,7 @@ async def get_room_details_by_name(room_name: str, ctx: Context = None, as_embed
     pss_assert.valid_entity_name(room_name, allowed_values=ALLOWED_ROOM_NAMES)
 
     rooms_data = await rooms_designs_retriever.get_data_dict3()
-    rooms_designs_infos = get_room_infos_by_name(room_name, rooms_data)
+    rooms_designs_infos = await get_room_infos_by_name(room_name, rooms_data)
 
     if not rooms_designs_infos:
         raise NotFound(f"Could not find a room named **{room_name}**.")
@@ -161,7 +164,7 @@ async def get_room_details_by_name(room_name: str, ctx: Context = None, as_embed
         return result
 
 
-def get_room_infos_by_name(room_name: str, rooms_data: EntitiesData) -> List[EntityInfo]:
+async def get_room_infos_by_name(room_name: str, rooms_data: EntitiesData) -> List[EntityInfo]:
     room_name_reverse = room_name[::-1]
     numbers_in_room_name = RX_NUMBER.findall(room_name_reverse)
     if numbers_in_room_name:
@@ -171,10 +174,10 @@ def get_room_infos_by_name(room_name: str, rooms_data: EntitiesData) -> List[Ent
     else:
         room_level = None
 
-    room_design_ids = _get_room_design_ids_from_room_shortname(room_name, rooms_data, room_level)
+    room_design_ids = await _get_room_design_ids_from_room_shortname(room_name, rooms_data, room_level)
 
     if not room_design_ids:
-        room_design_ids = _get_room_design_ids_from_name(room_name, rooms_data)
+        room_design_ids = await _get_room_design_ids_from_name(room_name, rooms_data)
 
     result = [rooms_data[room_design_id] for room_design_id in room_design_ids if room_design_id in rooms_data.keys()]
     if result and room_level and room_level > 0:
@@ -183,17 +186,17 @@ def get_room_infos_by_name(room_name: str, rooms_data: EntitiesData) -> List[Ent
     return result
 
 
-def _get_room_design_ids_from_name(room_name: str, rooms_data: EntitiesData) -> List[str]:
-    results = core.get_ids_from_property_value(rooms_data, ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME, room_name)
+async def _get_room_design_ids_from_name(room_name: str, rooms_data: EntitiesData) -> List[str]:
+    results = await rooms_designs_retriever.get_entities_ids_by_name(room_name, entities_data=rooms_data)
     return results
 
 
-def _get_room_design_ids_from_room_shortname(room_short_name: str, rooms_data: EntitiesData, room_level: int = None) -> List[str]:
+async def _get_room_design_ids_from_room_shortname(room_short_name: str, rooms_data: EntitiesData, room_level: int = None) -> List[str]:
     match_exact = False
     if room_level and room_level > 0:
         room_short_name = f"{room_short_name}{room_level}"
         match_exact = True
-    results = core.get_ids_from_property_value(rooms_data, ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME_2, room_short_name, match_exact=match_exact)
+    results = await rooms_designs_retriever.get_entities_ids_by_property_value(ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME_2, room_short_name, entities_data=rooms_data, match_exact=match_exact)
     return results
 
 
@@ -968,15 +971,15 @@ async def make_room_frame_sprite(room_frame_sprite_id: str, room_width: int, roo
 # ---------- Initilization ----------
 
 missiles_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
-    MISSILE_DESIGN_BASE_PATH, MISSILE_DESIGN_KEY_NAME, MISSILE_DESIGN_DESCRIPTION_PROPERTY_NAME, cache_name="MissileDesignSprites"
+    MISSILE_DESIGN_BASE_PATH, MISSILE_DESIGN_KEY_NAME, MISSILE_DESIGN_DESCRIPTION_PROPERTY_NAME, cache_name="MissileDesignSprites", cache_version_key=MISSILE_DESIGN_VERSION_KEY
 )
 rooms_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
-    ROOM_DESIGN_BASE_PATH, ROOM_DESIGN_KEY_NAME, ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME, cache_name="RoomDesigns", sorted_key_function=_get_key_for_room_sort
+    ROOM_DESIGN_BASE_PATH, ROOM_DESIGN_KEY_NAME, ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME, cache_name="RoomDesigns", sorted_key_function=_get_key_for_room_sort, cache_version_key=ROOM_DESIGN_VERSION_KEY
 )
 rooms_designs_purchases_retriever: entity.EntityRetriever = entity.EntityRetriever(
-    ROOM_DESIGN_PURCHASE_BASE_PATH, ROOM_DESIGN_PURCHASE_KEY_NAME, ROOM_DESIGN_PURCHASE_DESCRIPTION_PROPERTY_NAME, cache_name="RoomDesignPurchases"
+    ROOM_DESIGN_PURCHASE_BASE_PATH, ROOM_DESIGN_PURCHASE_KEY_NAME, ROOM_DESIGN_PURCHASE_DESCRIPTION_PROPERTY_NAME, cache_name="RoomDesignPurchases", cache_version_key=ROOM_DESIGN_PURCHASE_VERSION_KEY
 )
-rooms_designs_sprites_retriever: entity.EntityRetriever = entity.EntityRetriever(ROOM_DESIGN_SPRITES_BASE_PATH, ROOM_DESIGN_SPRITES_KEY_NAME, None, cache_name="RoomDesignSprites")
+rooms_designs_sprites_retriever: entity.EntityRetriever = entity.EntityRetriever(ROOM_DESIGN_SPRITES_BASE_PATH, ROOM_DESIGN_SPRITES_KEY_NAME, None, cache_name="RoomDesignSprites", cache_version_key=ROOM_DESIGN_SPRITES_VERSION_KEY)
 ALLOWED_ROOM_NAMES: List[str]
 __display_name_properties: Dict[str, entity.EntityDetailProperty] = __create_display_name_properties(__DISPLAY_NAMES)
 __properties: entity.EntityDetailsCreationPropertiesCollection = {
@@ -24,6 +24,7 @@ from . import utils
 SITUATION_DESIGN_BASE_PATH: str = f'SituationService/ListSituationDesigns'
 SITUATION_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'SituationName'
 SITUATION_DESIGN_KEY_NAME: str = 'SituationDesignId'
+SITUATION_DESIGN_VERSION_KEY: str = 'SituationDesignVersion'
 
 SITUATION_CHANGE_TYPE_LOOKUP: Dict[str, str] = {
     'AddCrew': 'Additional crew on board',
@@ -103,6 +104,12 @@ async def get_current_events_details(situations_data: EntitiesData, chars_data:
     return result
 
 
+def get_current_situations_ids(situations_data: EntitiesData, utc_now: datetime) -> List[str]:
+    current_situations_infos = __get_current_situations_infos(situations_data.values(), utc_now)
+    result = [situation_info[SITUATION_DESIGN_KEY_NAME] for situation_info in current_situations_infos]
+    return result
+
+
 async def __get_event_reward(change_type: str, change_argument: str, chars_data: EntitiesData, collections_data: EntitiesData, items_data: EntitiesData, for_embed: Optional[bool] = False) -> Optional[str]:
     if for_embed is None:
         for_embed = False
@@ -232,9 +239,7 @@ def __get_current_situations_infos(situations_infos: List[EntityInfo], utc_now:
             start_at = utils.parse.pss_datetime(from_date)
             end_at = utils.parse.pss_datetime(end_date)
             if start_at <= utc_now and end_at > utc_now:
-                situation_info['from_date'] = from_date
-                situation_info['end_date'] = end_date
-                result.append(situation_info)
+                result.append(dict(situation_info, from_date=from_date, end_date=end_date))
     result = sorted(result, key=lambda x: (x['end_date'], x['from_date'], int(x[SITUATION_DESIGN_KEY_NAME])), reverse=True)
     return result
 
@@ -248,7 +253,8 @@ situations_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     SITUATION_DESIGN_BASE_PATH,
     SITUATION_DESIGN_KEY_NAME,
     SITUATION_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    'SituationDesigns'
+    'SituationDesigns',
+    cache_version_key=SITUATION_DESIGN_VERSION_KEY
 )
 
 
@@ -1,15 +1,14 @@
 import colorsys
 import os
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Any, Iterable, Mapping, Optional
 
-import aiohttp
 import numpy as np
 from PIL import Image, ImageEnhance, ImageFont
 
 from . import pss_core as core
 from . import pss_entity as entity
-from . import settings
+from . import settings, utils
 from .typehints import EntitiesData, EntityInfo
 
 
@@ -33,6 +32,7 @@ PWD: str
 LIST_SPRITES_BASE_PATH: str = "FileService/ListSprites2"
 LIST_SPRITES_KEY_NAME: str = "SpriteId"
 LIST_SPRITES_DESCRIPTION_PROPERTY_NAME: str = "SpriteKey"
+LIST_SPRITES_VERSION_KEY: str = "SpriteVersion"
 
 FILES_CACHE_PATH: str
 
@@ -67,14 +67,18 @@ class Sprite:
 
 class SpriteListRetriever(entity.EntityRetriever):
     def __init__(self):
-        super().__init__(LIST_SPRITES_BASE_PATH, LIST_SPRITES_KEY_NAME, LIST_SPRITES_DESCRIPTION_PROPERTY_NAME, cache_name="ListSprites")
+        super().__init__(LIST_SPRITES_BASE_PATH, LIST_SPRITES_KEY_NAME, LIST_SPRITES_DESCRIPTION_PROPERTY_NAME, cache_name="ListSprites", cache_version_key=LIST_SPRITES_VERSION_KEY)
         self.__sprite_list: dict[int, Sprite] = {}
+        self.__sprite_list_outdated: bool = True
+        self.add_data_changed_callback(self.__on_data_changed)
 
     @property
     def sprite_list(self) -> dict[int, Sprite]:
         return self.__sprite_list
 
     async def build_sprite_list_cache(self) -> None:
+        self.__sprite_list_outdated = False
+        sprite_list = {}
         for sprite_id, sprite_info in (await self._cache.get_data_dict3()).items():
             image_file_id = str(sprite_info.get("ImageFileId"))
             x = str(sprite_info.get("X"))
@@ -84,7 +88,7 @@ class SpriteListRetriever(entity.EntityRetriever):
             sprite_key = str(sprite_info.get("SpriteKey"))
 
             if sprite_id and image_file_id and x and y and height and width:
-                self.__sprite_list[int(sprite_id)] = Sprite(
+                sprite_list[int(sprite_id)] = Sprite(
                     sprite_id=int(sprite_id),
                     image_file_id=int(image_file_id),
                     x=int(x),
@@ -93,13 +97,18 @@ class SpriteListRetriever(entity.EntityRetriever):
                     width=int(width),
                     sprite_key=sprite_key,
                 )
+        self.__sprite_list = sprite_list
 
-    async def get_data_dict3(self) -> dict[str, dict[str, object]]:
+    async def get_data_dict3(self) -> Mapping[str, Mapping[str, Any]]:
         result = await self._cache.get_data_dict3()
-        await self.build_sprite_list_cache()
+        if self.__sprite_list_outdated:
+            await self.build_sprite_list_cache()
 
         return result
 
+    def __on_data_changed(self) -> None:
+        self.__sprite_list_outdated = True
+
 
 # ---------- Sprites ----------
 
@@ -229,11 +238,9 @@ def shift_hue(arr: Iterable, hue_out: float) -> Iterable:
 async def download_file(sprite: Sprite, file_target_path: str) -> None:
     file_download_url = sprite.file_download_url
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(file_download_url) as response:
-            sprite_file = await response.read()
-            with open(file_target_path, "wb") as f:
-                f.write(sprite_file)
+    sprite_file = await utils.web.get_data(file_download_url)
+    with open(file_target_path, "wb") as f:
+        f.write(sprite_file)
 
 
 # ---------- Initialization ----------
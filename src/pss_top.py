@@ -1,11 +1,12 @@
 import calendar
 from datetime import datetime
-from typing import List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from discord import Colour, Embed, OptionChoice
 from discord.ext.commands import Context
 from discord.utils import escape_markdown
 
+from .cache import PssCache
 from . import emojis
 from .gdrive import TourneyData
 from . import pss_assert
@@ -31,6 +32,7 @@ ALLOWED_DIVISION_LETTERS: List[str] = sorted([letter for letter in lookups.DIVIS
 DIVISION_DESIGN_BASE_PATH: str = 'DivisionService/ListAllDivisionDesigns2'
 DIVISION_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'DivisionName'
 DIVISION_DESIGN_KEY_NAME: str = 'DivisionDesignId'
+DIVISION_DESIGN_VERSION_KEY: str = 'DivisionDesignVersion'
 
 DIVISION_CHOICES = [
     OptionChoice(name='a', value='a'),
@@ -41,7 +43,9 @@ DIVISION_CHOICES = [
 
 STARS_BASE_PATH: str = 'AllianceService/ListAlliancesWithDivision'
 
+TOP_CAPTAINS_BASE_PATH: str = 'LadderService/ListUsersByRanking'
 TOP_FLEETS_BASE_PATH: str = 'AllianceService/ListAlliancesByRanking?skip=0&take='
+TOP_RANKINGS_MAX_CACHED_TAKE: int = 100
 
 
 
@@ -53,12 +57,23 @@ async def get_top_fleets(ctx: Context, take: int = 100, as_embed: bool = setting
     tourney_running = tourney.is_tourney_running()
     divisions_designs_data = await divisions_designs_retriever.get_data_dict3()
     fleets_divisions_max_ranks = [int(fleet_division_design_info['MaxRank']) for fleet_division_design_info in __get_fleet_division_designs(divisions_designs_data).values()]
-    raw_data = await core.get_data_from_path(TOP_FLEETS_BASE_PATH + str(take))
-    data = utils.convert.xmltree_to_dict3(raw_data)
+    is_cached = 0 < take <= TOP_RANKINGS_MAX_CACHED_TAKE
+    if is_cached:
+        data = await top_fleets_cache.get_data_dict3()
+        data = dict(list(data.items())[:take])
+    else:
+        raw_data = await core.get_data_from_path(TOP_FLEETS_BASE_PATH + str(take))
+        data = utils.convert.xmltree_to_dict3(raw_data)
     if data:
         title = f'Top {take} fleets'
-        prepared_data = __prepare_top_fleets(data)
-        body_lines = __create_body_lines_top_fleets(prepared_data, tourney_running, fleets_divisions_max_ranks)
+
+        def create_body_lines() -> List[str]:
+            return __create_body_lines_top_fleets(__prepare_top_fleets(data), tourney_running, fleets_divisions_max_ranks)
+
+        if is_cached:
+            body_lines = __get_rendered_top_body_lines(top_fleets_cache, (take, tourney_running, tuple(fleets_divisions_max_ranks)), create_body_lines)
+        else:
+            body_lines = create_body_lines()
         if tourney_running:
             footer = f'Properties displayed: Ranking. Fleet name (Trophy count {emojis.trophy} Member count {emojis.members} Star count {emojis.star})'
         else:
@@ -129,15 +144,24 @@ def __prepare_top_fleets(fleets_data: EntitiesData) -> List[Tuple[int, str, str,
 
 async def get_top_captains(ctx: Context, take: int = 100, as_embed: bool = settings.USE_EMBEDS, tourney_data: TourneyData = None) -> Union[List[Embed], List[str]]:
     skip = 0
+    is_cached = not tourney_data and 0 < take <= TOP_RANKINGS_MAX_CACHED_TAKE
     if tourney_data:
         users_data = tourney_data.top_100_users
+    elif is_cached:
+        users_data = await top_captains_cache.get_data_dict3()
     else:
         users_data = await __get_top_captains_data(skip, take)
 
     if users_data:
         title = f'Top {take} captains'
-        prepared_data = __prepare_top_captains(users_data, skip, take)
-        body_lines = __create_body_lines_top_captains(prepared_data)
+
+        def create_body_lines() -> List[str]:
+            return __create_body_lines_top_captains(__prepare_top_captains(users_data, skip, take))
+
+        if is_cached:
+            body_lines = __get_rendered_top_body_lines(top_captains_cache, (skip, take), create_body_lines)
+        else:
+            body_lines = create_body_lines()
         footer = f'Properties displayed: Ranking. Player name (Fleet name) - Trophies {emojis.trophy}'
         if tourney_data:
             footer += f'\n{utils.datetime.get_historic_data_note(tourney_data.retrieved_at)}'
@@ -175,7 +199,7 @@ async def __get_top_captains_data(skip: int, take: int) -> EntitiesData:
 async def __get_top_captains_path(skip: int, take: int) -> str:
     skip += 1
     access_token = await login.DEVICES.get_access_token()
-    result = f'LadderService/ListUsersByRanking?accessToken={access_token}&from={skip}&to={take}'
+    result = f'{TOP_CAPTAINS_BASE_PATH}?accessToken={access_token}&from={skip}&to={take}'
     return result
 
 
@@ -202,7 +226,7 @@ def __prepare_top_captains(users_data: EntitiesData, skip: int, take: int) -> Li
 
 # ---------- Stars info ----------
 
-async def get_division_stars(ctx: Context, division: str = None, fleet_data: dict = None, retrieved_date: datetime = None, as_embed: bool = settings.USE_EMBEDS) -> Union[List[Embed], List[str]]:
+async def get_division_stars(ctx: Context, division: str = None, tourney_data: TourneyData = None, as_embed: bool = settings.USE_EMBEDS) -> Union[List[Embed], List[str]]:
     if division:
         pss_assert.valid_parameter_value(division, 'division', min_length=1, allowed_values=ALLOWED_DIVISION_LETTERS)
         if division == '-':
@@ -210,21 +234,24 @@ async def get_division_stars(ctx: Context, division: str = None, fleet_data: dic
     else:
         division = None
 
-    if fleet_data is None or retrieved_date is None:
-        fleet_infos = await get_alliances_with_division()
+    if tourney_data:
+        get_division_fleets = tourney_data.get_division_fleets
+        retrieved_date = tourney_data.retrieved_at
     else:
-        fleet_infos = fleet_data
+        fleet_infos_by_division = await __get_current_fleet_infos_by_division()
+        get_division_fleets = lambda division_design_id: fleet_infos_by_division.get(division_design_id, [])
+        retrieved_date = None
 
     divisions_designs_infos = await divisions_designs_retriever.get_data_dict3()
 
     divisions = {}
     if division:
         division_design_id = lookups.DIVISION_CHAR_TO_DESIGN_ID[division.upper()]
-        divisions[division_design_id] = [fleet_info for fleet_info in fleet_infos.values() if fleet_info[DIVISION_DESIGN_KEY_NAME] == division_design_id]
+        divisions[division_design_id] = get_division_fleets(division_design_id)
     else:
         for division_design_id in lookups.DIVISION_DESIGN_ID_TO_CHAR.keys():
             if division_design_id != '0':
-                divisions[division_design_id] = [fleet_info for fleet_info in fleet_infos.values() if fleet_info[DIVISION_DESIGN_KEY_NAME] == division_design_id]
+                divisions[division_design_id] = get_division_fleets(division_design_id)
 
     if divisions:
         divisions_texts = []
@@ -266,8 +293,10 @@ async def get_division_stars(ctx: Context, division: str = None, fleet_data: dic
 
 
 def __get_division_stars_as_text(fleet_infos: List[EntityInfo]) -> List[str]:
+    """
+    Expects fleet_infos to be sorted by stars (descending).
+    """
     lines = []
-    fleet_infos = entity.sort_entities_by(fleet_infos, [('Score', int, True)])
     fleet_infos_count = len(fleet_infos)
     for i, fleet_info in enumerate(fleet_infos, start=1):
         fleet_name = escape_markdown(fleet_info['AllianceName'])
@@ -291,6 +320,18 @@ def __get_division_stars_as_text(fleet_infos: List[EntityInfo]) -> List[str]:
     return lines
 
 
+def __group_fleet_infos_by_division(fleet_infos: EntitiesData) -> Dict[str, List[EntityInfo]]:
+    """
+    Groups fleets by division design id in a single pass. Each division's fleets are sorted by stars (descending).
+    """
+    result = {}
+    for fleet_info in fleet_infos.values():
+        result.setdefault(fleet_info.get(DIVISION_DESIGN_KEY_NAME), []).append(fleet_info)
+    for division_design_id, division_fleet_infos in result.items():
+        result[division_design_id] = entity.sort_entities_by(division_fleet_infos, [('Score', int, True)])
+    return result
+
+
 def get_division_title(division_design_id: str, divisions_designs_infos: EntitiesData, include_markdown: bool, retrieved_date: datetime) -> str:
     title = divisions_designs_infos[division_design_id][DIVISION_DESIGN_DESCRIPTION_PROPERTY_NAME]
     if retrieved_date:
@@ -331,12 +372,44 @@ def filter_targets(user_infos: List[EntityInfo], division_design_id: str, last_m
     return result
 
 
+def get_targets(tourney_data: TourneyData, division_design_id: str, last_month_user_data: EntitiesData, current_fleet_data: EntitiesData = {}, min_star_value: int = None, max_star_value: int = None, min_trophies_value: int = None, max_trophies_value: int = None, max_highest_trophies: int = None) -> List[EntityInfo]:
+    """
+    Like `filter_targets`, but only copies and checks the members of fleets that are in the requested division.
+    """
+    tourney_fleet_data = tourney_data.fleets_view
+    fleets_ids = []
+    for fleet_id in tourney_data.users_fleet_ids:
+        current_division_design_id = current_fleet_data.get(fleet_id, {}).get(DIVISION_DESIGN_KEY_NAME)
+        tourney_division_design_id = tourney_fleet_data.get(fleet_id, {}).get(DIVISION_DESIGN_KEY_NAME, '0')
+        if (current_division_design_id or tourney_division_design_id) == division_design_id:
+            fleets_ids.append(fleet_id)
+    user_infos = tourney_data.get_users_data_by_fleet_ids(fleets_ids).values()
+    result = filter_targets(user_infos, division_design_id, last_month_user_data, current_fleet_data, min_star_value, max_star_value, min_trophies_value, max_trophies_value, max_highest_trophies)
+    return result
+
+
 async def get_alliances_with_division() -> EntitiesData:
-    data = await core.get_data_from_path(STARS_BASE_PATH)
-    fleet_infos = utils.convert.xmltree_to_dict3(data)
+    """
+    Returns a read-only view of the current fleets in divisions. The data is cached for a minute and concurrent requests share a single API call.
+    """
+    fleet_infos = await alliances_with_division_cache.get_data_dict3(allow_outdated=False)
     return fleet_infos
 
 
+async def __get_current_fleet_infos_by_division() -> Dict[str, List[EntityInfo]]:
+    """
+    Returns the current fleets grouped and sorted by __group_fleet_infos_by_division. The result is shared between callers and must not be modified.
+    """
+    global __current_fleet_infos_by_division
+    global __current_fleet_infos_by_division_data_version
+    fleet_infos = await get_alliances_with_division()
+    data_version = alliances_with_division_cache.data_version
+    if __current_fleet_infos_by_division is None or __current_fleet_infos_by_division_data_version != data_version:
+        __current_fleet_infos_by_division = __group_fleet_infos_by_division(fleet_infos)
+        __current_fleet_infos_by_division_data_version = data_version
+    return __current_fleet_infos_by_division
+
+
 def get_criteria_lines(min_star_value: int, max_star_value: int, min_trophies: int, max_trophies: int, max_highest_trophies: int) -> List[str]:
     result = []
     if min_star_value:
@@ -442,14 +515,44 @@ def __get_fleet_division_designs(divisions_designs_data: EntitiesData) -> Entiti
     return result
 
 
+def __get_rendered_top_body_lines(top_cache: PssCache, key: Tuple, create_body_lines: Callable[[], List[str]]) -> List[str]:
+    """
+    Renders the body lines for the specified key once per data version of the cache. Returns a copy.
+    """
+    data_version, body_lines_by_key = __top_body_lines_caches.get(top_cache.name, (None, None))
+    if data_version != top_cache.data_version:
+        body_lines_by_key = {}
+        __top_body_lines_caches[top_cache.name] = (top_cache.data_version, body_lines_by_key)
+    if key not in body_lines_by_key:
+        body_lines_by_key[key] = create_body_lines()
+    return list(body_lines_by_key[key])
+
+
 
 
 
 # ---------- Initilization ----------
 
+__current_fleet_infos_by_division: Dict[str, List[EntityInfo]] = None
+__current_fleet_infos_by_division_data_version: int = None
+
+__top_body_lines_caches: Dict[str, Tuple[int, Dict[Tuple, List[str]]]] = {}
+
+alliances_with_division_cache: PssCache = PssCache(STARS_BASE_PATH, 'AlliancesWithDivision', update_interval=1, use_snapshot=False)
+top_captains_cache: PssCache = PssCache(
+    TOP_CAPTAINS_BASE_PATH,
+    'TopCaptains',
+    update_interval=settings.TOP_RANKINGS_CACHE_UPDATE_INTERVAL,
+    use_snapshot=False,
+    get_update_path=lambda: __get_top_captains_path(0, TOP_RANKINGS_MAX_CACHED_TAKE)
+)
+top_fleets_cache: PssCache = PssCache(f'{TOP_FLEETS_BASE_PATH}{TOP_RANKINGS_MAX_CACHED_TAKE}', 'TopFleets', update_interval=settings.TOP_RANKINGS_CACHE_UPDATE_INTERVAL, use_snapshot=False)
+
+
 divisions_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     DIVISION_DESIGN_BASE_PATH,
     DIVISION_DESIGN_KEY_NAME,
     DIVISION_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    cache_name='DivisionDesigns'
+    cache_name='DivisionDesigns',
+    cache_version_key=DIVISION_DESIGN_VERSION_KEY
 )
\ No newline at end of file
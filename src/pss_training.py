@@ -23,6 +23,7 @@ BASE_STATS: List[str] = lookups.STATS_LEFT + lookups.STATS_RIGHT
 TRAINING_DESIGN_BASE_PATH: str = 'TrainingService/ListAllTrainingDesigns2?languageKey=en'
 TRAINING_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'TrainingName'
 TRAINING_DESIGN_KEY_NAME: str = 'TrainingDesignId'
+TRAINING_DESIGN_VERSION_KEY: str = 'TrainingDesignVersion'
 
 
 
@@ -247,7 +248,8 @@ trainings_designs_retriever = entity.EntityRetriever(
     TRAINING_DESIGN_KEY_NAME,
     TRAINING_DESIGN_DESCRIPTION_PROPERTY_NAME,
     cache_name='TrainingDesigns',
-    sorted_key_function=__get_key_for_training_sort
+    sorted_key_function=__get_key_for_training_sort,
+    cache_version_key=TRAINING_DESIGN_VERSION_KEY
 )
 
 __properties: entity.EntityDetailsCreationPropertiesCollection = {
@@ -7,12 +7,22 @@ from typing import List, Tuple
 # ---------- Settings ----------
 
 ACCESS_TOKEN: str = os.environ.get("PSS_ACCESS_TOKEN")
+AUTOCOMPLETE_MAX_RESULTS: int = 25
+AUTOMESSAGE_MAX_CONCURRENT_POSTS: int = int(os.environ.get("AUTOMESSAGE_MAX_CONCURRENT_POSTS", "10"))
+AUTOMESSAGE_MAX_POSTS_PER_SECOND: float = float(os.environ.get("AUTOMESSAGE_MAX_POSTS_PER_SECOND", "15"))
+AUTOMESSAGE_RETRY_ATTEMPTS: int = int(os.environ.get("AUTOMESSAGE_RETRY_ATTEMPTS", "2"))
+AUTOMESSAGE_RETRY_DELAY: float = float(os.environ.get("AUTOMESSAGE_RETRY_DELAY", "5"))
 
 
 BASE_API_URL: str = "https://api.pixelstarships.com/"
 BASE_INVITE_URL: str = "https://discordapp.com/oauth2/authorize?scope=applications.commands%20bot&permissions=388160&client_id="
 
 
+CACHE_FULL_UPDATE_INTERVAL: int = int(os.environ.get("CACHE_FULL_UPDATE_INTERVAL", "60"))
+CACHE_SNAPSHOTS_ENABLED: int = int(os.environ.get("CACHE_SNAPSHOTS_ENABLED", "1"))
+CACHE_SNAPSHOTS_SUB_PATH: str = "cache_snapshots"
+
+
 DATABASE_SSL_MODE: str = os.environ.get("DATABASE_SSL_MODE", "require")
 DATABASE_URL: str = f'{os.environ.get("DATABASE_URL")}?sslmode={DATABASE_SSL_MODE}'
 
@@ -23,8 +33,12 @@ DEFAULT_PREFIXES: Tuple[str] = ("//", "\\", "/")
 DEFAULT_USE_EMOJI_PAGINATOR: bool = True
 
 DEVICE_LOGIN_CHECKSUM_KEY: str = os.environ.get("PSS_DEVICE_LOGIN_17_CHECKSUM_KEY")
+DEVICE_TOKEN_POOL_SIZE: int = int(os.environ.get("DEVICE_TOKEN_POOL_SIZE", "1"))
+DEVICE_TOKEN_REFRESH_MARGIN: int = int(os.environ.get("DEVICE_TOKEN_REFRESH_MARGIN", "30"))
 
 
+ENTITY_DETAILS_RENDER_CACHE_SIZE: int = int(os.environ.get("ENTITY_DETAILS_RENDER_CACHE_SIZE", "1024"))
+
 EXCEL_COLUMN_FORMAT_DATETIME: str = "YYYY-MM-DD hh:MM:ss"
 EXCEL_COLUMN_FORMAT_NUMBER: str = "0"
 EXCEL_COLUMN_FORMAT_TEXT: str = "@"
@@ -38,6 +52,7 @@ FLEETS_COMMAND_USERS_RAW: str = os.environ.get("FLEETS_COMMAND_USERS", "[]")
 FLEETS_COMMAND_USERS: List[str] = json.loads(str(FLEETS_COMMAND_USERS_RAW))
 
 
+GDRIVE_ACCESS_TOKEN_REFRESH_MARGIN: int = int(os.environ.get("GDRIVE_ACCESS_TOKEN_REFRESH_MARGIN", "300"))
 GDRIVE_CLIENT_EMAIL: str = str(os.environ.get("GDRIVE_SERVICE_CLIENT_EMAIL"))
 GDRIVE_CLIENT_ID: str = str(os.environ.get("GDRIVE_SERVICE_CLIENT_ID"))
 GDRIVE_FOLDER_ID: str = "10wOZgAQk_0St2Y_jC3UW497LVpBNxWmP"
@@ -71,6 +86,7 @@ PRINT_DEBUG_DB: int = int(os.environ.get("PRINT_DEBUG_DB", "0"))
 PRINT_DEBUG_COMMAND: int = int(os.environ.get("PRINT_DEBUG_COMMAND", "0"))
 PRINT_DEBUG_WEB_REQUESTS: int = int(os.environ.get("PRINT_DEBUG_WEB_REQUESTS", "0"))
 PRODUCTION_SERVER: str = os.environ.get("PSS_PRODUCTION_SERVER")
+PRODUCTION_SERVER_CACHE_DURATION: int = int(os.environ.get("PRODUCTION_SERVER_CACHE_DURATION", "900"))
 
 PSS_ABOUT_FILES: List[str] = ["src/pss_data/about.json", "pss_data/about.json"]
 PSS_LINKS_FILES: List[str] = ["src/pss_data/links.json", "pss_data/links.json"]
@@ -89,8 +105,15 @@ FILES_CACHE_SUB_PATH: str = "files_cache"
 
 
 THROW_COMMAND_ERRORS: int = int(os.environ.get("THROW_COMMAND_ERRORS", "0"))
+TOP_RANKINGS_CACHE_UPDATE_INTERVAL: int = int(os.environ.get("TOP_RANKINGS_CACHE_UPDATE_INTERVAL", "5"))
 
 TOURNAMENT_DATA_START_DATE: datetime = datetime(year=2019, month=10, day=9, tzinfo=timezone.utc)
+TOURNEY_DATA_CACHE_MAX_ENTRIES: int = int(os.environ.get("TOURNEY_DATA_CACHE_MAX_ENTRIES", "12"))
+TOURNEY_DATA_CACHE_MAX_SIZE_MB: int = int(os.environ.get("TOURNEY_DATA_CACHE_MAX_SIZE_MB", "128"))
+TOURNEY_DATA_LOCAL_DIRECTORY: str = os.environ.get("TOURNEY_DATA_LOCAL_DIRECTORY")
+TOURNEY_DATA_MIRROR_COMPRESSED: int = int(os.environ.get("TOURNEY_DATA_MIRROR_COMPRESSED", "1"))
+TOURNEY_DATA_MIRROR_ENABLED: int = int(os.environ.get("TOURNEY_DATA_MIRROR_ENABLED", "1"))
+TOURNEY_DATA_MIRROR_SUB_PATH: str = "tourney_data_mirror"
 
 
 USE_EMBEDS: bool = True
@@ -100,5 +123,13 @@ USE_ACCESS_TOKEN: int = int(os.environ.get("USE_ACCESS_TOKEN", 0))
 VERSION: str = "1.5.0.1"
 
 
+WEB_CONNECTION_LIMIT: int = int(os.environ.get("WEB_CONNECTION_LIMIT", "100"))
+WEB_CONNECTION_LIMIT_PER_HOST: int = int(os.environ.get("WEB_CONNECTION_LIMIT_PER_HOST", "20"))
+WEB_DNS_CACHE_TTL: int = int(os.environ.get("WEB_DNS_CACHE_TTL", "300"))
+WEB_KEEPALIVE_TIMEOUT: float = float(os.environ.get("WEB_KEEPALIVE_TIMEOUT", "30"))
+WEB_REQUEST_CONNECT_TIMEOUT: float = float(os.environ.get("WEB_REQUEST_CONNECT_TIMEOUT", "10"))
+WEB_REQUEST_READ_TIMEOUT: float = float(os.environ.get("WEB_REQUEST_READ_TIMEOUT", "30"))
+WEB_REQUEST_TOTAL_TIMEOUT: float = float(os.environ.get("WEB_REQUEST_TOTAL_TIMEOUT", "60"))
+
 WIKI_COMMAND_GUILDS: List[str] = json.loads(os.environ.get("WIKI_COMMAND_GUILDS", "[]"))
 WIKI_COMMAND_USERS: List[str] = json.loads(os.environ.get("WIKI_COMMAND_USERS", "[]"))
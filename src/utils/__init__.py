@@ -14,4 +14,5 @@ from . import io
 from . import json
 from . import parse
 from .singleton import Singleton
-from . import text
\ No newline at end of file
+from . import text
+from . import web
\ No newline at end of file
@@ -1,6 +1,8 @@
-from typing import Any as _Any, Dict, List, Union
+from functools import lru_cache as _lru_cache
+from typing import Any as _Any, Dict, List, Tuple as _Tuple, Union
 from urllib.parse import quote as _quote
 from xml.etree import ElementTree as _ElementTree
+from xml.parsers import expat as _expat
 
 from . import format as _format
 from . import parse as _parse
@@ -54,8 +56,7 @@ def pss_timestamp_to_excel(pss_timestamp: str) -> str:
 
 
 def raw_xml_to_dict(raw_xml: str, include_root: bool = True, fix_attributes: bool = True, preserve_lists: bool = False) -> _EntityDict:
-    root = _ElementTree.fromstring(raw_xml)
-    result = __convert_xml_to_dict(root, include_root=include_root, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
+    result = __convert_xml_to_dict(raw_xml, include_root=include_root, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
     return result
 
 
@@ -112,71 +113,122 @@ def xmltree_to_dict3(raw_text: str) -> EntitiesData:
 
 # ---------- Helper functions ----------
 
-def __convert_xml_to_dict(root: _ElementTree.Element, include_root: bool = True, fix_attributes: bool = True, preserve_lists: bool = False) -> _EntityDict:
-    if root is None:
-        return None
+def __convert_xml_to_dict(raw_xml: str, include_root: bool = True, fix_attributes: bool = True, preserve_lists: bool = False) -> _EntityDict:
+    """
+    Converts the xml in a single pass. The converted children of each element are collected on a stack until the element gets closed.
+
+    Namespaced names are expanded like ElementTree does ('{uri}name') and namespace declarations don't show up as attributes.
+    """
+    stack: List[_Tuple[str, Dict[str, str], List[_Tuple[str, Dict[str, str], _EntityDict]]]] = []
+    result: List[_EntityDict] = []
+    has_namespaces: List[bool] = [False]
+
+    def start_namespace_decl(*_: str) -> None:
+        has_namespaces[0] = True
+
+    def start_element(tag: str, attrib: Dict[str, str]) -> None:
+        # Names only need to be expanded, if the xml declares namespaces, which the PSS API doesn't
+        if has_namespaces[0]:
+            tag = __expand_name(tag)
+            if attrib:
+                attrib = {__expand_name(name): value for name, value in attrib.items()}
+        stack.append((tag, attrib, []))
+
+    def end_element(_: str) -> None:
+        tag, attrib, children = stack.pop()
+        if stack:
+            element_dict = __create_element_dict(tag, attrib, children, False, fix_attributes, preserve_lists)
+            stack[-1][2].append((tag, attrib, element_dict))
+        else:
+            result.append(__create_element_dict(tag, attrib, children, include_root, fix_attributes, preserve_lists))
+
+    parser = _expat.ParserCreate(namespace_separator='}')
+    parser.buffer_text = True
+    parser.StartNamespaceDeclHandler = start_namespace_decl
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    try:
+        parser.Parse(raw_xml, True)
+    except _expat.ExpatError as err:
+        parse_error = _ElementTree.ParseError(str(err))
+        parse_error.code = err.code
+        parse_error.position = (err.lineno, err.offset)
+        raise parse_error from err
+
+    return result[0] if result else None
 
+
+def __create_element_dict(tag: str, attrib: Dict[str, str], children: List[_Tuple[str, Dict[str, str], _EntityDict]], include_root: bool, fix_attributes: bool, preserve_lists: bool) -> _EntityDict:
     result = {}
-    if root.attrib:
+    if attrib:
         if include_root:
             if fix_attributes:
-                result[root.tag] = __fix_attribute(root.attrib)
+                result[tag] = __fix_attribute(attrib)
             else:
-                result[root.tag] = root.attrib
+                result[tag] = attrib
         else:
             if fix_attributes:
-                result = __fix_attribute(root.attrib)
+                result = __fix_attribute(attrib)
             else:
-                result = root.attrib
+                result = attrib
     elif include_root:
-        result[root.tag] = {}
+        result[tag] = {}
 
-    # Retrieve all distinct names of sub tags
-    tag_count_map = __get_child_tag_count(root)
-    children_dict = {}
+    if not children:
+        return result
 
-    for child in root:
-        tag = child.tag
+    tag_count_map = {}
+    for child_tag, _, _ in children:
+        tag_count_map[child_tag] = tag_count_map.get(child_tag, 0) + 1
+    id_attr_names_map = {child_tag: _pss_data.ID_NAMES_INFO.get(child_tag) for child_tag, tag_count in tag_count_map.items() if tag_count > 1}
+
+    children_dict = {}
+    for child_tag, child_attrib, child_dict in children:
         key = None
-        if tag_count_map[tag] > 1:
-            id_attr_names = _pss_data.ID_NAMES_INFO.get(tag)
-            if id_attr_names:
-                id_attr_values = [child.attrib[id_attr_name] for id_attr_name in id_attr_names]
-                key = '.'.join(sorted(id_attr_values))
+        id_attr_names = id_attr_names_map.get(child_tag)
+        if id_attr_names:
+            key = '.'.join(sorted([child_attrib[id_attr_name] for id_attr_name in id_attr_names]))
         if not key:
-            key = tag
-
-        child_dict = __convert_xml_to_dict(child, include_root=False, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
-        if key not in children_dict.keys():
+            key = child_tag
+        if key not in children_dict:
             children_dict[key] = child_dict
 
-    if children_dict:
-        if preserve_lists:
-            if len(children_dict) > 1:
-                children_list = list(children_dict.values())
-                if include_root:
-                    result[root.tag] = children_list
-                else:
-                    if result:
-                        result['Collection'] = children_list
-                    else:
-                        result = children_list
-            else:
-                result.setdefault(root.tag, {}).update(children_dict)
-        else:
+    if preserve_lists:
+        if len(children_dict) > 1:
+            children_list = list(children_dict.values())
             if include_root:
-                # keys get overwritten here
-                result[root.tag] = children_dict
+                result[tag] = children_list
             else:
-                result.update(children_dict)
+                if result:
+                    result['Collection'] = children_list
+                else:
+                    result = children_list
+        else:
+            result.setdefault(tag, {}).update(children_dict)
+    else:
+        if include_root:
+            # keys get overwritten here
+            result[tag] = children_dict
+        else:
+            result.update(children_dict)
 
     return result
 
 
+def __expand_name(name: str) -> str:
+    if '}' in name:
+        return f'{{{name}'
+    return name
+
+
 def __fix_attribute(attribute: Dict[str, str]) -> Dict[str, str]:
     if not attribute:
         return None
 
+    # Most entities don't have attributes containing xml, so the attribute names get only checked once per distinct set of names.
+    if not __has_xml_attribute_names(tuple(attribute)):
+        return dict(attribute)
+
     result = {}
 
     for key, value in attribute.items():
@@ -190,16 +242,9 @@ def __fix_attribute(attribute: Dict[str, str]) -> Dict[str, str]:
     return result
 
 
-def __get_child_tag_count(root: _ElementTree.Element) -> Dict[str, int]:
-    if root is None:
-        return None
-
-    child_tags = list(set([child_node.tag for child_node in root]))
-    result = {}
-    for child_tag in child_tags:
-        result[child_tag] = sum(1 for child_node in root if child_node.tag == child_tag)
-
-    return result
+@_lru_cache(maxsize=1024)
+def __has_xml_attribute_names(attribute_names: _Tuple[str, ...]) -> bool:
+    return any(attribute_name.endswith('Xml') for attribute_name in attribute_names)
 
 
 def __xmltree_to_dict(raw_text: str, depth: int) -> EntitiesData:
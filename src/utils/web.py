@@ -0,0 +1,75 @@
+import aiohttp as _aiohttp
+
+from .. import settings as _settings
+
+
+# ---------- Constants ----------
+
+__SESSION: _aiohttp.ClientSession = None
+
+
+
+
+
+# ---------- Functions ----------
+
+async def close_session() -> None:
+    """
+    Closes the shared client session, if it's open. The next call to get_session() will create a new one.
+    """
+    global __SESSION
+    session = __SESSION
+    __SESSION = None
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def get_session() -> _aiohttp.ClientSession:
+    """
+    Returns the bot-wide client session. It gets created lazily and has to be retrieved from within a running event loop.
+
+    Use it like a regular ClientSession, but don't close it or use it as a context manager.
+    """
+    global __SESSION
+    if __SESSION is None or __SESSION.closed:
+        __SESSION = __create_session()
+    return __SESSION
+
+
+async def get_data(url: str) -> bytes:
+    session = get_session()
+    async with session.get(url) as response:
+        return await response.read()
+
+
+async def get_status(url: str) -> int:
+    session = get_session()
+    async with session.get(url) as response:
+        return response.status
+
+
+async def get_text(url: str, encoding: str = 'utf-8') -> str:
+    session = get_session()
+    async with session.get(url) as response:
+        return await response.text(encoding=encoding)
+
+
+
+
+
+# ---------- Helper functions ----------
+
+def __create_session() -> _aiohttp.ClientSession:
+    connector = _aiohttp.TCPConnector(
+        limit=_settings.WEB_CONNECTION_LIMIT,
+        limit_per_host=_settings.WEB_CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=_settings.WEB_DNS_CACHE_TTL,
+        keepalive_timeout=_settings.WEB_KEEPALIVE_TIMEOUT,
+    )
+    timeout = _aiohttp.ClientTimeout(
+        total=_settings.WEB_REQUEST_TOTAL_TIMEOUT,
+        sock_connect=_settings.WEB_REQUEST_CONNECT_TIMEOUT,
+        sock_read=_settings.WEB_REQUEST_READ_TIMEOUT,
+    )
+    result = _aiohttp.ClientSession(connector=connector, timeout=timeout)
+    return result
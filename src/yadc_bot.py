@@ -1,10 +1,12 @@
+import os
 from typing import List, Optional, Type
 
 from discord import ApplicationCommand, SlashCommand, SlashCommandGroup
 from discord.ext.commands import Bot
 
-from .gdrive import TourneyDataClient
+from .gdrive import GoogleDriveTourneyDataBackend, LocalDirectoryTourneyDataBackend, TourneyDataBackend, TourneyDataClient
 from . import settings
+from . import utils
 
 
 
@@ -14,24 +16,36 @@ class YadcBot(Bot):
         super().__init__(**kwargs)
         self.__tournament_data_client: TourneyDataClient = None
         if settings.FEATURE_TOURNEYDATA_ENABLED:
-            self.__tournament_data_client = TourneyDataClient(
-                settings.GDRIVE_PROJECT_ID,
-                settings.GDRIVE_PRIVATE_KEY_ID,
-                settings.GDRIVE_PRIVATE_KEY,
-                settings.GDRIVE_CLIENT_EMAIL,
-                settings.GDRIVE_CLIENT_ID,
-                settings.GDRIVE_SCOPES,
-                settings.GDRIVE_FOLDER_ID,
-                settings.GDRIVE_SERVICE_ACCOUNT_FILE,
-                settings.GDRIVE_SETTINGS_FILE,
-                settings.TOURNAMENT_DATA_START_DATE
-            )
+            tourney_data_backend: TourneyDataBackend = None
+            tourney_data_mirror: LocalDirectoryTourneyDataBackend = None
+            if settings.TOURNEY_DATA_LOCAL_DIRECTORY:
+                tourney_data_backend = LocalDirectoryTourneyDataBackend(settings.TOURNEY_DATA_LOCAL_DIRECTORY)
+            else:
+                tourney_data_backend = GoogleDriveTourneyDataBackend(
+                    settings.GDRIVE_PROJECT_ID,
+                    settings.GDRIVE_PRIVATE_KEY_ID,
+                    settings.GDRIVE_PRIVATE_KEY,
+                    settings.GDRIVE_CLIENT_EMAIL,
+                    settings.GDRIVE_CLIENT_ID,
+                    settings.GDRIVE_SCOPES,
+                    settings.GDRIVE_FOLDER_ID,
+                    settings.GDRIVE_SERVICE_ACCOUNT_FILE,
+                    settings.GDRIVE_SETTINGS_FILE,
+                )
+                if settings.TOURNEY_DATA_MIRROR_ENABLED:
+                    tourney_data_mirror = LocalDirectoryTourneyDataBackend(os.path.join(os.getcwd(), settings.TOURNEY_DATA_MIRROR_SUB_PATH), compress=bool(settings.TOURNEY_DATA_MIRROR_COMPRESSED))
+            self.__tournament_data_client = TourneyDataClient(tourney_data_backend, settings.TOURNAMENT_DATA_START_DATE, mirror=tourney_data_mirror)
 
     @property
     def tournament_data_client(self) -> TourneyDataClient:
         return self.__tournament_data_client
 
 
+    async def close(self) -> None:
+        await super().close()
+        await utils.web.close_session()
+
+
     def get_application_command(
         self,
         name: str,
@@ -0,0 +1,66 @@
+import random
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+import pytest
+
+
+# ---------- Synthetic tourney data ----------
+
+
+def create_tourney_data(schema_version: int, retrieved_at: datetime, fleets_count: int = 100, users_count: int = 2000, seed: int = 0) -> Dict[str, Any]:
+    """
+    Creates the contents of a tourney data file in the layout of the specified schema version (3 to 9).
+    """
+    rng = random.Random(seed)
+    fleets = []
+    for i in range(1, fleets_count + 1):
+        division_design_id = 1 if i <= 8 else 2 if i <= 20 else 3 if i <= 50 else 4
+        fleet = [i, f"Fleet {i}", rng.randint(0, 5000), division_design_id]
+        if schema_version >= 4:
+            fleet.append(rng.randint(0, 200000))
+        if schema_version >= 6:
+            fleet.append(rng.randint(0, 100))
+        if schema_version >= 7:
+            fleet.extend([rng.randint(1, 100), rng.randint(1, 100)])
+        fleets.append(fleet)
+
+    users = []
+    data = []
+    for i in range(1, users_count + 1):
+        user_id = 100000 + i
+        fleet_id = rng.randint(0, fleets_count)
+        if schema_version == 3:
+            users.append([str(user_id), f"Player {i}"])
+            data.append([str(user_id), str(fleet_id), str(rng.randint(0, 8000)), str(rng.randint(0, 200)), "Ensign", "2020-01-01T00:00:00", "2023-05-09T12:00:00"])
+        else:
+            user = [user_id, f"Player {i}", fleet_id, rng.randint(0, 8000), rng.randint(0, 200), rng.randint(0, 8)]
+            user.extend([rng.randint(0, 200000000) for _ in range(3)])
+            user.extend([rng.randint(0, 10000) for _ in range(8)])
+            if schema_version >= 6:
+                user.append(rng.randint(0, 100))
+            if schema_version >= 8:
+                user.append(rng.randint(0, 10000))
+            if schema_version >= 9:
+                user.append(rng.randint(0, 100))
+            users.append(user)
+
+    if schema_version == 3:
+        fleets = [[str(value) for value in fleet] for fleet in fleets]
+
+    result = {
+        "meta": {
+            "timestamp": retrieved_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "schema_version": schema_version,
+        },
+        "fleets": fleets,
+        "users": users,
+    }
+    if schema_version == 3:
+        result["data"] = data
+    return result
+
+
+@pytest.fixture
+def tourney_data_factory() -> Callable[..., Dict[str, Any]]:
+    return create_tourney_data
@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+import discord.errors
+import pytest
+
+from src import bot
+from src import server_settings
+
+
+GUILD_ID: int = 1
+CHANNEL_ID: int = 2
+MESSAGE_CREATED_AT: datetime = datetime(2023, 5, 10, tzinfo=timezone.utc)
+
+
+# ---------- Fakes ----------
+
+
+class FakeTextChannel:
+    def __init__(self, send_errors: List[Exception]) -> None:
+        self.id: int = CHANNEL_ID
+        self.name: str = "daily"
+        self.guild = SimpleNamespace(id=GUILD_ID, name="Guild")
+        self.send_errors: List[Exception] = list(send_errors)
+        self.sent_messages: List[str] = []
+
+    async def send(self, content: str = None, embed=None):
+        if self.send_errors:
+            raise self.send_errors.pop(0)
+        self.sent_messages.append(content)
+        return SimpleNamespace(id=3, created_at=MESSAGE_CREATED_AT, edited_at=None)
+
+
+class FakeBot:
+    def __init__(self, text_channel: FakeTextChannel) -> None:
+        self.text_channel: FakeTextChannel = text_channel
+
+    def get_channel(self, channel_id: int) -> FakeTextChannel:
+        return self.text_channel if channel_id == CHANNEL_ID else None
+
+    def get_guild(self, guild_id: int):
+        return self.text_channel.guild if guild_id == GUILD_ID else None
+
+
+def create_http_exception(status: int) -> discord.errors.HTTPException:
+    return discord.errors.HTTPException(SimpleNamespace(status=status, reason="Error"), "error")
+
+
+@pytest.fixture
+def stored_updates(monkeypatch) -> List[Tuple[server_settings.AutoMessageSettings, Dict[str, object]]]:
+    result = []
+
+    async def get_use_embeds(*args, **kwargs) -> bool:
+        return False
+
+    async def update_auto_messages_settings(updates) -> bool:
+        result.extend(updates)
+        return True
+
+    monkeypatch.setattr(server_settings, "get_use_embeds", get_use_embeds)
+    monkeypatch.setattr(server_settings, "update_auto_messages_settings", update_auto_messages_settings)
+    monkeypatch.setattr(bot.settings, "AUTOMESSAGE_RETRY_DELAY", 0)
+    return result
+
+
+async def post_automessages(text_channel: FakeTextChannel, retry_attempts: int) -> Tuple[int, server_settings.AutoMessageSettings]:
+    automessage_settings = server_settings.AutoMessageSettings(FakeBot(text_channel), GUILD_ID, CHANNEL_ID, True, None, server_settings.AutoMessageChangeMode.POST_NEW, None, None, server_settings.AutoMessageType.DAILY)
+    post_automessages = getattr(bot, "__post_automessages")
+    posted_count, _ = await post_automessages("test", [automessage_settings], "message", None, MESSAGE_CREATED_AT, False, retry_attempts=retry_attempts)
+    return posted_count, automessage_settings
+
+
+# ---------- Automessages ----------
+
+
+@pytest.mark.asyncio
+async def test_post_automessages_retries_server_error(stored_updates):
+    text_channel = FakeTextChannel([create_http_exception(503)])
+
+    posted_count, _ = await post_automessages(text_channel, retry_attempts=1)
+
+    assert posted_count == 1
+    assert text_channel.sent_messages == ["message"]
+    assert len(stored_updates) == 1
+    assert "dailycanpost" not in stored_updates[0][1]
+
+
+@pytest.mark.asyncio
+async def test_post_automessages_does_not_store_can_post_after_server_error(stored_updates):
+    text_channel = FakeTextChannel([create_http_exception(503), create_http_exception(503)])
+
+    posted_count, _ = await post_automessages(text_channel, retry_attempts=1)
+
+    assert posted_count == 0
+    assert stored_updates[0][1] == {}
+
+
+@pytest.mark.asyncio
+async def test_post_automessages_does_not_retry_forbidden(stored_updates):
+    text_channel = FakeTextChannel([discord.errors.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "forbidden")])
+
+    posted_count, _ = await post_automessages(text_channel, retry_attempts=1)
+
+    assert posted_count == 0
+    assert text_channel.sent_messages == []
+    assert stored_updates[0][1]["dailycanpost"] is False
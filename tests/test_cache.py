@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+
+from src import cache
+
+
+UPDATE_PATH: str = "ItemService/ListItemDesigns2"
+VERSION_KEY: str = "ItemDesignVersion"
+STARTED_AT: datetime = datetime(2023, 5, 10, tzinfo=timezone.utc)
+
+
+# ---------- Fakes ----------
+
+
+class FakeApi:
+    def __init__(self, monkeypatch) -> None:
+        self.now: datetime = STARTED_AT
+        self.version: str = "1"
+        self.market_price: int = 10
+        self.requested_paths: List[str] = []
+        monkeypatch.setattr(cache.core, "get_data_from_path", self.get_data_from_path)
+        monkeypatch.setattr(cache.utils, "get_utc_now", lambda: self.now)
+        monkeypatch.setattr(cache.settings, "CACHE_FULL_UPDATE_INTERVAL", 60)
+        monkeypatch.setattr(cache, "LATEST_SETTINGS_CACHE", cache.PssCache("SettingService/GetLatestVersion3", "LatestSettings", update_interval=1, use_snapshot=False))
+
+    async def get_data_from_path(self, path: str) -> str:
+        self.requested_paths.append(path)
+        if path.startswith("SettingService"):
+            return f'<SettingService><GetLatestSetting><Setting {VERSION_KEY}="{self.version}" /></GetLatestSetting></SettingService>'
+        return f'<ItemService><ListItemDesigns><ItemDesigns><ItemDesign ItemDesignId="1" MarketPrice="{self.market_price}" /><ItemDesign ItemDesignId="2" MarketPrice="5" /></ItemDesigns></ListItemDesigns></ItemService>'
+
+    @property
+    def download_count(self) -> int:
+        return self.requested_paths.count(UPDATE_PATH)
+
+
+# ---------- Version key ----------
+
+
+@pytest.mark.asyncio
+async def test_update_skips_download_while_version_unchanged(monkeypatch):
+    api = FakeApi(monkeypatch)
+    items_cache = cache.PssCache(UPDATE_PATH, "ItemDesigns", update_interval=15, version_key=VERSION_KEY, use_snapshot=False)
+
+    assert await items_cache.update_data() is True
+    api.now += timedelta(minutes=20)
+    assert await items_cache.update_data() is False
+    assert api.download_count == 1
+
+    api.version = "2"
+    api.now += timedelta(minutes=2)
+    await items_cache.update_data()
+    assert api.download_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_downloads_after_full_update_interval(monkeypatch):
+    api = FakeApi(monkeypatch)
+    items_cache = cache.PssCache(UPDATE_PATH, "ItemDesigns", update_interval=15, version_key=VERSION_KEY, use_snapshot=False)
+
+    await items_cache.update_data()
+    api.market_price = 12
+    api.now += timedelta(minutes=61)
+
+    assert await items_cache.update_data() is True
+    assert api.download_count == 2
+    assert (await items_cache.get_data_dict3())["1"]["MarketPrice"] == "12"
+
+
+# ---------- Parsed data ----------
+
+
+@pytest.mark.asyncio
+async def test_get_data_dict3_returns_shared_read_only_view(monkeypatch):
+    api = FakeApi(monkeypatch)
+    items_cache = cache.PssCache(UPDATE_PATH, "ItemDesigns", update_interval=15, use_snapshot=False)
+
+    items_data = await items_cache.get_data_dict3()
+    assert await items_cache.get_data_dict3() is items_data
+    with pytest.raises(TypeError):
+        items_data["1"]["MarketPrice"] = "0"
+    with pytest.raises(TypeError):
+        items_data["3"] = {}
+
+    api.market_price = 12
+    await items_cache.update_data()
+    assert (await items_cache.get_data_dict3())["1"]["MarketPrice"] == "12"
+    assert items_data["1"]["MarketPrice"] == "10"
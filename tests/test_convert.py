@@ -0,0 +1,203 @@
+import itertools
+from typing import Dict
+from xml.etree import ElementTree
+
+import pytest
+
+from src import pss_data
+from src.utils import convert
+
+
+# ---------- Reference implementation ----------
+# The ElementTree based converter that utils.convert.raw_xml_to_dict replaced. The output of both must be identical.
+
+
+def reference_raw_xml_to_dict(raw_xml: str, include_root: bool = True, fix_attributes: bool = True, preserve_lists: bool = False):
+    root = ElementTree.fromstring(raw_xml)
+    return _reference_convert_xml_to_dict(root, include_root=include_root, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
+
+
+def _reference_convert_xml_to_dict(root: ElementTree.Element, include_root: bool = True, fix_attributes: bool = True, preserve_lists: bool = False):
+    if root is None:
+        return None
+
+    result = {}
+    if root.attrib:
+        if include_root:
+            if fix_attributes:
+                result[root.tag] = _reference_fix_attribute(root.attrib)
+            else:
+                result[root.tag] = root.attrib
+        else:
+            if fix_attributes:
+                result = _reference_fix_attribute(root.attrib)
+            else:
+                result = root.attrib
+    elif include_root:
+        result[root.tag] = {}
+
+    tag_count_map = {}
+    for child in root:
+        tag_count_map[child.tag] = tag_count_map.get(child.tag, 0) + 1
+    children_dict = {}
+
+    for child in root:
+        tag = child.tag
+        key = None
+        if tag_count_map[tag] > 1:
+            id_attr_names = pss_data.ID_NAMES_INFO.get(tag)
+            if id_attr_names:
+                id_attr_values = [child.attrib[id_attr_name] for id_attr_name in id_attr_names]
+                key = ".".join(sorted(id_attr_values))
+        if not key:
+            key = tag
+
+        child_dict = _reference_convert_xml_to_dict(child, include_root=False, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
+        if key not in children_dict.keys():
+            children_dict[key] = child_dict
+
+    if children_dict:
+        if preserve_lists:
+            if len(children_dict) > 1:
+                children_list = list(children_dict.values())
+                if include_root:
+                    result[root.tag] = children_list
+                else:
+                    if result:
+                        result["Collection"] = children_list
+                    else:
+                        result = children_list
+            else:
+                result.setdefault(root.tag, {}).update(children_dict)
+        else:
+            if include_root:
+                result[root.tag] = children_dict
+            else:
+                result.update(children_dict)
+
+    return result
+
+
+def _reference_fix_attribute(attribute: Dict[str, str]) -> Dict[str, str]:
+    if not attribute:
+        return None
+
+    result = {}
+    for key, value in attribute.items():
+        if key.endswith("Xml") and value:
+            result[key[:-3]] = reference_raw_xml_to_dict(value)
+        result[key] = value
+    return result
+
+
+# ---------- Samples ----------
+
+ITEM_DESIGNS = """<ItemService>
+    <ListItemDesigns>
+        <ItemDesigns>
+            <ItemDesign ItemDesignId="1" ItemDesignName="Mineral Ore" ItemType="Mineral" ItemSubType="None" EnhancementType="None" EnhancementValue="0" MarketPrice="12" Rarity="Common" ImageSpriteId="101" FairPrice="10" />
+            <ItemDesign ItemDesignId="2" ItemDesignName="Gas Canister" ItemType="Gas" ItemSubType="None" EnhancementType="None" EnhancementValue="0" MarketPrice="15" Rarity="Common" ImageSpriteId="102" FairPrice="12" />
+            <ItemDesign ItemDesignId="79" ItemDesignName="Stun Gun" ItemType="Equipment" ItemSubType="EquipmentWeapon" EnhancementType="Attack" EnhancementValue="4" MarketPrice="1000" Rarity="Elite" ImageSpriteId="1031" FairPrice="800" />
+            <ItemDesign ItemDesignId="79" ItemDesignName="Stun Gun (duplicate)" ItemType="Equipment" ItemSubType="EquipmentWeapon" EnhancementType="Attack" EnhancementValue="4" MarketPrice="1000" Rarity="Elite" ImageSpriteId="1031" FairPrice="800" />
+        </ItemDesigns>
+    </ListItemDesigns>
+</ItemService>"""
+
+CHARACTER_DESIGNS = """<CharacterService>
+    <ListAllCharacterDesigns2>
+        <CharacterDesigns>
+            <CharacterDesign CharacterDesignId="1" CharacterDesignName="Zongzi" Rarity="Common" Hp="3" Attack="0.5" Pilot="7">
+                <CharacterParts>
+                    <CharacterPart CharacterPartId="1" CharacterPartType="Head" StandardSpriteId="11" />
+                    <CharacterPart CharacterPartId="2" CharacterPartType="Body" StandardSpriteId="12" />
+                    <CharacterPart CharacterPartId="3" CharacterPartType="Leg" StandardSpriteId="13" />
+                </CharacterParts>
+            </CharacterDesign>
+            <CharacterDesign CharacterDesignId="2" CharacterDesignName="Shadowy Figure" Rarity="Legendary" Hp="10" Attack="2" Pilot="12">
+                <CharacterParts>
+                    <CharacterPart CharacterPartId="4" CharacterPartType="Head" StandardSpriteId="21" />
+                </CharacterParts>
+            </CharacterDesign>
+        </CharacterDesigns>
+    </ListAllCharacterDesigns2>
+</CharacterService>"""
+
+PRESTIGES = """<CharacterService>
+    <PrestigeCharacterTo>
+        <Prestiges>
+            <Prestige CharacterDesignId1="7" CharacterDesignId2="12" ToCharacterDesignId="31" />
+            <Prestige CharacterDesignId1="12" CharacterDesignId2="7" ToCharacterDesignId="31" />
+            <Prestige CharacterDesignId1="3" CharacterDesignId2="12" ToCharacterDesignId="44" />
+        </Prestiges>
+    </PrestigeCharacterTo>
+</CharacterService>"""
+
+NESTED_XML_ATTRIBUTE = """<MissionService>
+    <ListAllMissionDesigns>
+        <MissionDesigns>
+            <MissionDesign MissionDesignId="5" MissionTitle="Tutorial" RequirementXml="&lt;Requirement RequirementType=&quot;Level&quot; RequirementValue=&quot;3&quot;&gt;&lt;Reward RewardType=&quot;Starbux&quot; /&gt;&lt;/Requirement&gt;" RewardXml="" />
+            <MissionDesign MissionDesignId="6" MissionTitle="Second" RequirementXml="&lt;Requirement /&gt;" />
+        </MissionDesigns>
+    </ListAllMissionDesigns>
+</MissionService>"""
+
+REPEATED_TAGS_WITHOUT_IDS = """<Root Name="root"><Entry Value="1" /><Entry Value="2" /><Other /><Other Value="3"><Child /></Other></Root>"""
+
+SINGLE_CHILD = """<Root><Child A="1" /></Root>"""
+
+EMPTY_ROOT = """<Root />"""
+
+NAMESPACED = """<a:Root xmlns:a="urn:a" xmlns="urn:default" Plain="1" a:Qualified="2"><Child a:Id="3" /><a:Child Id="4" /></a:Root>"""
+
+SAMPLES = {
+    "item_designs": ITEM_DESIGNS,
+    "character_designs": CHARACTER_DESIGNS,
+    "prestiges": PRESTIGES,
+    "nested_xml_attribute": NESTED_XML_ATTRIBUTE,
+    "repeated_tags_without_ids": REPEATED_TAGS_WITHOUT_IDS,
+    "single_child": SINGLE_CHILD,
+    "empty_root": EMPTY_ROOT,
+    "namespaced": NAMESPACED,
+}
+
+FLAG_COMBINATIONS = list(itertools.product([True, False], repeat=3))
+
+
+# ---------- Tests ----------
+
+
+@pytest.mark.parametrize("sample_name", list(SAMPLES.keys()))
+@pytest.mark.parametrize("include_root, fix_attributes, preserve_lists", FLAG_COMBINATIONS)
+def test_raw_xml_to_dict_matches_element_tree_converter(sample_name: str, include_root: bool, fix_attributes: bool, preserve_lists: bool):
+    raw_xml = SAMPLES[sample_name]
+    expected = reference_raw_xml_to_dict(raw_xml, include_root=include_root, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
+    actual = convert.raw_xml_to_dict(raw_xml, include_root=include_root, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("sample_name", list(SAMPLES.keys()))
+def test_xmltree_to_dict3_matches_element_tree_converter(sample_name: str):
+    raw_xml = SAMPLES[sample_name]
+    expected = reference_raw_xml_to_dict(raw_xml)
+    for _ in range(3):
+        expected = next((value for value in expected.values() if isinstance(value, dict)), {})
+        if not expected:
+            break
+    assert convert.xmltree_to_dict3(raw_xml) == expected
+
+
+def test_raw_xml_to_dict_expands_namespaces_like_element_tree():
+    result = convert.raw_xml_to_dict(NAMESPACED, include_root=False)
+    assert result["Plain"] == "1"
+    assert result["{urn:a}Qualified"] == "2"
+    assert result["{urn:default}Child"] == {"{urn:a}Id": "3"}
+    assert result["{urn:a}Child"] == {"Id": "4"}
+    assert not any(key.startswith("xmlns") for key in result)
+
+
+@pytest.mark.parametrize("raw_xml", ["", "<Root>", "<Root></Other>", "<a:Root />"])
+def test_raw_xml_to_dict_raises_parse_error(raw_xml: str):
+    with pytest.raises(ElementTree.ParseError):
+        reference_raw_xml_to_dict(raw_xml)
+    with pytest.raises(ElementTree.ParseError):
+        convert.raw_xml_to_dict(raw_xml)
@@ -0,0 +1,40 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from src import cache
+from src import pss_entity as entity
+
+
+ITEM_DESIGNS: str = '<ItemService><ListItemDesigns><ItemDesigns><ItemDesign ItemDesignId="1" ItemDesignName="Mineral Ore" /><ItemDesign ItemDesignId="2" ItemDesignName="Gas Canister" /></ItemDesigns></ListItemDesigns></ItemService>'
+
+
+# ---------- Name suggestions ----------
+
+
+@pytest.mark.asyncio
+async def test_get_name_suggestions_builds_name_index_in_background(monkeypatch):
+    requested_paths: List[str] = []
+    download_started = asyncio.Event()
+    download_finished = asyncio.Event()
+
+    async def get_data_from_path(path: str) -> str:
+        requested_paths.append(path)
+        download_started.set()
+        await download_finished.wait()
+        return ITEM_DESIGNS
+
+    monkeypatch.setattr(cache.core, "get_data_from_path", get_data_from_path)
+    monkeypatch.setattr(cache.settings, "CACHE_SNAPSHOTS_ENABLED", 0)
+    retriever = entity.EntityRetriever("ItemService/ListItemDesigns2", "ItemDesignId", "ItemDesignName", cache_name="ItemDesigns")
+
+    assert await asyncio.wait_for(retriever.get_name_suggestions("ore"), 1) == []
+    await download_started.wait()
+    assert await asyncio.wait_for(retriever.get_name_suggestions("ore"), 1) == []
+
+    download_finished.set()
+    await retriever.get_name_index()
+
+    assert await retriever.get_name_suggestions("ore") == ["Mineral Ore"]
+    assert requested_paths == ["ItemService/ListItemDesigns2"]
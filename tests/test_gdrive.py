@@ -0,0 +1,88 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import pytest
+
+from src.gdrive import LocalDirectoryTourneyDataBackend, TourneyDataBackend, TourneyDataClient
+
+
+EARLIEST_DATE: datetime = datetime(2019, 10, 9, tzinfo=timezone.utc)
+DATA_DATE: datetime = datetime(2023, 5, 10, tzinfo=timezone.utc)
+RETRIEVED_AT: datetime = datetime(2023, 5, 9, 23, 59)
+FILE_NAME: str = "pss-top-100_20230509-235900.json"
+
+
+# ---------- Backends ----------
+
+
+def test_tourney_data_backend_requires_all_methods():
+    class IncompleteBackend(TourneyDataBackend):
+        def get_file_names(self, file_name_prefix: str) -> List[str]:
+            return []
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_local_directory_backend_round_trip(tmp_path, compress: bool):
+    backend = LocalDirectoryTourneyDataBackend(str(tmp_path), compress=compress)
+    backend.add_file(FILE_NAME, '{"a": 1}')
+
+    assert backend.get_file_names("pss-top-100_20230509") == [FILE_NAME]
+    assert backend.get_file_names("pss-top-100_20230510") == []
+    assert backend.get_file_contents(FILE_NAME) == '{"a": 1}'
+    assert backend.get_file_contents("pss-top-100_20230510-235900.json") is None
+    assert os.path.isfile(os.path.join(str(tmp_path), FILE_NAME + (".gz" if compress else "")))
+
+
+# ---------- TourneyDataClient ----------
+
+
+@pytest.mark.asyncio
+async def test_client_get_data_from_local_directory(tmp_path, tourney_data_factory):
+    data = tourney_data_factory(9, RETRIEVED_AT, fleets_count=10, users_count=50)
+    (tmp_path / FILE_NAME).write_text(json.dumps(data), encoding="utf-8")
+    client = TourneyDataClient(LocalDirectoryTourneyDataBackend(str(tmp_path)), EARLIEST_DATE)
+
+    tourney_data = await client.get_data(DATA_DATE)
+
+    assert tourney_data is not None
+    assert tourney_data.data_date == DATA_DATE
+    assert tourney_data.schema_version == 9
+    assert len(tourney_data.fleet_ids) == 10
+    assert len(tourney_data.user_ids) == 50
+    assert await client.get_data(DATA_DATE) is tourney_data
+
+
+@pytest.mark.asyncio
+async def test_client_get_data_stores_files_in_mirror(tmp_path, tourney_data_factory):
+    class CountingBackend(LocalDirectoryTourneyDataBackend):
+        def __init__(self, directory: str) -> None:
+            super().__init__(directory)
+            self.requested_file_names: List[str] = []
+
+        def get_file_contents(self, file_name: str) -> Optional[str]:
+            self.requested_file_names.append(file_name)
+            return super().get_file_contents(file_name)
+
+    source_directory = tmp_path / "source"
+    source_directory.mkdir()
+    data = tourney_data_factory(9, RETRIEVED_AT, fleets_count=10, users_count=50)
+    (source_directory / FILE_NAME).write_text(json.dumps(data), encoding="utf-8")
+    backend = CountingBackend(str(source_directory))
+    mirror = LocalDirectoryTourneyDataBackend(str(tmp_path / "mirror"), compress=True)
+
+    await TourneyDataClient(backend, EARLIEST_DATE, mirror=mirror).get_data(DATA_DATE)
+    await TourneyDataClient(backend, EARLIEST_DATE, mirror=mirror).get_data(DATA_DATE)
+
+    assert backend.requested_file_names == [FILE_NAME]
+    assert mirror.get_file_names("pss-top-100_20230509-23") == [FILE_NAME]
+
+
+@pytest.mark.asyncio
+async def test_client_get_data_without_file_returns_none(tmp_path):
+    client = TourneyDataClient(LocalDirectoryTourneyDataBackend(str(tmp_path)), EARLIEST_DATE)
+    assert await client.get_data(DATA_DATE) is None
@@ -0,0 +1,77 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator
+
+import pytest
+
+from src.gdrive import TourneyData
+
+
+# ---------- Loader benchmark ----------
+# Loads synthetic tourney data files of every schema version. Loading must scale linearly with the number of fleets and users.
+
+RETRIEVED_AT: datetime = datetime(2023, 5, 31, 23, 59)
+USERS_COUNT: int = 5000
+SMALL_FLEETS_COUNT: int = 100
+LARGE_FLEETS_COUNT: int = 5000
+RUNS: int = 3
+
+MAX_LOAD_SECONDS: float = 5.0
+MAX_FLEETS_SCALING_FACTOR: float = 4.0
+MAX_USERS_PASSES: int = 3
+
+
+class CountingList(list):
+    """
+    Counts the items retrieved by iterating over the list.
+    """
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.iterated_count: int = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for item in super().__iter__():
+            self.iterated_count += 1
+            yield item
+
+
+def _count_users_iterations(data: Dict[str, Any]) -> int:
+    for key in ("users", "data"):
+        if key in data:
+            data[key] = CountingList(data[key])
+    TourneyData(data)
+    return sum(data[key].iterated_count for key in ("users", "data") if key in data)
+
+
+def _measure_load_seconds(data: Dict[str, Any]) -> float:
+    raw_data = json.dumps(data)
+    result = None
+    for _ in range(RUNS):
+        started_at = time.perf_counter()
+        TourneyData(json.loads(raw_data))
+        duration = time.perf_counter() - started_at
+        result = duration if result is None else min(result, duration)
+    return result
+
+
+@pytest.mark.parametrize("schema_version", [3, 4, 5, 6, 7, 8, 9])
+def test_load_tourney_data_iterates_users_independently_of_fleets(schema_version: int, tourney_data_factory):
+    small_iterations = _count_users_iterations(tourney_data_factory(schema_version, RETRIEVED_AT, fleets_count=SMALL_FLEETS_COUNT, users_count=USERS_COUNT))
+    large_iterations = _count_users_iterations(tourney_data_factory(schema_version, RETRIEVED_AT, fleets_count=LARGE_FLEETS_COUNT, users_count=USERS_COUNT))
+
+    # Counting members per fleet with a scan over all users per fleet would iterate the users once per fleet
+    assert large_iterations == small_iterations
+    assert small_iterations <= USERS_COUNT * MAX_USERS_PASSES
+
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="Timing benchmarks only run, if the environment variable RUN_BENCHMARKS is set.")
+@pytest.mark.parametrize("schema_version", [3, 4, 5, 6, 7, 8, 9])
+def test_load_tourney_data_scales_linearly(schema_version: int, tourney_data_factory):
+    small_seconds = _measure_load_seconds(tourney_data_factory(schema_version, RETRIEVED_AT, fleets_count=SMALL_FLEETS_COUNT, users_count=USERS_COUNT))
+    large_seconds = _measure_load_seconds(tourney_data_factory(schema_version, RETRIEVED_AT, fleets_count=LARGE_FLEETS_COUNT, users_count=USERS_COUNT))
+
+    assert large_seconds < MAX_LOAD_SECONDS
+    assert large_seconds < small_seconds * MAX_FLEETS_SCALING_FACTOR
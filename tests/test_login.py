@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Set
+
+import pytest
+
+from src import pss_login as login
+
+
+STARTED_AT: datetime = datetime(2023, 5, 10, 12, tzinfo=timezone.utc)
+
+
+# ---------- Fakes ----------
+
+
+class FakeUser(dict):
+    name: str = None
+
+
+class FakeApi:
+    """
+    Replaces the device login of the PSS API client. Access tokens are named after the device key and the number of logins of that device.
+    """
+
+    def __init__(self, monkeypatch, pool_size: int) -> None:
+        self.now: datetime = STARTED_AT
+        self.failing_device_keys: Set[str] = set()
+        self.logins: List[str] = []
+        self.__login_counts: Dict[str, int] = {}
+
+        async def try_update_device(device: login.Device) -> bool:
+            return True
+
+        monkeypatch.setattr(login.PSSAPI_CLIENT, "device_login", self.device_login, raising=False)
+        monkeypatch.setattr(login, "_db_try_update_device", try_update_device)
+        monkeypatch.setattr(login.utils, "get_utc_now", lambda: self.now)
+        monkeypatch.setattr(login.settings, "USE_ACCESS_TOKEN", False)
+        monkeypatch.setattr(login.settings, "DEVICE_TOKEN_POOL_SIZE", pool_size)
+
+    async def device_login(self, device_key: str, checksum_key: str) -> SimpleNamespace:
+        self.logins.append(device_key)
+        if device_key in self.failing_device_keys:
+            raise login.LoginError("Login failed.")
+        self.__login_counts[device_key] = self.__login_counts.get(device_key, 0) + 1
+        return SimpleNamespace(user=FakeUser(Id=device_key), access_token=f"{device_key}-{self.__login_counts[device_key]}")
+
+
+async def run_background_tasks() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+# ---------- DeviceCollection ----------
+
+
+@pytest.mark.asyncio
+async def test_get_access_token_logs_in_a_single_device_by_default(monkeypatch):
+    api = FakeApi(monkeypatch, pool_size=1)
+    devices = login.DeviceCollection([login.Device("a"), login.Device("b")])
+
+    assert await devices.get_access_token() == "a-1"
+    await run_background_tasks()
+    assert await devices.get_access_token() == "a-1"
+
+    assert api.logins == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_get_access_token_rotates_through_pool(monkeypatch):
+    api = FakeApi(monkeypatch, pool_size=2)
+    devices = login.DeviceCollection([login.Device("a"), login.Device("b"), login.Device("c")])
+
+    assert await devices.get_access_token() == "a-1"
+    await run_background_tasks()
+
+    access_tokens = [await devices.get_access_token() for _ in range(4)]
+    assert sorted(set(access_tokens)) == ["a-1", "b-1"]
+    assert all(access_token != next_access_token for access_token, next_access_token in zip(access_tokens, access_tokens[1:]))
+    assert sorted(api.logins) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_get_access_token_refreshes_within_margin(monkeypatch):
+    api = FakeApi(monkeypatch, pool_size=1)
+    devices = login.DeviceCollection([login.Device("a")])
+
+    assert await devices.get_access_token() == "a-1"
+    api.now += login.ACCESS_TOKEN_TIMEOUT - login.ACCESS_TOKEN_REFRESH_MARGIN - timedelta(seconds=1)
+    assert await devices.get_access_token() == "a-1"
+    await run_background_tasks()
+    assert api.logins == ["a"]
+
+    api.now += timedelta(seconds=2)
+    # The token is still valid, so it gets returned while the new one is retrieved in the background
+    assert await devices.get_access_token() == "a-1"
+    await run_background_tasks()
+    assert await devices.get_access_token() == "a-2"
+    assert api.logins == ["a", "a"]
+    assert devices.token_statistics["background_refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_access_token_backs_off_after_failed_refresh(monkeypatch):
+    api = FakeApi(monkeypatch, pool_size=2)
+    api.failing_device_keys.add("b")
+    devices = login.DeviceCollection([login.Device("a"), login.Device("b")])
+
+    assert await devices.get_access_token() == "a-1"
+    await run_background_tasks()
+    assert api.logins == ["a", "b"]
+
+    for _ in range(3):
+        assert await devices.get_access_token() == "a-1"
+        await run_background_tasks()
+    assert api.logins == ["a", "b"]
+
+    api.failing_device_keys.clear()
+    api.now += timedelta(seconds=1)
+    await devices.get_access_token()
+    await run_background_tasks()
+    assert api.logins == ["a", "b"]
+
+    api.now += login.ACCESS_TOKEN_TIMEOUT
+    await devices.get_access_token()
+    await run_background_tasks()
+    assert "b-1" in [await devices.get_access_token() for _ in range(2)]